@@ -1,14 +1,30 @@
-import pandas as pd
+import numpy as np
 from pathlib import Path
 
+from epl_betting.betting.odds_utils import (
+    best_prices, bookmaker_odds_tensor, consensus_probs, net_of_commission,
+)
+from epl_betting.data.load_football_data import load_football_data
+from epl_betting.data.odds_store import OddsStore, snapshots_from_football_data
+from epl_betting.data.teams import premier_league_registry
+
 RAW_DIR = Path("data/raw")
 
+# de-vig method used for the cross-bookmaker consensus probabilities
+CONSENSUS_METHOD = "shin"
+
+
 def main():
-    # 1. Load the E0.csv file
-    df = pd.read_csv(RAW_DIR / "E0.csv", parse_dates=["Date"])
+    # 1. Load the E0.csv file (match columns and bookmaker 1X2 prices only)
+    df = load_football_data(RAW_DIR / "E0.csv")
 
     # 2. Remove rows without Pinnacle odds (PSH/PSD/PSA)
-    df = df.dropna(subset=["PSH", "PSD", "PSA"])
+    df = df.dropna(subset=["PSH", "PSD", "PSA"]).reset_index(drop=True)
+
+    # Canonical team names (raises on a club the registry doesn't know)
+    registry = premier_league_registry()
+    df["HomeTeam"] = registry.canonical(df["HomeTeam"])
+    df["AwayTeam"] = registry.canonical(df["AwayTeam"])
 
     # 3. Build match_id
     df["match_id"] = (
@@ -33,10 +49,28 @@ def main():
     # 5. Add bookmaker column
     cleaned["bookmaker"] = "Pinnacle"
 
-    # 6. Save to raw folder as odds_this_season.csv
+    # 6. Best price and de-vigged consensus across every bookmaker in the file,
+    #    exchange prices net of commission
+    odds, books = bookmaker_odds_tensor(df)
+    odds = net_of_commission(odds, books)
+    best, best_book = best_prices(odds)
+    consensus = consensus_probs(odds, method=CONSENSUS_METHOD)
+    books = np.array(books)
+    for i, side in enumerate(["home", "draw", "away"]):
+        cleaned[f"best_odds_{side}"] = best[:, i]
+        cleaned[f"best_book_{side}"] = books[best_book[:, i]]
+        cleaned[f"p_{side}_consensus"] = consensus[:, i]
+
+    # 7. Save to raw folder as odds_this_season.csv
     cleaned.to_csv(RAW_DIR / "odds_this_season.csv", index=False)
 
-    print("Saved cleaned odds to data/raw/odds_this_season.csv")
+    print(f"Saved cleaned odds ({len(books)} bookmakers) to data/raw/odds_this_season.csv")
+
+    # 8. Keep every bookmaker's pre-closing and closing price in the snapshot store
+    store = OddsStore()
+    n_new = store.append(snapshots_from_football_data(df, df["match_id"]))
+    print(f"Appended {n_new} new odds snapshots to {store.path}")
+
 
 if __name__ == "__main__":
     main()
@@ -1,5 +1,11 @@
-import pandas as pd
+import hashlib
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 RAW_DIR = PROJECT_ROOT / "data" / "raw"
@@ -7,60 +13,141 @@ RAW_DIR = PROJECT_ROOT / "data" / "raw"
 SEASON_DIR = RAW_DIR / "FPL-Elo-Insights" / "data" / "2025-2026"
 BY_TOURNAMENT_PL_DIR = SEASON_DIR / "By Tournament" / "Premier League"
 
+MANIFEST_PATH = RAW_DIR / "fplelo_manifest.json"
+
+# source file in each GW folder -> (consolidated output, dedup key)
+SOURCES = {
+    "matches.csv": (RAW_DIR / "matches_this_season.csv", ["match_id"]),
+    "playermatchstats.csv": (RAW_DIR / "players_this_season.csv", ["match_id", "player_id"]),
+}
+
+MAX_WORKERS = 8
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
 
-def collect_matches() -> pd.DataFrame:
-    """Combine Premier League matches from all GW folders into one DataFrame."""
-    all_matches = []
 
+def scan_gw_folders(manifest: Dict[str, Dict]) -> Dict[str, Dict]:
+    """
+    Fingerprint every source file in each GW folder as {size, mtime_ns, sha256}.
+    Files whose size and mtime match the manifest reuse the stored hash, so only
+    touched files are read.
+    """
+    current = {}
     # Each subfolder is like 'GW1', 'GW2', ...
     for gw_dir in sorted(BY_TOURNAMENT_PL_DIR.iterdir()):
         if not gw_dir.is_dir():
             continue
-        matches_path = gw_dir / "matches.csv"
-        if matches_path.exists():
-            df = pd.read_csv(matches_path)
-            df["gw_folder"] = gw_dir.name  # optional, GW trace
-            all_matches.append(df)
+        entry = {}
+        for name in SOURCES:
+            path = gw_dir / name
+            if not path.exists():
+                continue
+            stat = path.stat()
+            old = manifest.get(gw_dir.name, {}).get(name)
+            if old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+                entry[name] = old
+            else:
+                entry[name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": _sha256(path)}
+        current[gw_dir.name] = entry
+    return current
+
+
+def _read_gw_file(gw_name: str, name: str) -> pd.DataFrame:
+    df = pd.read_csv(BY_TOURNAMENT_PL_DIR / gw_name / name)
+    df["gw_folder"] = gw_name  # optional, GW trace
+    return df
+
+
+def read_gw_files(gw_names: List[str], name: str) -> pd.DataFrame:
+    """
+    Read `name` from each GW folder concurrently, in folder order.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        frames = list(pool.map(lambda gw: _read_gw_file(gw, name), gw_names))
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def update_store(out_path: Path,
+                 new_rows: pd.DataFrame,
+                 replaced_folders: List[str],
+                 key: List[str]) -> int:
+    """
+    Fold freshly parsed GW rows into a consolidated CSV.
+
+    Brand-new folders are appended to the end of the file. The file is only
+    rewritten when a folder that was already ingested changed, or the columns
+    changed. Rows whose key already exists are dropped (first one wins, as in
+    a full rebuild). Returns the number of rows written.
+    """
+    if new_rows.empty and not replaced_folders:
+        return 0
+
+    if not out_path.exists():
+        new_rows = new_rows.drop_duplicates(subset=key)
+        new_rows.to_csv(out_path, index=False)
+        return len(new_rows)
+
+    header = list(pd.read_csv(out_path, nrows=0).columns)
+    same_columns = set(new_rows.columns) <= set(header)
+
+    if replaced_folders or not same_columns:
+        existing = pd.read_csv(out_path)
+        existing = existing[~existing["gw_folder"].isin(replaced_folders)]
+        combined = pd.concat([existing, new_rows], ignore_index=True)
+        combined = combined.sort_values("gw_folder", kind="stable").drop_duplicates(subset=key)
+        combined.to_csv(out_path, index=False)
+        return len(combined)
+
+    existing_keys = pd.read_csv(out_path, usecols=key).drop_duplicates()
+    new_rows = new_rows.drop_duplicates(subset=key)
+    new_rows = new_rows.merge(existing_keys, on=key, how="left", indicator=True)
+    new_rows = new_rows[new_rows["_merge"] == "left_only"].drop(columns="_merge")
+    new_rows.reindex(columns=header).to_csv(out_path, mode="a", header=False, index=False)
+    return len(new_rows)
 
-    if not all_matches:
-        raise RuntimeError("No matches.csv files found under By Tournament/Premier League")
 
-    matches = pd.concat(all_matches, ignore_index=True).drop_duplicates(subset=["match_id"])
-    return matches
+def main():
+    full = "--full" in sys.argv[1:]
 
+    manifest = {}
+    if MANIFEST_PATH.exists() and not full:
+        manifest = json.loads(MANIFEST_PATH.read_text())
+    if any(not out.exists() for out, _ in SOURCES.values()):
+        manifest = {}
 
-def collect_player_matchstats() -> pd.DataFrame:
-    """Combine Premier League player match stats from all GW folders."""
-    all_pms = []
+    current = scan_gw_folders(manifest)
 
-    for gw_dir in sorted(BY_TOURNAMENT_PL_DIR.iterdir()):
-        if not gw_dir.is_dir():
-            continue
-        pms_path = gw_dir / "playermatchstats.csv"
-        if pms_path.exists():
-            df = pd.read_csv(pms_path)
-            df["gw_folder"] = gw_dir.name  # optional
-            all_pms.append(df)
+    for name, (out_path, key) in SOURCES.items():
+        changed = [
+            gw for gw, files in current.items()
+            if name in files and manifest.get(gw, {}).get(name, {}).get("sha256") != files[name]["sha256"]
+        ]
+        replaced = [gw for gw in changed if name in manifest.get(gw, {})]
 
-    if not all_pms:
-        raise RuntimeError("No playermatchstats.csv files found under By Tournament/Premier League")
+        if not any(name in files for files in current.values()):
+            raise RuntimeError(f"No {name} files found under By Tournament/Premier League")
 
-    pms = pd.concat(all_pms, ignore_index=True).drop_duplicates(subset=["match_id", "player_id"])
-    return pms
+        if not changed:
+            print(f"{out_path.name}: up to date")
+            continue
 
+        if not manifest and out_path.exists():
+            out_path.unlink()
 
-def main():
-    # 1. Collect & save matches
-    matches = collect_matches()
-    matches_out = RAW_DIR / "matches_this_season.csv"
-    matches.to_csv(matches_out, index=False)
-    print(f"Saved Premier League matches to {matches_out}")
-
-    # 2. Collect & save player match stats
-    pms = collect_player_matchstats()
-    pms_out = RAW_DIR / "players_this_season.csv"
-    pms.to_csv(pms_out, index=False)
-    print(f"Saved Premier League player match stats to {pms_out}")
+        new_rows = read_gw_files(changed, name)
+        n = update_store(out_path, new_rows, replaced, key)
+        print(f"Saved {name} from {len(changed)} GW folder(s) ({n} rows written) to {out_path}")
+
+    MANIFEST_PATH.write_text(json.dumps(current, indent=1, sort_keys=True))
 
 
 if __name__ == "__main__":
@@ -1,123 +1,48 @@
-import pickle
-from pathlib import Path
-import pandas as pd
-import numpy as np
+import sys
 
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
-PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
-MODELS_DIR = PROJECT_ROOT / "models"
-MODELS_DIR.mkdir(exist_ok=True)
+from epl_betting.config import SCORE_MODEL, TIME_DECAY_XI
+from epl_betting.data.features import load_features
+from epl_betting.instrumentation import stage, write_report
+from epl_betting.models.artifact import save_model
+from epl_betting.models.dixon_coles import fit_score_model
+from epl_betting.models.team_strength import time_decay_weights
 
-OUTPUT_PATH = MODELS_DIR / "team_strength.pkl"
 
-
-class TeamStrengthModel:
-    """
-    Simple Poisson attack/defense model:
-    log(expected_goals) = home_advantage + attack_home - defence_away
-    """
-
-    def __init__(self, teams):
-        self.teams = teams
-        self.attack = {t: 0.0 for t in teams}
-        self.defence = {t: 0.0 for t in teams}
-        self.home_advantage = 0.0
-
-
-def fit_poisson_strength_model(df: pd.DataFrame) -> TeamStrengthModel:
+def main():
     """
-    Fits a Poisson regression model for attack/defence.
+    Usage: python scripts/fit_team_strength.py [--model=poisson|dixon_coles|bivariate_poisson]
 
-    df must contain:
-      home_team_name, away_team_name, home_goals, away_goals
+    Fits the score model (config.SCORE_MODEL by default) on every match with
+    time decay and publishes it as the next model version, with its rho /
+    lambda3.
     """
-
-    teams = sorted(set(df["home_team_name"]) | set(df["away_team_name"]))
-    model = TeamStrengthModel(teams)
-
-    # Initial guess
-    attack = {t: 0.0 for t in teams}
-    defence = {t: 0.0 for t in teams}
-    home_adv = 0.0
-
-    # Convert to arrays for optimization
-    team_index = {t: i for i, t in enumerate(teams)}
-
-    def pack_params(a, d, h):
-        return np.concatenate([
-            np.array([a[t] for t in teams]),
-            np.array([d[t] for t in teams]),
-            np.array([h])
-        ])
-
-    def unpack_params(params):
-        a = params[:len(teams)]
-        d = params[len(teams):len(teams)*2]
-        h = params[-1]
-
-        attack_dict = {t: a[i] for i, t in enumerate(teams)}
-        defence_dict = {t: d[i] for i, t in enumerate(teams)}
-        return attack_dict, defence_dict, h
-
-    # Negative log-likelihood
-    def nll(params):
-        attack, defence, h = unpack_params(params)
-        nll_sum = 0.0
-
-        for _, row in df.iterrows():
-            home = row["home_team_name"]
-            away = row["away_team_name"]
-            hg = row["home_goals"]
-            ag = row["away_goals"]
-
-            lam_home = np.exp(h + attack[home] - defence[away])
-            lam_away = np.exp(attack[away] - defence[home])
-
-            # Poisson log likelihood
-            nll_sum += -(
-                hg * np.log(lam_home) - lam_home +
-                ag * np.log(lam_away) - lam_away
-            )
-
-        return nll_sum
-
-    # Run optimization
-    from scipy.optimize import minimize
-
-    params0 = pack_params(attack, defence, home_adv)
-
-    result = minimize(nll, params0, method="L-BFGS-B")
-
-    attack, defence, home_adv = unpack_params(result.x)
-
-    model.attack = attack
-    model.defence = defence
-    model.home_advantage = home_adv
-
-    return model
-
-
-def main():
-    df = pd.read_csv(PROCESSED_DIR / "matches_features.csv")
+    model_name = next((a.split("=", 1)[1] for a in sys.argv[1:] if a.startswith("--model=")), SCORE_MODEL)
 
     required_cols = [
+        "kickoff_time",
         "home_team_name", "away_team_name",
         "home_goals", "away_goals"
     ]
 
-    for col in required_cols:
-        if col not in df.columns:
-            raise ValueError(f"Missing required column: {col}")
+    # load_features raises if any of the required columns is missing
+    with stage("load_features"):
+        df = load_features(columns=required_cols)
 
-    print("Fitting team strength model on", len(df), "matches...")
-    model = fit_poisson_strength_model(df)
+    print(f"Fitting {model_name} team strength model on {len(df)} matches (time decay xi={TIME_DECAY_XI}/day)...")
+    with stage("fit"):
+        weights = time_decay_weights(df["kickoff_time"], TIME_DECAY_XI)
+        model, source = fit_score_model(model_name, df, weights=weights)
 
-    with open(OUTPUT_PATH, "wb") as f:
-        pickle.dump(model, f)
+    with stage("save_model"):
+        artifact = save_model(
+            model, training_data=df, source=source, extra_meta={"time_decay_xi": TIME_DECAY_XI, "score_model": model_name}
+        )
 
-    print("Saved model →", OUTPUT_PATH)
+    print(f"Saved model v{artifact.version} →", artifact.path)
     print("\n--- Home Advantage ---")
     print(model.home_advantage)
+    if model_name != "poisson":
+        print(f"rho={model.rho:.4f}  lambda3={model.lambda3:.4f}")
 
     print("\n--- Attack Strength (top 5) ---")
     for t, v in sorted(model.attack.items(), key=lambda x: -x[1])[:5]:
@@ -133,6 +58,8 @@ def main():
     for t, v in worst_def:
         print(f"{t}: {v:.3f}")
 
+    print(f"\n⏱  Metrics written to {write_report('fit_team_strength')}")
+
 
 if __name__ == "__main__":
     main()
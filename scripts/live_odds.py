@@ -0,0 +1,71 @@
+import asyncio
+import sys
+
+from epl_betting.betting.live import LivePricer, consume_feed, serve_replay_feed
+from epl_betting.config import KELLY_FRACTION, MIN_EDGE, MODEL_WEIGHT
+from epl_betting.data.load_odds import load_future_odds
+from epl_betting.data.teams import premier_league_registry
+from epl_betting.models.artifact import load_model
+
+HOST = "127.0.0.1"
+PORT = 8765
+N_TICKS = 2000
+
+
+def print_update(tick, recs):
+    for r in recs:
+        print(
+            f"⚡ {r['home_team']} vs {r['away_team']}: {r['bet_side']} @ {r['odds']:.2f} "
+            f"edge={r['edge']:.3f} stake={r['stake_fraction']:.3f} ({r['latency_us']:.0f}µs)"
+        )
+
+
+async def run(serve: bool, quiet: bool):
+    fixtures = load_future_odds()
+    pricer = LivePricer(
+        load_model().fixture_tensor(),
+        premier_league_registry(),
+        model_weight=MODEL_WEIGHT,
+        min_edge=MIN_EDGE,
+        kelly_multiplier=KELLY_FRACTION,
+    )
+    pricer.warm(fixtures)
+
+    server = None
+    if serve:
+        # Local replay feed: future_odds.csv, then random-walk price moves
+        server = await serve_replay_feed(fixtures, HOST, PORT, n_ticks=N_TICKS, seed=0)
+        print(f"📡 Replay feed on {HOST}:{PORT} ({len(fixtures)} fixtures, {N_TICKS} ticks)")
+
+    on_update = (lambda tick, recs: None) if quiet else print_update
+    try:
+        await consume_feed(HOST, PORT, pricer, on_update)
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+
+    stats = pricer.latency.summary()
+    print(f"\n📊 {pricer.n_ticks} ticks, {pricer.n_unchanged} unchanged (skipped), "
+          f"{pricer.n_rejected} rejected (malformed ticks), "
+          f"{pricer.n_ticks - pricer.n_unchanged - pricer.n_rejected} repriced")
+    if stats["n"]:
+        print(f"⏱  per-tick latency: p50={stats['p50_us']:.1f}µs  p99={stats['p99_us']:.1f}µs  "
+              f"max={stats['max_us']:.1f}µs")
+    n_recs = sum(len(r) for r in pricer.recommendations.values())
+    print(f"✅ {n_recs} current recommendations across {len(pricer.recommendations)} fixtures")
+
+
+def main():
+    """
+    Usage: python scripts/live_odds.py [--serve] [--quiet]
+
+    Connects to a newline-delimited JSON odds feed on HOST:PORT and prints new
+    recommendations whenever a fixture's 1X2 prices move. --serve starts the
+    local replay feed first.
+    """
+    asyncio.run(run(serve="--serve" in sys.argv, quiet="--quiet" in sys.argv))
+
+
+if __name__ == "__main__":
+    main()
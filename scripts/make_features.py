@@ -1,5 +1,14 @@
+import numpy as np
 import pandas as pd
 from pathlib import Path
+from typing import Optional
+
+from epl_betting.betting.odds_utils import (
+    BEST_BOOK_COLUMNS, BEST_ODDS_COLUMNS, CONSENSUS_COLUMNS, ODDS_COLUMNS, devig,
+)
+from epl_betting.data.features import save_features_columnar
+from epl_betting.data.teams import TeamRegistry, premier_league_registry
+from epl_betting.instrumentation import count, stage, write_report
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 RAW_DIR = PROJECT_ROOT / "data" / "raw"
@@ -7,14 +16,22 @@ PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
 
 SEASON_DIR = RAW_DIR / "FPL-Elo-Insights" / "data" / "2025-2026"
 
+# odds rows are matched to the fixture with the nearest date within this window:
+# wide enough for re-scheduled games (odds dates can be weeks off the FPL-Elo
+# kickoff), well short of the same pairing in the next season
+ODDS_DATE_TOLERANCE = pd.Timedelta(days=120)
 
-def load_matches_with_names() -> pd.DataFrame:
+def load_matches_with_names(raw_dir: Path = RAW_DIR,
+                            registry: Optional[TeamRegistry] = None) -> pd.DataFrame:
     """
-    Load matches_this_season.csv and attach odds-style team names directly
-    from team IDs, so they match the names used in odds_this_season.csv.
+    Load matches_this_season.csv and attach registry team indices and
+    odds-style names from the FPL-Elo team IDs. Unknown IDs raise KeyError.
     """
-    matches_path = RAW_DIR / "matches_this_season.csv"
+    if registry is None:
+        registry = premier_league_registry()
+    matches_path = raw_dir / "matches_this_season.csv"
     matches = pd.read_csv(matches_path)
+    count("match_rows_loaded", len(matches))
 
     # Standardise date (useful to keep around, even though we don't join on it)
     if "kickoff_time" in matches.columns:
@@ -34,117 +51,104 @@ def load_matches_with_names() -> pd.DataFrame:
     rename_map = {k: v for k, v in rename_map.items() if k in matches.columns}
     matches = matches.rename(columns=rename_map)
 
-    # Explicit mapping: FotMob / FPL-Elo team IDs → odds-style team names
-    # These IDs come from matches_this_season.csv (examples you pasted).
-    TEAM_ID_TO_NAME = {
-        1:  "Man United",
-        2:  "Leeds",
-        3:  "Arsenal",
-        4:  "Newcastle",
-        6:  "Tottenham",
-        7:  "Aston Villa",
-        8:  "Chelsea",
-        11: "Everton",
-        14: "Liverpool",
-        17: "Nott'm Forest",
-        21: "West Ham",
-        31: "Crystal Palace",
-        36: "Brighton",
-        39: "Wolves",
-        43: "Man City",
-        54: "Fulham",
-        56: "Sunderland",
-        90: "Burnley",
-        91: "Bournemouth",
-        94: "Brentford",
-    }
-
     # IDs are floats in the CSV (e.g. 14.0), so cast to int before mapping
     matches["home_team_id"] = matches["home_team"].astype(int)
     matches["away_team_id"] = matches["away_team"].astype(int)
 
-    matches["home_team_name"] = matches["home_team_id"].map(TEAM_ID_TO_NAME)
-    matches["away_team_name"] = matches["away_team_id"].map(TEAM_ID_TO_NAME)
-
     # These are the join keys we will use with the odds file
-    matches["home_name_for_join"] = matches["home_team_name"]
-    matches["away_name_for_join"] = matches["away_team_name"]
+    matches["home_team_idx"] = registry.ids_from_external(matches["home_team_id"])
+    matches["away_team_idx"] = registry.ids_from_external(matches["away_team_id"])
+
+    matches["home_team_name"] = registry.names_of(matches["home_team_idx"])
+    matches["away_team_name"] = registry.names_of(matches["away_team_idx"])
 
     return matches
 
 
-def load_odds() -> pd.DataFrame:
+def load_odds(raw_dir: Path = RAW_DIR, registry: Optional[TeamRegistry] = None) -> pd.DataFrame:
     """
-    Load odds_this_season.csv and expose team names in the same format
-    as load_matches_with_names, so we can join directly on names.
+    Load odds_this_season.csv and resolve team names (or aliases) to the same
+    registry indices as load_matches_with_names. Unknown names raise KeyError
+    instead of silently dropping out of the join. Files written without
+    best-price / consensus columns get them from the single bookmaker's
+    prices, so every feature file has the same columns.
     """
-    odds_path = RAW_DIR / "odds_this_season.csv"
+    if registry is None:
+        registry = premier_league_registry()
+    odds_path = raw_dir / "odds_this_season.csv"
     odds = pd.read_csv(odds_path, parse_dates=["date"])
+    count("odds_rows_loaded", len(odds))
     odds["date"] = odds["date"].dt.date
 
-    # odds_this_season.csv already uses the desired names, e.g.
-    # Liverpool, Bournemouth, Aston Villa, Newcastle, Brighton, Fulham, ...
-    odds["home_name_for_join"] = odds["home_team"]
-    odds["away_name_for_join"] = odds["away_team"]
+    odds["home_team_idx"] = registry.ids(odds["home_team"])
+    odds["away_team_idx"] = registry.ids(odds["away_team"])
+
+    if not set(BEST_ODDS_COLUMNS + CONSENSUS_COLUMNS) <= set(odds.columns):
+        prices = odds[ODDS_COLUMNS].to_numpy(dtype=float)
+        odds[BEST_ODDS_COLUMNS] = prices
+        odds[BEST_BOOK_COLUMNS] = np.repeat(odds["bookmaker"].to_numpy()[:, None], 3, axis=1)
+        odds[CONSENSUS_COLUMNS] = devig(prices)
 
     return odds
 
 
-def make_match_features() -> pd.DataFrame:
-    matches = load_matches_with_names()
-    odds = load_odds()
-
-    # In case the odds file has multiple rows per fixture (e.g. different
-    # bookmakers / timestamps), reduce to a single row per (home, away).
-    odds_for_merge = (
-        odds.sort_values("date")  # keep the latest by date if duplicates exist
-        .drop_duplicates(
-            subset=["home_name_for_join", "away_name_for_join"],
-            keep="last",
-        )[
-            [
-                "home_name_for_join",
-                "away_name_for_join",
-                "odds_home",
-                "odds_draw",
-                "odds_away",
-                "bookmaker",
-                "match_id",  # odds match_id (e.g. 2025-08-15_Liverpool-Bournemouth)
-                "date",
-            ]
+def make_match_features(raw_dir: Path = RAW_DIR,
+                        registry: Optional[TeamRegistry] = None) -> pd.DataFrame:
+    if registry is None:
+        registry = premier_league_registry()
+    with stage("load_matches"):
+        matches = load_matches_with_names(raw_dir, registry)
+    with stage("load_odds"):
+        odds = load_odds(raw_dir, registry)
+
+    # Each match takes the odds row for the same (home, away) pairing whose
+    # date is nearest its kickoff, so a pairing that occurs more than once
+    # (cups, several seasons, re-scheduled games) gets its own odds.
+    odds_for_merge = odds[
+        [
+            "home_team_idx",
+            "away_team_idx",
+            *ODDS_COLUMNS,
+            "bookmaker",
+            *BEST_ODDS_COLUMNS,
+            *BEST_BOOK_COLUMNS,
+            *CONSENSUS_COLUMNS,
+            "match_id",  # odds match_id (e.g. 2025-08-15_Liverpool-Bournemouth)
+            "date",
         ]
+    ].copy()
+    odds_for_merge["_day"] = pd.to_datetime(odds_for_merge["date"]).astype("datetime64[ns]")
+
+    # 🔑 As-of join on (home team, away team) registry indices + match day.
+    played = matches[matches["date"].notna()].copy()
+    played["_row"] = np.arange(len(played))
+    played["_day"] = pd.to_datetime(played["date"]).astype("datetime64[ns]")
+    with stage("merge_odds"):
+        merged = pd.merge_asof(
+            played.sort_values("_day", kind="stable"),
+            odds_for_merge.sort_values("_day", kind="stable"),
+            on="_day",
+            by=["home_team_idx", "away_team_idx"],
+            direction="nearest",
+            tolerance=ODDS_DATE_TOLERANCE,
+            suffixes=("", "_odds"),
+        )
+    merged = (
+        merged[merged["odds_home"].notna()]  # only matches that currently have odds
+        .sort_values("_row")
+        .drop(columns=["_row", "_day"])
+        .reset_index(drop=True)
     )
 
-    # 🔑 Join only on (home team name, away team name).
-    # We assume each home team plays each away team once per season.
-    merged = matches.merge(
-        odds_for_merge,
-        on=["home_name_for_join", "away_name_for_join"],
-        how="inner",  # only matches that currently have odds
-        suffixes=("", "_odds"),
-    )
-
+    count("matches_merged", len(merged))
     print(f"Merged {len(merged)} matches with odds out of {len(matches)} total matches.")
 
     # ---- Debugging: which odds fixtures didn't match any FPL-Elo match? ----
-    merged_keys = merged[["home_name_for_join", "away_name_for_join"]].drop_duplicates()
-    odds_keys = odds_for_merge[["home_name_for_join", "away_name_for_join"]].drop_duplicates()
-
-    unmatched = odds_keys.merge(
-        merged_keys,
-        on=["home_name_for_join", "away_name_for_join"],
-        how="left",
-        indicator=True,
-    )
-    unmatched = unmatched[unmatched["_merge"] == "left_only"]
+    unmatched = odds[~odds["match_id"].isin(merged["match_id_odds"])]
 
     if not unmatched.empty:
-        print("⚠ Some odds rows did not match any FPL-Elo matches (by team names).")
-        debug = unmatched.merge(
-            odds,
-            on=["home_name_for_join", "away_name_for_join"],
-            how="left",
-        )[["date", "home_team", "away_team"]].drop_duplicates()
+        print("⚠ Some odds rows did not match any FPL-Elo matches (by team).")
+        debug = unmatched[["date", "home_team", "away_team"]].drop_duplicates()
         print(debug.head(20))
 
     return merged
@@ -152,12 +156,20 @@ def make_match_features() -> pd.DataFrame:
 
 def main():
     PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
-    features = make_match_features()
+    with stage("make_match_features"):
+        features = make_match_features()
     out_path = PROCESSED_DIR / "data" / "processed" / "matches_features.csv"
     # Slight correction: we’re already in PROJECT_ROOT, so:
     out_path = PROCESSED_DIR / "matches_features.csv"
-    features.to_csv(out_path, index=False)
-    print(f"✅ Saved match features to {out_path}")
+    with stage("save"):
+        features.to_csv(out_path, index=False)
+        print(f"✅ Saved match features to {out_path}")
+
+        # Typed columnar copy that downstream scripts read via load_features
+        col_dir = save_features_columnar(features)
+        print(f"✅ Saved columnar match features to {col_dir}")
+
+    print(f"⏱  Metrics written to {write_report('make_features')}")
 
 
 if __name__ == "__main__":
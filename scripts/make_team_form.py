@@ -0,0 +1,96 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from epl_betting.data.load_players import load_players_matchstats
+from epl_betting.data.team_form import (
+    FORM_PATH, MATCH_COLUMNS, PLAYER_COLUMNS, PLAYER_TEAMS_PATH, WEIGHTED_STATS,
+    form_stats, label_teams, update_team_form,
+)
+from epl_betting.data.teams import premier_league_registry
+from epl_betting.instrumentation import count, stage, write_report
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+RAW_DIR = PROJECT_ROOT / "data" / "raw"
+
+
+def main():
+    """
+    Usage: python scripts/make_team_form.py [--rebuild] [--check]
+
+    Aggregates players_this_season.csv to team-match stats and writes each
+    team's EWM / rolling form as of every kickoff to data/processed/team_form.csv.
+    Only matches not yet in that file (and stored matches of players whose
+    team changed) are processed unless --rebuild; the evidence behind player
+    team assignments is kept in data/processed/player_teams.csv.
+    --check also builds from scratch and fails if the two differ.
+    """
+    rebuild = "--rebuild" in sys.argv[1:]
+    check = "--check" in sys.argv[1:]
+
+    with stage("load"):
+        matches = pd.read_csv(RAW_DIR / "matches_this_season.csv", usecols=MATCH_COLUMNS)
+        header = pd.read_csv(RAW_DIR / "players_this_season.csv", nrows=0).columns
+        columns = PLAYER_COLUMNS + [c for c in WEIGHTED_STATS.values() if c in header]
+        players = load_players_matchstats(RAW_DIR / "players_this_season.csv", columns=columns)
+    count("player_rows_loaded", len(players))
+
+    form, counts = None, None
+    if FORM_PATH.exists() and PLAYER_TEAMS_PATH.exists() and not rebuild:
+        counts = pd.read_csv(PLAYER_TEAMS_PATH)
+        if "n" in counts.columns:
+            form = pd.read_csv(FORM_PATH, parse_dates=["kickoff_time"]).drop(columns=["team_name", "opponent_name"])
+        else:
+            # assignments without their evidence can't be updated exactly
+            print(f"{PLAYER_TEAMS_PATH.name} holds no evidence counts, rebuilding")
+            counts = None
+
+    start = time.perf_counter()
+    with stage("update_team_form"):
+        form, counts, summary = update_team_form(players, matches, form, counts)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    count("matches_added", summary["new_matches"])
+
+    if check and form is not None:
+        full, _, _ = update_team_form(players, matches)
+        key = ["team_id", "kickoff_time", "match_id"]
+        a = form.sort_values(key).reset_index(drop=True)
+        b = full.sort_values(key).reset_index(drop=True)
+        cols = [c for c in full.columns if c.endswith("_ewm") or "_roll" in c] + form_stats(full)
+        same_rows = len(a) == len(b) and (a[key].to_numpy() == b[key].to_numpy()).all()
+        # stored values went through the CSV's 6 significant digits
+        if not same_rows or not np.allclose(a[cols], b[cols], rtol=1e-5, atol=1e-5, equal_nan=True):
+            raise SystemExit("❌ Incremental team form differs from a rebuild")
+        print(f"✅ Incremental team form matches a rebuild ({len(full)} rows)")
+
+    if summary["new_matches"] == 0:
+        print(f"No new matches ({form['match_id'].nunique() if form is not None else 0} in {FORM_PATH.name}).")
+        return
+
+    with stage("save"):
+        FORM_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # stats are float32 sums; 6 significant digits drops the float32 noise
+        label_teams(form, premier_league_registry()).to_csv(FORM_PATH, index=False, float_format="%.6g")
+        counts.to_csv(PLAYER_TEAMS_PATH, index=False)
+    count("player_rows_unplaced", summary["unattributed_rows"])
+
+    print(
+        f"✅ Added {summary['new_matches']} matches in {elapsed_ms:.0f} ms → {FORM_PATH}\n"
+        f"   {summary['players_changed']} players assigned or moved to a team, "
+        f"{summary['matches_reaggregated']} stored matches re-aggregated ({summary['player_rows']} player rows)"
+    )
+    share = summary["unattributed_xg"] / summary["total_xg"] if summary["total_xg"] > 0 else 0.0
+    print(
+        f"   {summary['unattributed_rows']} player rows could not be placed in a team "
+        f"({summary['unattributed_xg']:.2f} xG, {share:.1%} of the aggregated matches' xG; see unplaced_xg)"
+    )
+    if "rows_recomputed" in summary:
+        print(f"   Recomputed {summary['rows_recomputed']} of {len(form)} team-match rows")
+    write_report("make_team_form")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,28 @@
+import numpy as np
 import pandas as pd
 from pathlib import Path
-
-from epl_betting.models.team_strength import fit_team_strength_model
-from epl_betting.models.probability import outcome_probs
-from epl_betting.betting.odds_utils import implied_probs_from_odds
-
-# Betting parameters
-MODEL_WEIGHT = 0.30      # how much we trust our model vs market
-MIN_EDGE = 0.03          # minimum edge (3%) to recommend a bet
-KELLY_FRACTION = 0.25    # fraction of full Kelly stake to actually use
+from typing import List, Sequence, Tuple, Union
+
+from epl_betting.config import KELLY_FRACTION, MIN_EDGE, MODEL_WEIGHT, TIME_DECAY_XI
+from epl_betting.models.team_strength import fit_team_strength_model, time_decay_weights
+from epl_betting.models.artifact import latest_version, load_model
+from epl_betting.betting.odds_utils import market_prices
+from epl_betting.betting.portfolio import portfolio_kelly
+from epl_betting.betting.pricing import price_bets
+from epl_betting.models.markets import asian_handicap, btts, effective_win_prob, over_under
+from epl_betting.models.probability import score_matrices
+from epl_betting.data.features import load_features
+from epl_betting.data.load_odds import load_future_odds
+from epl_betting.instrumentation import count, stage, write_report
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
-RAW_DIR = PROJECT_ROOT / "data" / "raw"
-PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
 RESULTS_DIR = PROJECT_ROOT / "data" / "results"
 
-
-def blended_prob(p_model: float, p_market: float) -> float:
-    """
-    Blend model and market probabilities.
-    """
-    return MODEL_WEIGHT * p_model + (1.0 - MODEL_WEIGHT) * p_market
+FEATURE_COLUMNS = [
+    "kickoff_time",
+    "home_team_name", "away_team_name",
+    "home_goals", "away_goals", "home_xg", "away_xg",
+]
 
 
 def load_training_matches() -> pd.DataFrame:
@@ -28,7 +30,7 @@ def load_training_matches() -> pd.DataFrame:
     Load matches_features.csv and keep only matches that have actually been played
     (i.e. have goals/xG).
     """
-    df = pd.read_csv(PROCESSED_DIR / "matches_features.csv")
+    df = load_features(columns=FEATURE_COLUMNS)
     # adjust these column names if you ended up renaming
     if "home_goals" in df.columns:
         df = df[df["home_goals"].notna()]
@@ -40,100 +42,140 @@ def load_training_matches() -> pd.DataFrame:
     return df
 
 
-def load_future_odds() -> pd.DataFrame:
+def bet_frame(future_odds: pd.DataFrame,
+              label: Union[str, Sequence[str]],
+              side: int,
+              odd: np.ndarray,
+              p_model: np.ndarray,
+              p_market: np.ndarray) -> pd.DataFrame:
     """
-    Load manually-entered future odds from data/raw/future_odds.csv.
-
-    Date column is optional. Required columns:
-      - home_team
-      - away_team
-      - odds_home
-      - odds_draw
-      - odds_away
+    Blend, edge and Kelly for one bet type across all fixtures.
+    side is 0/1/2 for Home/Draw/Away and -1 for other markets.
     """
-    path = RAW_DIR / "future_odds.csv"
-
-    # Simple read: no date parsing, since we don't require a date column
-    df = pd.read_csv(path)
-
-    # If there's a date column, normalise it; otherwise it's fine
-    if "date" in df.columns:
-        df["date"] = pd.to_datetime(df["date"]).dt.date
-    else:
-        df["date"] = None  # or just drop this line if you don't care at all
+    priced = price_bets(p_model, p_market, odd, MODEL_WEIGHT, MIN_EDGE, KELLY_FRACTION)
+
+    frame = pd.DataFrame({
+        "fixture": np.arange(len(future_odds)),
+        "side": side,
+        "date": future_odds["date"],
+        "home_team": future_odds["home_team"],
+        "away_team": future_odds["away_team"],
+        "bet_side": label,          # Home / Draw / Away / Over 2.5 / ...
+        "odds": odd,
+        "p_model": p_model,
+        "p_market": p_market,
+        "p_final": priced["p_final"],
+        "edge": priced["edge"],
+        "edge_pct": priced["edge"] * 100,
+        "kelly_full": priced["kelly_full"],
+        "stake_fraction": priced["stake_fraction"],
+    })
+    # fixtures without a price for this market
+    return frame[np.isfinite(odd)]
+
+
+def one_x_two_frames(future_odds: pd.DataFrame,
+                     model_probs: np.ndarray) -> Tuple[List[pd.DataFrame], np.ndarray]:
+    """
+    Home / Draw / Away bet frames for every fixture, plus the (N, 3)
+    blended probabilities that portfolio_kelly sizes the 1X2 bets with.
+    Prices come from market_prices: best_odds_* / p_*_consensus columns in
+    future_odds.csv are used when present.
+    """
+    odds, p_market = market_prices(future_odds)
+    frames = [
+        bet_frame(future_odds, outcome, side, odds[:, side], model_probs[:, side], p_market[:, side])
+        for side, outcome in enumerate(["Home", "Draw", "Away"])
+    ]
+    p_final = price_bets(model_probs, p_market, odds, MODEL_WEIGHT)["p_final"]
+    return frames, p_final
 
-    required_cols = ["home_team", "away_team", "odds_home", "odds_draw", "odds_away"]
-    missing = [c for c in required_cols if c not in df.columns]
-    if missing:
-        raise ValueError(f"future_odds.csv is missing required columns: {missing}")
 
-    return df
+def extra_market_bets(future_odds: pd.DataFrame, matrices: np.ndarray):
+    """
+    Yield (label, odds, p_model, p_market) for every two-way market that
+    future_odds.csv has prices for. Model probabilities for lines that can
+    push or half-settle are effective win probabilities.
+    """
+    def market_pair(odds_a, odds_b):
+        inv_a = 1.0 / odds_a
+        inv_b = 1.0 / odds_b
+        return inv_a / (inv_a + inv_b), inv_b / (inv_a + inv_b)
+
+    cols = set(future_odds.columns)
+
+    for col in sorted(c for c in cols if c.startswith("odds_over_")):
+        tag = col[len("odds_over_"):]
+        if f"odds_under_{tag}" not in cols:
+            continue
+        line = float(tag.replace("_", "."))
+        over, under = over_under(matrices, line)
+        odds_over = future_odds[col].to_numpy(dtype=float)
+        odds_under = future_odds[f"odds_under_{tag}"].to_numpy(dtype=float)
+        mk_over, mk_under = market_pair(odds_over, odds_under)
+        yield f"Over {line:g}", odds_over, effective_win_prob(over), mk_over
+        yield f"Under {line:g}", odds_under, effective_win_prob(under), mk_under
+
+    if {"ah_line", "odds_ah_home", "odds_ah_away"} <= cols:
+        line = future_odds["ah_line"].to_numpy(dtype=float)
+        priced = np.isfinite(line)
+        home, away = asian_handicap(matrices, np.where(priced, line, 0.0))
+        odds_home = np.where(priced, future_odds["odds_ah_home"].to_numpy(dtype=float), np.nan)
+        odds_away = np.where(priced, future_odds["odds_ah_away"].to_numpy(dtype=float), np.nan)
+        mk_home, mk_away = market_pair(odds_home, odds_away)
+        yield [f"AH Home {l:+g}" for l in line], odds_home, effective_win_prob(home), mk_home
+        yield [f"AH Away {-l:+g}" for l in line], odds_away, effective_win_prob(away), mk_away
+
+    if {"odds_btts_yes", "odds_btts_no"} <= cols:
+        p_yes = btts(matrices)
+        odds_yes = future_odds["odds_btts_yes"].to_numpy(dtype=float)
+        odds_no = future_odds["odds_btts_no"].to_numpy(dtype=float)
+        mk_yes, mk_no = market_pair(odds_yes, odds_no)
+        yield "BTTS Yes", odds_yes, p_yes, mk_yes
+        yield "BTTS No", odds_no, 1.0 - p_yes, mk_no
 
 
 def main():
     RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 
-    # 1) Train / refit team strength model on historic matches
-    train_df = load_training_matches()
-    print(f"Using {len(train_df)} past matches to fit team strengths...")
-    strength = fit_team_strength_model(train_df, use_xg=True)
+    # 1) Team strengths: load the latest model artifact (written by
+    #    fit_team_strength.py / update_results.py), else refit on historic matches
+    with stage("load_model"):
+        if latest_version() is not None:
+            artifact = load_model()
+            print(f"Using model v{artifact.version} ({artifact.meta['source']}, fit {artifact.meta['fit_date']}).")
+            strength = artifact.to_strength()
+            tensor = artifact.fixture_tensor()
+        else:
+            train_df = load_training_matches()
+            print(f"Using {len(train_df)} past matches to fit team strengths...")
+            weights = time_decay_weights(train_df["kickoff_time"], TIME_DECAY_XI)
+            strength = fit_team_strength_model(train_df, use_xg=True, weights=weights)
+            tensor = strength.fixture_tensor()
 
     # 2) Load FUTURE odds that you entered manually
-    future_odds = load_future_odds()
+    with stage("load_future_odds"):
+        future_odds = load_future_odds()
+    count("future_fixtures_loaded", len(future_odds))
     print(f"Loaded {len(future_odds)} future fixtures with odds.")
 
-    records = []
-
-    for _, row in future_odds.iterrows():
-        home = row["home_team"]
-        away = row["away_team"]
+    with stage("price"):
+        # --- model probabilities: lookups into the precomputed all-pairs tensor
+        model_probs = tensor.lookup_batch(
+            future_odds["home_team"], future_odds["away_team"], ["p_home", "p_draw", "p_away"]
+        )
 
-        # --- model probabilities
-        model_probs = outcome_probs(strength, home, away)
+        # --- market probabilities (overround removed), blend, edge and Kelly per outcome
+        frames, p_final_1x2 = one_x_two_frames(future_odds, model_probs)
 
-        # --- market probabilities from odds (remove overround)
-        market_probs = implied_probs_from_odds(
-            odds_home=row["odds_home"],
-            odds_draw=row["odds_draw"],
-            odds_away=row["odds_away"],
-        )
+        # 3) Other markets priced in future_odds.csv, all from the same score matrices
+        lam = tensor.lookup_batch(future_odds["home_team"], future_odds["away_team"], ["lambda_home", "lambda_away"])
+        matrices = score_matrices(lam[:, 0], lam[:, 1], rho=strength.rho, lambda3=strength.lambda3)
+        matrices /= matrices.sum(axis=(1, 2), keepdims=True)
+        for label, odd, p_model, p_market in extra_market_bets(future_odds, matrices):
+            frames.append(bet_frame(future_odds, label, -1, odd, p_model, p_market))
 
-        outcomes = {
-            "Home": ("p_home_model", "p_home_market", row["odds_home"]),
-            "Draw": ("p_draw_model", "p_draw_market", row["odds_draw"]),
-            "Away": ("p_away_model", "p_away_market", row["odds_away"]),
-        }
-
-        for outcome, (m_key, mk_key, odd) in outcomes.items():
-            p_model = model_probs[m_key]
-            p_market = market_probs[mk_key]
-
-            # blended probability
-            p_final = blended_prob(p_model, p_market)
-
-            # edge vs market probability
-            edge = p_final - p_market
-
-            # Kelly stake fraction (full Kelly)
-            kelly_full = max((p_final * odd - 1) / (odd - 1), 0.0)
-            stake_fraction = KELLY_FRACTION * kelly_full
-
-            records.append({
-                "date": row["date"],
-                "home_team": home,
-                "away_team": away,
-                "bet_side": outcome,          # Home / Draw / Away
-                "odds": odd,
-                "p_model": p_model,
-                "p_market": p_market,
-                "p_final": p_final,
-                "edge": edge,
-                "edge_pct": edge * 100,
-                "kelly_full": kelly_full,
-                "stake_fraction": stake_fraction,
-            })
-
-    results = pd.DataFrame(records)
+    results = pd.concat(frames, ignore_index=True)
 
     # Sort by edge descending
     results = results.sort_values("edge", ascending=False).reset_index(drop=True)
@@ -142,9 +184,23 @@ def main():
     all_path = RESULTS_DIR / "future_odds_all_edges.csv"
     rec_path = RESULTS_DIR / "future_odds_recommended_bets.csv"
 
-    results.to_csv(all_path, index=False)
     recs = results[results["edge"] >= MIN_EDGE].copy()
-    recs.to_csv(rec_path, index=False)
+
+    # Size all recommended 1X2 bets together: they settle on the same weekend and
+    # outcomes of one match are mutually exclusive (other markets keep their own stake)
+    one_x_two = recs["side"] >= 0
+    recs["stake_portfolio"] = np.nan
+    with stage("portfolio_kelly"):
+        recs.loc[one_x_two, "stake_portfolio"] = portfolio_kelly(
+            p_final_1x2,
+            recs.loc[one_x_two, "fixture"].to_numpy(),
+            recs.loc[one_x_two, "side"].to_numpy(),
+            recs.loc[one_x_two, "odds"].to_numpy(),
+            kelly_multiplier=KELLY_FRACTION,
+        )
+
+    results.drop(columns=["fixture", "side"]).to_csv(all_path, index=False)
+    recs.drop(columns=["fixture", "side"]).to_csv(rec_path, index=False)
 
     print(f"\n💾 Saved all edges to: {all_path}")
     print(f"💾 Saved recommended bets (edge ≥ {MIN_EDGE*100:.1f}%) to: {rec_path}\n")
@@ -159,8 +215,11 @@ def main():
                 f"{r['date']} - {r['home_team']} vs {r['away_team']} | "
                 f"Bet: {r['bet_side']} @ {r['odds']} | "
                 f"Edge: {r['edge_pct']:.1f}% | Stake: {r['stake_fraction']:.3f} bankroll"
+                + (f" (portfolio: {r['stake_portfolio']:.3f})" if r["side"] >= 0 else "")
             )
 
+    print(f"\n⏱  Metrics written to {write_report('predict_from_future_odds')}")
+
 
 if __name__ == "__main__":
     main()
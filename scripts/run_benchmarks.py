@@ -0,0 +1,129 @@
+import contextlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from epl_betting.betting.portfolio import portfolio_kelly
+from epl_betting.config import MIN_EDGE
+from epl_betting.data.load_players import load_players_matchstats
+from epl_betting.data.synthetic import generate_synthetic_data
+from epl_betting.data.teams import TeamRegistry
+from epl_betting.evaluation.benchmark import append_history, compare_to_previous, load_history, measure
+from epl_betting.models.artifact import load_model, save_model
+from epl_betting.models.probability import outcome_probs
+from epl_betting.models.simulate import simulate_match
+from epl_betting.models.team_strength import fit_poisson_strength_model, fit_team_strength_model
+
+import make_features
+import predict_from_future_odds as predict
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BENCH_DIR = PROJECT_ROOT / "data" / "benchmarks"
+RESULTS_DIR = PROJECT_ROOT / "data" / "results"
+HISTORY_PATH = RESULTS_DIR / "benchmark_history.json"
+
+DEFAULT_SCALES = [1, 10, 100]
+REPEATS = 3
+MAX_LOOP_CALLS = 2000     # per-fixture stages (outcome_probs, simulate_match) are capped
+
+
+def quiet(fn):
+    """
+    Run fn with stdout swallowed (make_match_features prints join diagnostics).
+    """
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return run
+
+
+def predict_end_to_end(raw_dir: Path, registry: TeamRegistry, model_root: Path) -> pd.DataFrame:
+    """
+    Same steps as make_features.py -> fit_team_strength.py ->
+    predict_from_future_odds.py, on one synthetic data directory.
+    """
+    features = make_features.make_match_features(raw_dir, registry)
+    strength = fit_poisson_strength_model(features)
+    save_model(strength, root=model_root, training_data=features, source="benchmark")
+    tensor = load_model(model_root).fixture_tensor()
+
+    future_odds = pd.read_csv(raw_dir / "future_odds.csv")
+    future_odds["date"] = None
+    model_probs = tensor.lookup_batch(
+        future_odds["home_team"], future_odds["away_team"], ["p_home", "p_draw", "p_away"]
+    )
+    frames, p_final = predict.one_x_two_frames(future_odds, model_probs)
+    results = pd.concat(frames, ignore_index=True)
+    recs = results[results["edge"] >= MIN_EDGE].copy()
+    recs["stake_portfolio"] = portfolio_kelly(
+        p_final,
+        recs["fixture"].to_numpy(), recs["side"].to_numpy(), recs["odds"].to_numpy(),
+        seed=0,
+    )
+    return recs
+
+
+def run_scale(scale: int, work_dir: Path):
+    """
+    Generate synthetic data at `scale` and benchmark every stage on it.
+    """
+    raw_dir = BENCH_DIR / f"synthetic_{scale}x"
+    registry = TeamRegistry.from_external_ids(generate_synthetic_data(raw_dir, scale=scale, seed=scale))
+
+    features = quiet(lambda: make_features.make_match_features(raw_dir, registry))()
+    n_matches = len(features)
+    home = features["home_team_name"].tolist()[:MAX_LOOP_CALLS]
+    away = features["away_team_name"].tolist()[:MAX_LOOP_CALLS]
+    ratio_model = fit_team_strength_model(features, use_xg=True)
+    rng = np.random.default_rng(0)
+    players_path = raw_dir / "players_this_season.csv"
+    n_players = len(load_players_matchstats(players_path, columns=["player_id"]))
+
+    stages = [
+        ("load_players_matchstats", lambda: load_players_matchstats(players_path), n_players),
+        ("make_match_features", quiet(lambda: make_features.make_match_features(raw_dir, registry)), n_matches),
+        ("fit_team_strength_model", lambda: fit_team_strength_model(features, use_xg=True), n_matches),
+        ("fit_poisson_strength_model", lambda: fit_poisson_strength_model(features), n_matches),
+        ("outcome_probs", lambda: [outcome_probs(ratio_model, h, a) for h, a in zip(home, away)], len(home)),
+        ("simulate_match", lambda: [simulate_match(ratio_model, h, a, rng=rng) for h, a in zip(home, away)], len(home)),
+        ("predict_end_to_end",
+         quiet(lambda: predict_end_to_end(raw_dir, registry, Path(tempfile.mkdtemp(dir=work_dir)))),
+         n_matches),
+    ]
+
+    results = []
+    for name, fn, n_items in stages:
+        result = measure(name, fn, n_items, scale=scale, repeats=REPEATS)
+        print(f"  {name:<28} {result.wall_time:9.4f}s  {result.peak_memory_mb:8.1f} MB  "
+              f"{result.throughput:12.1f} items/s")
+        results.append(result)
+    return results
+
+
+def main():
+    scales = [int(a) for a in sys.argv[1:]] or DEFAULT_SCALES
+    history = load_history(HISTORY_PATH)
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for scale in scales:
+            print(f"\n⏱  Scale {scale}x")
+            results.extend(run_scale(scale, Path(work_dir)))
+
+    ratios = compare_to_previous(results, history)
+    if ratios:
+        print("\nWall time vs previous run:")
+        for (name, scale), ratio in ratios.items():
+            flag = "  ⚠ slower" if ratio > 1.2 else ""
+            print(f"  {name} @ {scale}x: {ratio:.2f}x{flag}")
+
+    entry = append_history(results, HISTORY_PATH)
+    print(f"\n💾 Appended run ({entry['git_commit']}) to {HISTORY_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import sys
+import time
+
+from epl_betting.pipeline import STAGES, run_pipeline
+
+
+def main():
+    args = sys.argv[1:]
+    force = "--force" in args
+    targets = [a for a in args if not a.startswith("--")]
+
+    print("Stages:", " → ".join(s.name for s in STAGES))
+    start = time.perf_counter()
+    status = run_pipeline(targets=targets or None, force=force)
+    elapsed = time.perf_counter() - start
+
+    ran = [name for name, s in status.items() if s == "ran"]
+    print(f"\n✅ Pipeline finished in {elapsed:.1f}s ({len(ran)} of {len(status)} stages ran)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import sys
+
+from epl_betting.config import KELLY_FRACTION, MIN_EDGE, MODEL_WEIGHT
+from epl_betting.service import PredictionService, make_server
+
+HOST = "127.0.0.1"
+PORT = 8000
+
+
+def main():
+    """
+    Usage: python scripts/serve_predictions.py [port]
+
+    Long-running prediction service on the latest model artifact, using
+    MODEL_WEIGHT / MIN_EDGE / KELLY_FRACTION from epl_betting.config (as
+    predict_from_future_odds.py does).
+    Picks up new model versions (fit_team_strength.py / update_results.py)
+    without a restart.
+    """
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    port = int(args[0]) if args else PORT
+
+    service = PredictionService(
+        model_weight=MODEL_WEIGHT,
+        min_edge=MIN_EDGE,
+        kelly_multiplier=KELLY_FRACTION,
+    )
+    server = make_server(service, HOST, port)
+    print(f"🚀 Serving model v{service.version} on http://{HOST}:{port}")
+    print("   GET /predict?home_team=..&away_team=..  POST /predict/batch  GET /metrics  GET /health")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n📊 {service.metrics()}")
+
+
+if __name__ == "__main__":
+    main()
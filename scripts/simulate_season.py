@@ -0,0 +1,35 @@
+from pathlib import Path
+
+from epl_betting.config import N_SIMULATIONS
+from epl_betting.models.team_strength import fit_team_strength_model
+from epl_betting.models.simulate import simulate_season
+from epl_betting.data.features import load_features
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = PROJECT_ROOT / "data" / "results"
+
+FEATURE_COLUMNS = [
+    "home_team_name", "away_team_name",
+    "home_goals", "away_goals", "home_xg", "away_xg",
+]
+
+
+def main():
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+
+    played = load_features(columns=FEATURE_COLUMNS)
+    played = played[played["home_goals"].notna()]
+
+    strength = fit_team_strength_model(played, use_xg=True)
+
+    print(f"Simulating {N_SIMULATIONS} seasons from {len(played)} played matches...")
+    table = simulate_season(strength, played, n_simulations=N_SIMULATIONS, seed=2025)
+
+    out_path = RESULTS_DIR / "season_simulation.csv"
+    table.to_csv(out_path, index=False)
+    print(f"✅ Saved season probabilities to {out_path}")
+    print(table.round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
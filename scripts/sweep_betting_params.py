@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pandas as pd
+
+from epl_betting.config import KELLY_FRACTION, MIN_EDGE, MODEL_WEIGHT
+from epl_betting.data.features import load_features
+from epl_betting.evaluation.backtest import walk_forward_backtest
+from epl_betting.evaluation.sweep import sweep_ledger
+from epl_betting.instrumentation import count, stage, write_report
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = PROJECT_ROOT / "data" / "results"
+
+FEATURE_COLUMNS = [
+    "gameweek", "kickoff_time",
+    "home_team_name", "away_team_name",
+    "home_goals", "away_goals",
+    "odds_home", "odds_draw", "odds_away",
+    "best_odds_home", "best_odds_draw", "best_odds_away",
+    "p_home_consensus", "p_draw_consensus", "p_away_consensus",
+]
+
+MIN_BETS = 20      # settings with fewer bets are left out of the top table
+TOP_N = 10
+
+
+def main():
+    """
+    Usage: python scripts/sweep_betting_params.py
+
+    Prices every match once with the walk-forward backtest, then evaluates
+    the whole MODEL_WEIGHT x MIN_EDGE x KELLY_FRACTION grid on those prices
+    and writes one row per setting to data/results/betting_param_sweep.csv.
+    """
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+
+    with stage("load_features"):
+        df = load_features(columns=FEATURE_COLUMNS)
+    with stage("walk_forward_backtest"):
+        ledger, _ = walk_forward_backtest(df)
+    with stage("sweep"):
+        result = sweep_ledger(ledger)
+        table = result.to_frame()
+    count("settings_evaluated", len(table))
+    count("matches_priced", len(ledger) // 3)
+
+    out_path = RESULTS_DIR / "betting_param_sweep.csv"
+    table.to_csv(out_path, index=False)
+    print(f"✅ Saved {len(table)} settings over {len(ledger) // 3} matches to {out_path}")
+
+    shown = ["model_weight", "min_edge", "kelly_fraction", "n_bets", "roi", "profit", "log_growth", "max_drawdown"]
+    top = table[table["n_bets"] >= MIN_BETS].nlargest(TOP_N, "log_growth")
+    print(f"\nTop {TOP_N} by log-growth (at least {MIN_BETS} bets):")
+    print(top[shown].round(4).to_string(index=False))
+
+    current = pd.DataFrame({"config.py": result.at(MODEL_WEIGHT, MIN_EDGE, KELLY_FRACTION)}).T.astype({"n_bets": int})
+    print("\nCurrent setting:")
+    print(current[shown].round(4).to_string())
+
+    print(f"\n⏱  Metrics written to {write_report('sweep_betting_params')}")
+
+
+if __name__ == "__main__":
+    main()
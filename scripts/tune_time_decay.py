@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+from epl_betting.config import TIME_DECAY_XI
+from epl_betting.data.features import load_features
+from epl_betting.instrumentation import count, stage, write_report
+from epl_betting.models.time_decay import search_time_decay
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = PROJECT_ROOT / "data" / "results"
+
+FEATURE_COLUMNS = [
+    "gameweek", "kickoff_time",
+    "home_team_name", "away_team_name",
+    "home_goals", "away_goals", "home_xg", "away_xg",
+]
+
+
+def main():
+    """
+    Usage: python scripts/tune_time_decay.py [--xg] [--serial]
+
+    Scores every decay rate in DECAY_GRID by walk-forward out-of-sample
+    log-likelihood of the scores (model fit on goals, or on xG with --xg)
+    and writes the table to data/results/time_decay_search.csv.
+    """
+    use_xg = "--xg" in sys.argv[1:]
+    n_workers = 1 if "--serial" in sys.argv[1:] else None
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+
+    with stage("load_features"):
+        df = load_features(columns=FEATURE_COLUMNS)
+
+    with stage("search_time_decay"):
+        table = search_time_decay(df, use_xg=use_xg, n_workers=n_workers)
+    count("decay_rates_scored", len(table))
+    count("refits", int(table["n_refits"].sum()))
+
+    out_path = RESULTS_DIR / "time_decay_search.csv"
+    table.to_csv(out_path, index=False)
+    print(f"✅ Saved decay search to {out_path}")
+    print(table[["xi", "mean_log_likelihood", "n_scored", "n_iterations", "seconds"]].round(4).to_string(index=False))
+
+    best = table.loc[table["best"]].iloc[0]
+    print(f"\nBest xi: {best['xi']:g}/day (half-life {0.693147 / best['xi']:.0f} days)"
+          if best["xi"] > 0 else "\nBest xi: 0 (no decay)")
+    if best["xi"] != TIME_DECAY_XI:
+        print(f"   config.TIME_DECAY_XI is {TIME_DECAY_XI:g}")
+
+    print(f"\n⏱  Metrics written to {write_report('tune_time_decay')}")
+
+
+if __name__ == "__main__":
+    main()
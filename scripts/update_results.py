@@ -0,0 +1,93 @@
+import sys
+import time
+from pathlib import Path
+
+from epl_betting.config import SCORE_MODEL, TIME_DECAY_XI
+from epl_betting.models.artifact import latest_version, load_model, save_model
+from epl_betting.models.online import (
+    StrengthState, finished_matches, load_state, save_state, state_to_strength, update_state,
+)
+from epl_betting.models.dixon_coles import fit_score_model
+from epl_betting.models.team_strength import time_decay_weights
+from epl_betting.data.features import load_features
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+MODELS_DIR = PROJECT_ROOT / "models"
+
+STATE_PATH = MODELS_DIR / "strength_state.json"
+
+FEATURE_COLUMNS = [
+    "match_id", "kickoff_time",
+    "home_team_name", "away_team_name",
+    "home_goals", "away_goals",
+]
+
+
+def main():
+    """
+    Usage: python scripts/update_results.py [--rebuild] [--model=poisson|dixon_coles|bivariate_poisson]
+
+    Folds results that arrived since the last run (by match_id, so late and
+    rearranged fixtures count too) into the strength state
+    (models/strength_state.json): the sufficient statistics of the
+    time-decayed Poisson MLE that fit_team_strength.py publishes. The MLE is
+    then re-solved from the statistics, warm-started from the previous
+    solution, and published as the next model version. Both steps cost the
+    same however many matches have been played.
+    The state is rebuilt when TIME_DECAY_XI has changed.
+
+    Dixon-Coles and bivariate Poisson (--model, default config.SCORE_MODEL)
+    have no such statistics: they are refit on every finished match,
+    warm-started from the Poisson solution, and published with their
+    rho / lambda3.
+    """
+    rebuild = "--rebuild" in sys.argv[1:]
+    model_name = next((a.split("=", 1)[1] for a in sys.argv[1:] if a.startswith("--model=")), SCORE_MODEL)
+
+    state = load_state(STATE_PATH) if STATE_PATH.exists() and not rebuild else None
+    if state is not None and state.xi != TIME_DECAY_XI:
+        print(f"TIME_DECAY_XI changed ({state.xi} -> {TIME_DECAY_XI}), rebuilding the state")
+        state = None
+    if state is None:
+        state = StrengthState(xi=TIME_DECAY_XI)
+
+    df = load_features(columns=FEATURE_COLUMNS)
+
+    start = time.perf_counter()
+    n_new = update_state(state, df)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if n_new == 0:
+        print(f"No new results (state v{state.version}, {state.n_matches} matches).")
+        return
+
+    print(f"✅ Added {n_new} results in {elapsed_ms:.1f} ms → state v{state.version} ({state.n_matches} matches)")
+
+    # a fresh state starts the solver from the latest published model
+    warm_start = latest_version()
+    init = load_model(version=warm_start).to_strength() if warm_start is not None and state.params is None else None
+
+    start = time.perf_counter()
+    strength = state_to_strength(state, init=init)
+    source = "poisson_mle"
+    finished = finished_matches(df)
+    if model_name != "poisson":
+        weights = time_decay_weights(finished["kickoff_time"], TIME_DECAY_XI)
+        strength, source = fit_score_model(model_name, finished, weights=weights, init=strength)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    artifact = save_model(
+        strength,
+        training_data=finished,
+        source=source,
+        extra_meta={"time_decay_xi": TIME_DECAY_XI, "score_model": model_name, "state_version": state.version},
+    )
+    print(f"✅ Solved {model_name} in {elapsed_ms:.1f} ms → published model v{artifact.version} → {artifact.path}")
+
+    # Saved last, so a failed solve is retried on the next run
+    save_state(state, STATE_PATH)
+    print(f"✅ State saved to {STATE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+from epl_betting.evaluation.backtest import compute_roi, walk_forward_backtest
+from epl_betting.data.features import load_features
+from epl_betting.data.odds_store import OddsStore, closing_line_value
+from epl_betting.instrumentation import count, stage, write_report
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = PROJECT_ROOT / "data" / "results"
+
+FEATURE_COLUMNS = [
+    "gameweek", "kickoff_time",
+    "home_team_name", "away_team_name",
+    "home_goals", "away_goals", "home_xg", "away_xg",
+    "odds_home", "odds_draw", "odds_away",
+    "best_odds_home", "best_odds_draw", "best_odds_away",
+    "p_home_consensus", "p_draw_consensus", "p_away_consensus",
+    "match_id_odds",
+]
+
+
+def main():
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+
+    with stage("load_features"):
+        df = load_features(columns=FEATURE_COLUMNS)
+    with stage("walk_forward_backtest"):
+        ledger, timings = walk_forward_backtest(df)
+
+    out_path = RESULTS_DIR / "walk_forward_ledger.csv"
+    ledger.to_csv(out_path, index=False)
+    print(f"✅ Saved walk-forward ledger to {out_path}")
+
+    bets = ledger[ledger["bet"]]
+    count("bets_placed", len(bets))
+    print(f"Bets placed: {len(bets)} | Staked: {bets['stake'].sum():.3f} | "
+          f"Profit: {bets['profit'].sum():.3f} | ROI: {compute_roi(bets):.2%}")
+
+    with stage("load_odds_snapshots"):
+        snapshots = OddsStore().load()
+    if not bets.empty and not snapshots.empty:
+        with stage("closing_line_value"):
+            clv = closing_line_value(
+                bets.assign(selection=bets["bet_side"].str.lower()), snapshots, bookmaker="PS"
+            )
+        print(f"Closing-line value vs Pinnacle close: mean {clv['clv'].mean():+.2%} | "
+              f"beat the close on {(clv['price_ratio'] > 0).mean():.0%} of bets")
+
+    print("\nStage timings (s):")
+    for name, value in timings.items():
+        print(f"  {name}: {value}")
+
+    print(f"\n⏱  Metrics written to {write_report('walk_forward_backtest')}")
+
+
+if __name__ == "__main__":
+    main()
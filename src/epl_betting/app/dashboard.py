@@ -1,7 +1,17 @@
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
 import streamlit as st
 import pandas as pd
 
-from ..config import RESULTS_DIR
+from ..config import KELLY_FRACTION, MAX_TOTAL_EXPOSURE, RESULTS_DIR
+from ..evaluation.bankroll import (
+    PORTFOLIO_POLICY, RUIN_LEVEL, BetSlate, policies_from_fractions, simulate_bankroll, slate_from_edges, slate_from_ledger,
+)
+
+KELLY_CHOICES = [0.1, 0.2, 0.25, 0.33, 0.5, 0.75, 1.0]
+PATH_CHOICES = [10_000, 50_000, 100_000, 250_000]
 
 
 def load_upcoming_fixtures() -> pd.DataFrame:
@@ -15,10 +25,102 @@ def load_upcoming_fixtures() -> pd.DataFrame:
     return pd.DataFrame()
 
 
+def bet_slate_files(source: str) -> Tuple[Path, ...]:
+    """
+    Files load_bet_slate reads for source.
+    """
+    if source == "Backtest ledger":
+        return (RESULTS_DIR / "walk_forward_ledger.csv",)
+    return (RESULTS_DIR / "future_odds_all_edges.csv", RESULTS_DIR / "future_odds_recommended_bets.csv")
+
+
+def files_signature(paths: Tuple[Path, ...]) -> Tuple[Optional[int], ...]:
+    """
+    Modification time (ns) of each file, None if missing; part of the
+    cache key so a rewritten ledger or bet file is simulated afresh.
+    """
+    return tuple(p.stat().st_mtime_ns if p.exists() else None for p in paths)
+
+
+def load_bet_slate(source: str) -> Optional[BetSlate]:
+    """
+    Bets for the bankroll simulation: the walk-forward ledger
+    (scripts/walk_forward_backtest.py) or the upcoming recommended bets
+    (scripts/predict_from_future_odds.py). None if the files are missing.
+    """
+    paths = bet_slate_files(source)
+    if not all(p.exists() for p in paths):
+        return None
+    if source == "Backtest ledger":
+        return slate_from_ledger(pd.read_csv(paths[0]))
+    edges, bets = paths
+    return slate_from_edges(pd.read_csv(edges), pd.read_csv(bets))
+
+
+@st.cache_data(show_spinner="Simulating bankroll paths...")
+def bankroll_risk(source: str,
+                  files: Tuple[Optional[int], ...],
+                  fractions: Tuple[float, ...],
+                  max_exposure: Optional[float],
+                  n_paths: int,
+                  n_repeats: int,
+                  ruin_level: float,
+                  portfolio: bool = True) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    (per-policy summary, histogram of log10 terminal bankroll per policy).
+    files is files_signature of the source's files, only used as cache key.
+    portfolio adds PORTFOLIO_POLICY, the stakes actually recommended.
+    """
+    slate = load_bet_slate(source)
+    if slate is None:
+        return pd.DataFrame(), pd.DataFrame()
+    policies = policies_from_fractions(fractions, max_exposure) + ([PORTFOLIO_POLICY] if portfolio else [])
+    sim = simulate_bankroll(
+        slate, policies,
+        n_paths=n_paths, n_repeats=n_repeats, ruin_level=ruin_level, seed=0,
+    )
+    log_terminal = np.log10(np.maximum(sim.terminal, 1e-6))
+    bins = np.linspace(log_terminal.min(), log_terminal.max() + 1e-9, 41)
+    hist = pd.DataFrame(
+        {p.name: np.histogram(row, bins)[0] / sim.terminal.shape[1] for p, row in zip(sim.policies, log_terminal)},
+        index=np.round((bins[:-1] + bins[1:]) / 2, 2),
+    )
+    hist.index.name = "log10 terminal bankroll"
+    return sim.summary(), hist
+
+
+def bankroll_risk_page():
+    st.header("Bankroll Risk")
+    source = st.radio("Bets", ["Backtest ledger", "Upcoming recommended bets"], horizontal=True)
+    fractions = st.multiselect("Kelly fractions", KELLY_CHOICES, default=[KELLY_FRACTION, 0.5, 1.0])
+    capped = st.checkbox(f"Cap total stake per round at {MAX_TOTAL_EXPOSURE:g} of bankroll")
+    portfolio = st.checkbox(f"Add the recommended portfolio stakes ({PORTFOLIO_POLICY.name})", value=True)
+    n_paths = st.select_slider("Paths", PATH_CHOICES, value=100_000)
+    n_repeats = st.slider(
+        "Replays of the bets (e.g. 38 = one weekend's slate every round of a season)", 1, 38,
+        1 if source == "Backtest ledger" else 38,
+    )
+    ruin_level = st.slider("Ruin below (fraction of starting bankroll)", 0.05, 0.9, RUIN_LEVEL, step=0.05)
+    if not fractions and not portfolio:
+        st.info("Pick at least one Kelly fraction.")
+        return
+
+    summary, hist = bankroll_risk(
+        source, files_signature(bet_slate_files(source)),
+        tuple(sorted(fractions)), MAX_TOTAL_EXPOSURE if capped else None, n_paths, n_repeats, ruin_level, portfolio,
+    )
+    if summary.empty:
+        st.info("No bets found yet: run walk_forward_backtest.py or predict_from_future_odds.py first.")
+        return
+    st.dataframe(summary.drop(columns=["kelly_fraction", "max_exposure"]).round(3), hide_index=True)
+    st.subheader("Terminal bankroll distribution")
+    st.line_chart(hist)
+
+
 def main():
     st.title("Premier League Value Betting Model")
 
-    page = st.sidebar.radio("Page", ["Upcoming Fixtures", "Match Detail", "Performance"])
+    page = st.sidebar.radio("Page", ["Upcoming Fixtures", "Match Detail", "Performance", "Bankroll Risk"])
 
     if page == "Upcoming Fixtures":
         st.header("Upcoming Fixtures")
@@ -36,6 +138,9 @@ def main():
         st.header("Performance & Backtest")
         st.info("Performance view not implemented yet.")
 
+    elif page == "Bankroll Risk":
+        bankroll_risk_page()
+
 
 if __name__ == "__main__":
     main()
@@ -1,3 +1,3 @@
 """
-Betting utilities: odds conversion, Bayesian blending, stake sizing.
+Betting utilities: odds conversion, Bayesian blending, stake sizing, pricing.
 """
\ No newline at end of file
@@ -0,0 +1,247 @@
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import KELLY_FRACTION, MIN_EDGE, MODEL_WEIGHT
+from ..data.teams import TeamRegistry
+from ..models.fixture_tensor import FixtureTensor
+from .odds_utils import devig
+from .pricing import price_bets
+
+OUTCOMES = ("Home", "Draw", "Away")
+ODDS_FIELDS = ("odds_home", "odds_draw", "odds_away")
+
+# A tick is one JSON object per line:
+# {"home_team": ..., "away_team": ..., "odds_home": ..., "odds_draw": ..., "odds_away": ..., "ts": ...}
+
+
+@dataclass
+class LatencyStats:
+    """
+    Processing times in microseconds. With a window, only the most recent
+    `window` samples are kept (for long-running processes).
+    """
+    window: Optional[int] = None
+    samples: Deque[float] = field(init=False)
+
+    def __post_init__(self):
+        self.samples = deque(maxlen=self.window)
+
+    def record(self, start_ns: int) -> float:
+        us = (time.perf_counter_ns() - start_ns) / 1000.0
+        self.samples.append(us)
+        return us
+
+    def summary(self) -> Dict[str, float]:
+        if not self.samples:
+            return {"n": 0}
+        values = np.fromiter(self.samples, dtype=float, count=len(self.samples))
+        return {
+            "n": len(values),
+            "p50_us": float(np.percentile(values, 50)),
+            "p99_us": float(np.percentile(values, 99)),
+            "max_us": float(values.max()),
+        }
+
+
+class LivePricer:
+    """
+    Keeps model probabilities for every fixture seen in memory and reprices
+    a fixture only when its 1X2 prices change. Model probabilities come from
+    the fixture tensor once per fixture; each price change is then one
+    de-vig and one price_bets call on three outcomes. Malformed ticks (an
+    unknown team, a missing, null or non-numeric price, or a price of 1 or
+    less) are dropped and counted in n_rejected.
+    """
+
+    def __init__(self,
+                 tensor: FixtureTensor,
+                 registry: TeamRegistry,
+                 model_weight: float = MODEL_WEIGHT,
+                 min_edge: float = MIN_EDGE,
+                 kelly_multiplier: float = KELLY_FRACTION):
+        self.tensor = tensor
+        self.registry = registry
+        self.model_weight = model_weight
+        self.min_edge = min_edge
+        self.kelly_multiplier = kelly_multiplier
+
+        self._alias_cache: Dict[str, str] = {}
+        self._model: Dict[Tuple[str, str], np.ndarray] = {}
+        self._odds: Dict[Tuple[str, str], Tuple[float, float, float]] = {}
+        self.recommendations: Dict[Tuple[str, str], List[Dict]] = {}
+
+        self.latency = LatencyStats()
+        self.n_ticks = 0
+        self.n_unchanged = 0
+        self.n_rejected = 0
+
+    def _canonical(self, name: str) -> str:
+        canonical = self._alias_cache.get(name)
+        if canonical is None:
+            canonical = self.registry.canonical([name])[0]
+            self._alias_cache[name] = canonical
+        return canonical
+
+    def _model_probs(self, key: Tuple[str, str]) -> np.ndarray:
+        probs = self._model.get(key)
+        if probs is None:
+            row = self.tensor.lookup_batch([key[0]], [key[1]], ["p_home", "p_draw", "p_away"])[0]
+            probs = np.array(row, dtype=float)
+            self._model[key] = probs
+        return probs
+
+    def warm(self, fixtures: pd.DataFrame) -> None:
+        """
+        Resolve names and cache model probabilities for known fixtures up
+        front, so the first tick for them is as fast as the rest.
+        """
+        for home, away in zip(fixtures["home_team"], fixtures["away_team"]):
+            self._model_probs((self._canonical(home), self._canonical(away)))
+
+    def _reject(self, start: int) -> None:
+        self.n_rejected += 1
+        self.latency.record(start)
+        return None
+
+    def on_tick(self, tick: Dict) -> Optional[List[Dict]]:
+        """
+        Process one tick. Returns None if the fixture's prices did not move
+        (or the tick was rejected), otherwise its current recommendations
+        (possibly empty).
+        """
+        start = time.perf_counter_ns()
+        self.n_ticks += 1
+
+        try:
+            key = (self._canonical(tick["home_team"]), self._canonical(tick["away_team"]))
+            odds = (float(tick["odds_home"]), float(tick["odds_draw"]), float(tick["odds_away"]))
+        except (KeyError, TypeError, ValueError):
+            # unknown team, missing field, null or non-numeric price, or not an object
+            return self._reject(start)
+        if self._odds.get(key) == odds:
+            self.n_unchanged += 1
+            self.latency.record(start)
+            return None
+        # plain float checks: cheaper than check_odds for three prices, and a
+        # tick with a missing (NaN) price is rejected too
+        if not (1.0 < odds[0] < math.inf and 1.0 < odds[1] < math.inf and 1.0 < odds[2] < math.inf):
+            return self._reject(start)
+        try:
+            p_model = self._model_probs(key)
+        except KeyError:
+            # team known to the registry but not in the model
+            return self._reject(start)
+        self._odds[key] = odds
+
+        odds_array = np.array(odds)
+        p_market = devig(odds_array)
+        priced = price_bets(p_model, p_market, odds_array, self.model_weight, self.min_edge, self.kelly_multiplier)
+
+        recs = []
+        for i in np.flatnonzero(priced["recommended"]):
+            recs.append({
+                "home_team": key[0],
+                "away_team": key[1],
+                "bet_side": OUTCOMES[i],
+                "odds": odds[i],
+                "p_model": float(p_model[i]),
+                "p_market": float(p_market[i]),
+                "p_final": float(priced["p_final"][i]),
+                "edge": float(priced["edge"][i]),
+                "stake_fraction": float(priced["stake_fraction"][i]),
+                "ts": tick.get("ts"),
+            })
+        self.recommendations[key] = recs
+        recs_latency = self.latency.record(start)
+        for rec in recs:
+            rec["latency_us"] = recs_latency
+        return recs
+
+
+async def consume_feed(host: str,
+                       port: int,
+                       pricer: LivePricer,
+                       on_update: Callable[[Dict, List[Dict]], None],
+                       max_ticks: Optional[int] = None) -> None:
+    """
+    Read newline-delimited JSON ticks from a TCP feed until it closes (or
+    max_ticks have been read) and call on_update(tick, recommendations) for
+    every tick whose prices moved. Lines that are not valid JSON are counted
+    in pricer.n_rejected and skipped, like any other bad tick.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        n = 0
+        while max_ticks is None or n < max_ticks:
+            line = await reader.readline()
+            if not line:
+                break
+            n += 1
+            try:
+                tick = json.loads(line)
+            except json.JSONDecodeError:
+                pricer.n_ticks += 1
+                pricer.n_rejected += 1
+                continue
+            recs = pricer.on_tick(tick)
+            if recs is not None:
+                on_update(tick, recs)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def serve_replay_feed(fixtures: pd.DataFrame,
+                            host: str = "127.0.0.1",
+                            port: int = 8765,
+                            n_ticks: int = 1000,
+                            interval: float = 0.001,
+                            p_unchanged: float = 0.3,
+                            seed: Optional[int] = None) -> asyncio.AbstractServer:
+    """
+    Local stand-in for a bookmaker feed. Each client first gets the current
+    price of every fixture, then n_ticks updates: a random fixture either
+    re-sent unchanged (with probability p_unchanged) or with its prices
+    nudged by a small random walk. Closes the connection afterwards.
+    """
+    base = fixtures[["home_team", "away_team", *ODDS_FIELDS]].reset_index(drop=True)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        rng = np.random.default_rng(seed)
+        prices = base[list(ODDS_FIELDS)].to_numpy(dtype=float).copy()
+
+        def line(i: int) -> bytes:
+            tick = {
+                "home_team": base.at[i, "home_team"],
+                "away_team": base.at[i, "away_team"],
+                **{f: float(p) for f, p in zip(ODDS_FIELDS, prices[i])},
+                "ts": time.time(),
+            }
+            return (json.dumps(tick) + "\n").encode()
+
+        try:
+            for i in range(len(base)):
+                writer.write(line(i))
+            await writer.drain()
+            for _ in range(n_ticks):
+                i = int(rng.integers(len(base)))
+                if rng.random() >= p_unchanged:
+                    prices[i] = np.round(np.maximum(prices[i] * np.exp(rng.normal(0.0, 0.02, 3)), 1.01), 2)
+                writer.write(line(i))
+                await writer.drain()
+                if interval > 0:
+                    await asyncio.sleep(interval)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
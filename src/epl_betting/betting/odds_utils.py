@@ -1,21 +1,196 @@
-from typing import Dict
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import ODDS_SOURCE
+
+# Bookmaker column prefixes in football-data.co.uk files (E0.csv).
+# 1X2 prices are <prefix>H / D / A; closing prices are <prefix>CH / CD / CA.
+# Max/Avg are market aggregates rather than books, so they are left out.
+E0_BOOKMAKERS = ["B365", "BFD", "BMGM", "BV", "BW", "CL", "LB", "PS", "BFE"]
+# Exchanges quote prices before commission on net winnings (BFE = Betfair
+# Exchange, 5% base rate), so their prices are netted before comparing books.
+EXCHANGE_COMMISSION = {"BFE": 0.05}
+
+DEVIG_METHODS = ("proportional", "power", "shin", "odds_ratio")
+ODDS_SOURCES = ("best", "pinnacle")
+
+SIDES = ("home", "draw", "away")
+ODDS_COLUMNS = [f"odds_{s}" for s in SIDES]
+BEST_ODDS_COLUMNS = [f"best_odds_{s}" for s in SIDES]
+BEST_BOOK_COLUMNS = [f"best_book_{s}" for s in SIDES]
+CONSENSUS_COLUMNS = [f"p_{s}_consensus" for s in SIDES]
 
 
 def implied_probs_from_odds(odds_home: float,
                             odds_draw: float,
-                            odds_away: float) -> Dict[str, float]:
+                            odds_away: float,
+                            method: str = "proportional") -> Dict[str, float]:
     """
     Convert decimal odds for 1X2 into implied probabilities
     (removing the bookmaker overround).
+    Also works element-wise on arrays / Series of odds.
     """
-    inv_h = 1.0 / odds_home
-    inv_d = 1.0 / odds_draw
-    inv_a = 1.0 / odds_away
+    if method == "proportional":
+        inv_h = 1.0 / odds_home
+        inv_d = 1.0 / odds_draw
+        inv_a = 1.0 / odds_away
+
+        overround = inv_h + inv_d + inv_a
 
-    overround = inv_h + inv_d + inv_a
+        return {
+            "p_home_market": inv_h / overround,
+            "p_draw_market": inv_d / overround,
+            "p_away_market": inv_a / overround,
+        }
 
+    odds = np.stack([np.asarray(o, dtype=float) for o in (odds_home, odds_draw, odds_away)], axis=-1)
+    probs = devig(odds, method)
     return {
-        "p_home_market": inv_h / overround,
-        "p_draw_market": inv_d / overround,
-        "p_away_market": inv_a / overround,
-    }
\ No newline at end of file
+        "p_home_market": probs[..., 0],
+        "p_draw_market": probs[..., 1],
+        "p_away_market": probs[..., 2],
+    }
+
+
+def _bisect(f: Callable[[np.ndarray], np.ndarray],
+            lo: np.ndarray,
+            hi: np.ndarray,
+            n_iter: int = 60) -> np.ndarray:
+    """
+    Element-wise bisection for an increasing f with f(lo) <= 0 <= f(hi).
+    Brackets are wide enough for books priced under 100% (exchanges).
+    """
+    lo = lo.copy()
+    hi = hi.copy()
+    for _ in range(n_iter):
+        mid = 0.5 * (lo + hi)
+        above = f(mid) > 0
+        hi = np.where(above, mid, hi)
+        lo = np.where(above, lo, mid)
+    return 0.5 * (lo + hi)
+
+
+def devig(odds: np.ndarray, method: str = "proportional") -> np.ndarray:
+    """
+    Remove the overround from decimal odds, outcomes on the last axis.
+    Any leading shape works, e.g. (N matches, B bookmakers, 3).
+    Rows with a missing price come back as NaN.
+
+    Methods:
+      proportional: p = inv / sum(inv)
+      power:        p = inv ** k with k chosen so sum(p) = 1
+      shin:         Shin (1993) insider-trading model, solved for z
+      odds_ratio:   p = inv / (c + inv - c * inv), c chosen so sum(p) = 1
+    """
+    inv = 1.0 / np.asarray(odds, dtype=float)
+    booksum = inv.sum(axis=-1, keepdims=True)
+    shape = booksum.shape
+
+    if method == "proportional":
+        return inv / booksum
+
+    if method == "power":
+        # sum(inv ** k) falls as k grows (inv < 1); solve on log-scale for stability
+        log_inv = np.log(inv)
+        k = _bisect(
+            lambda k: 1.0 - np.exp(k * log_inv).sum(axis=-1, keepdims=True),
+            np.full(shape, 1e-3), np.full(shape, 10.0),
+        )
+        return np.exp(k * log_inv)
+
+    if method == "shin":
+        def shin_probs(z):
+            return (np.sqrt(z ** 2 + 4.0 * (1.0 - z) * inv ** 2 / booksum) - z) / (2.0 * (1.0 - z))
+
+        z = _bisect(
+            lambda z: 1.0 - shin_probs(z).sum(axis=-1, keepdims=True),
+            np.full(shape, -0.5), np.full(shape, 0.5),
+        )
+        return shin_probs(z)
+
+    if method == "odds_ratio":
+        def or_probs(c):
+            return inv / (c + inv - c * inv)
+
+        c = _bisect(
+            lambda c: 1.0 - or_probs(c).sum(axis=-1, keepdims=True),
+            np.full(shape, 1e-3), np.full(shape, 100.0),
+        )
+        return or_probs(c)
+
+    raise ValueError(f"Unknown de-vig method {method!r}; expected one of {DEVIG_METHODS}")
+
+
+def bookmaker_odds_tensor(df: pd.DataFrame,
+                          bookmakers: Optional[Sequence[str]] = None,
+                          closing: bool = False) -> Tuple[np.ndarray, list]:
+    """
+    Stack 1X2 prices from a football-data.co.uk frame into an
+    (N matches, B bookmakers, 3) array. Books without columns in df are
+    skipped; missing prices are NaN. Returns (tensor, bookmakers used).
+    """
+    if bookmakers is None:
+        bookmakers = E0_BOOKMAKERS
+    suffix = "C" if closing else ""
+
+    used = [b for b in bookmakers if all(f"{b}{suffix}{o}" in df.columns for o in "HDA")]
+    cols = [f"{b}{suffix}{o}" for b in used for o in "HDA"]
+    values = df[cols].to_numpy(dtype=float).reshape(len(df), len(used), 3)
+    return values, used
+
+
+def net_of_commission(odds: np.ndarray,
+                      bookmakers: Sequence[str],
+                      commission: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    (N, B, 3) odds with each exchange's commission taken off its winnings:
+    1 + (odds - 1) * (1 - c). Books not in commission are unchanged.
+    """
+    if commission is None:
+        commission = EXCHANGE_COMMISSION
+    c = np.array([commission.get(b, 0.0) for b in bookmakers], dtype=float)
+    return 1.0 + (odds - 1.0) * (1.0 - c)[None, :, None]
+
+
+def consensus_probs(odds: np.ndarray, method: str = "proportional") -> np.ndarray:
+    """
+    De-vig every bookmaker and average across the bookmaker axis (axis 1),
+    ignoring books with missing prices. Returns (N, 3) fair probabilities.
+    """
+    probs = devig(odds, method)
+    valid = ~np.isnan(probs).any(axis=-1, keepdims=True)
+    total = np.where(valid, probs, 0.0).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / valid.sum(axis=1)
+        return mean / mean.sum(axis=-1, keepdims=True)
+
+
+def best_prices(odds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Best available price per outcome across bookmakers (net exchange
+    prices with net_of_commission first). Returns ((N, 3) best odds, (N, 3) index of the bookmaker offering it).
+    """
+    filled = np.where(np.isnan(odds), -np.inf, odds)
+    book = filled.argmax(axis=1)
+    best = np.take_along_axis(filled, book[:, None, :], axis=1)[:, 0, :]
+    best = np.where(np.isinf(best), np.nan, best)
+    return best, book
+
+
+def market_prices(df: pd.DataFrame, source: str = ODDS_SOURCE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (N, 3) H/D/A decimal odds to bet at and market probabilities to measure
+    edge against. source "best" uses the best price across bookmakers
+    (best_odds_*) and the consensus probabilities (p_*_consensus) written by
+    build_odds_file.py; "pinnacle" uses odds_* and their proportional
+    de-vig. Frames without the best/consensus columns (e.g. hand-entered
+    future odds) are priced from odds_* either way.
+    """
+    if source not in ODDS_SOURCES:
+        raise ValueError(f"Unknown odds source {source!r}; expected one of {ODDS_SOURCES}")
+    if source == "best" and set(BEST_ODDS_COLUMNS + CONSENSUS_COLUMNS) <= set(df.columns):
+        return df[BEST_ODDS_COLUMNS].to_numpy(dtype=float), df[CONSENSUS_COLUMNS].to_numpy(dtype=float)
+    odds = df[ODDS_COLUMNS].to_numpy(dtype=float)
+    return odds, devig(odds)
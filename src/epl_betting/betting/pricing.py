@@ -0,0 +1,53 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+from ..config import KELLY_FRACTION, MIN_EDGE, MODEL_WEIGHT
+from .stake_sizing import kelly_fraction
+
+
+def check_odds(odds) -> np.ndarray:
+    """
+    Decimal odds as a float array. NaN marks a missing price; every other
+    price must be finite and greater than 1, otherwise ValueError.
+    """
+    odds = np.asarray(odds, dtype=float)
+    valid = (odds > 1.0) & (odds < np.inf)
+    if not valid.all():
+        bad = ~valid & ~np.isnan(odds)
+        if bad.any():
+            raise ValueError(f"decimal odds must be finite and greater than 1, got {odds[bad][:5].tolist()}")
+    return odds
+
+
+def price_bets(p_model,
+               p_market,
+               odds,
+               model_weight=MODEL_WEIGHT,
+               min_edge: float = MIN_EDGE,
+               kelly_multiplier: float = KELLY_FRACTION,
+               normalize_axis: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Blend, edge and fractional Kelly, element-wise over broadcastable arrays.
+
+    p_final = w * p_model + (1 - w) * p_market, renormalised along
+    normalize_axis when given (the outcome axis of H/D/A arrays);
+    edge = p_final - p_market; a bet is recommended when edge >= min_edge
+    and stakes kelly_multiplier * full Kelly at odds. model_weight may be an
+    array too, e.g. a grid of weights on a new leading axis.
+    Outcomes without a price (NaN odds) are never recommended.
+    """
+    odds = check_odds(odds)
+    p_market = np.asarray(p_market, dtype=float)
+    p_final = model_weight * np.asarray(p_model, dtype=float) + (1.0 - model_weight) * p_market
+    if normalize_axis is not None:
+        p_final = p_final / p_final.sum(axis=normalize_axis, keepdims=True)
+    edge = p_final - p_market
+    kelly_full = kelly_fraction(p_final, odds)
+    return {
+        "p_final": p_final,
+        "edge": edge,
+        "kelly_full": kelly_full,
+        "stake_fraction": kelly_multiplier * kelly_full,
+        "recommended": (edge >= min_edge) & ~np.isnan(odds),
+    }
@@ -1,10 +1,14 @@
-def kelly_fraction(p: float, odds: float) -> float:
+import numpy as np
+
+
+def kelly_fraction(p, odds):
     """
     Full Kelly fraction for a single outcome.
+    Works element-wise when p / odds are arrays.
 
     p: posterior probability of winning
     odds: decimal odds
     """
     b = odds - 1.0
     f_star = (p * (b + 1) - 1) / b  # standard Kelly formula
-    return max(0.0, f_star)
+    return np.maximum(0.0, f_star)
@@ -9,7 +9,26 @@ RESULTS_DIR = DATA_DIR / "results"
 
 N_SIMULATIONS = 20000
 
+# Dixon-Coles time decay (per day) for the team-strength fit: a match's weight
+# is exp(-TIME_DECAY_XI * age in days). Chosen by scripts/tune_time_decay.py
+# (best out-of-sample log-likelihood on 2025-26 so far); 0 disables it.
+TIME_DECAY_XI = 0.01
+
+# Score model fit_team_strength.py / update_results.py publish (override with
+# --model=<name>): "poisson" (independent), "dixon_coles" (low-score rho) or
+# "bivariate_poisson" (shared goal rate lambda3); see models.dixon_coles.SCORE_MODELS
+SCORE_MODEL = "poisson"
+
 # Betting parameters
 MODEL_WEIGHT = 0.3      # how much we trust our model vs market
-MIN_EDGE = 0.07         # minimum edge (3%) to place a bet
+MIN_EDGE = 0.07         # minimum edge (7%) to place a bet
 KELLY_FRACTION = 0.25   # fraction of full Kelly stake to actually use
+
+# Prices bets are placed at: "best" takes the best price across bookmakers and
+# measures edge against the de-vigged cross-bookmaker consensus; "pinnacle"
+# uses Pinnacle's price and its own de-vigged probabilities
+ODDS_SOURCE = "best"
+
+# Portfolio staking caps (fractions of bankroll, after KELLY_FRACTION is applied)
+MAX_TOTAL_EXPOSURE = 0.30   # total stake across all simultaneous bets
+MAX_MATCH_EXPOSURE = 0.10   # total stake on any single match
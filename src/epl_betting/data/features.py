@@ -1,5 +1,28 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
 import pandas as pd
 from ..config import PROCESSED_DIR
+from ..instrumentation import count
+
+# Explicit storage dtypes for known columns; everything else is inferred
+# (integral numbers -> smallest int, other numbers -> float32, text -> categorical).
+# Gameweek and team IDs are nullable (an unscheduled gameweek, an unmatched team).
+FEATURE_DTYPES: Dict[str, str] = {
+    "gameweek": "Int16",
+    "home_team": "Int16",
+    "away_team": "Int16",
+    "home_team_id": "Int16",
+    "away_team_id": "Int16",
+    "home_team_idx": "Int16",
+    "away_team_idx": "Int16",
+    "kickoff_time": "datetime64[ns]",
+}
+
+COLUMNAR_SUFFIX = ".cols"
+SCHEMA_FILE = "schema.json"
 
 
 def save_features(df: pd.DataFrame, name: str = "matches_features.csv") -> None:
@@ -7,4 +30,120 @@ def save_features(df: pd.DataFrame, name: str = "matches_features.csv") -> None:
     Save feature-engineered data to the processed directory.
     """
     PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
-    df.to_csv(PROCESSED_DIR / name, index=False)
\ No newline at end of file
+    df.to_csv(PROCESSED_DIR / name, index=False)
+
+
+def _storage_dtype(series: pd.Series) -> str:
+    """
+    Pick a compact dtype for a column that has no explicit entry in FEATURE_DTYPES.
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return "bool"
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return "datetime64[ns]"
+    if pd.api.types.is_numeric_dtype(series):
+        values = series.to_numpy(dtype=float)
+        if np.isnan(values).any() or not np.all(values == np.round(values)):
+            return "float32"
+        for dtype in ("int16", "int32"):
+            info = np.iinfo(dtype)
+            if values.size == 0 or (values.min() >= info.min and values.max() <= info.max):
+                return dtype
+        return "int64"
+    return "category"
+
+
+def _as_dtype(series: pd.Series, dtype: str):
+    """
+    A column converted to its storage dtype, as load_features returns it.
+    """
+    if dtype == "category":
+        cat = pd.Categorical(series.astype("string").astype(object).where(series.notna()))
+        # categories as built from schema.json, so both load paths agree
+        return pd.Categorical.from_codes(cat.codes, categories=pd.Index([str(c) for c in cat.categories]))
+    if dtype == "datetime64[ns]":
+        return pd.to_datetime(series).to_numpy(dtype="datetime64[ns]")
+    if dtype == "Int16":
+        return pd.array(series, dtype="Int16")
+    return series.to_numpy().astype(dtype)
+
+
+def save_features_columnar(df: pd.DataFrame, name: str = "matches_features") -> Path:
+    """
+    Save features as one .npy file per column plus a schema.json, so readers
+    can memory-map only the columns they need. Text columns are stored as
+    integer codes with their categories in the schema.
+    """
+    out_dir = PROCESSED_DIR / f"{name}{COLUMNAR_SUFFIX}"
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    schema = {"n_rows": len(df), "columns": []}
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        dtype = FEATURE_DTYPES.get(col) or _storage_dtype(series)
+        entry = {"name": col, "dtype": dtype, "file": f"c{i:03d}.npy"}
+
+        values = _as_dtype(series, dtype)
+        if dtype == "category":
+            code_dtype = np.int16 if len(values.categories) < np.iinfo(np.int16).max else np.int32
+            entry["categories"] = [str(c) for c in values.categories]
+            values = values.codes.astype(code_dtype)
+        elif dtype == "datetime64[ns]":
+            values = values.view("int64")
+        elif dtype == "Int16":
+            # missing values go to a separate boolean mask file, only when there are any
+            mask = values.isna()
+            if mask.any():
+                entry["mask"] = f"c{i:03d}_mask.npy"
+                np.save(out_dir / entry["mask"], mask)
+            values = values.to_numpy(dtype=np.int16, na_value=0)
+
+        np.save(out_dir / entry["file"], np.ascontiguousarray(values))
+        schema["columns"].append(entry)
+
+    (out_dir / SCHEMA_FILE).write_text(json.dumps(schema, indent=1))
+    return out_dir
+
+
+def load_features(name: str = "matches_features",
+                  columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Load processed features, reading only `columns` if given.
+    Uses the columnar store written by save_features_columnar when it exists
+    (memory-mapped, compact dtypes), otherwise falls back to the CSV, whose
+    columns are converted to the same dtypes.
+    """
+    col_dir = PROCESSED_DIR / f"{name}{COLUMNAR_SUFFIX}"
+    if not (col_dir / SCHEMA_FILE).exists():
+        df = pd.read_csv(PROCESSED_DIR / f"{name}.csv", usecols=columns)
+        wanted = list(columns) if columns is not None else list(df.columns)
+        df = pd.DataFrame(
+            {c: _as_dtype(df[c], FEATURE_DTYPES.get(c) or _storage_dtype(df[c])) for c in wanted},
+            index=df.index,
+        )
+        count("feature_rows_loaded", len(df))
+        return df
+
+    schema = json.loads((col_dir / SCHEMA_FILE).read_text())
+    entries = {c["name"]: c for c in schema["columns"]}
+    wanted: List[str] = list(columns) if columns is not None else list(entries)
+    missing = [c for c in wanted if c not in entries]
+    if missing:
+        raise ValueError(f"Columns not in {col_dir.name}: {missing}")
+
+    data = {}
+    for col in wanted:
+        entry = entries[col]
+        # copy-on-write mapping: pages are only read when touched
+        values = np.load(col_dir / entry["file"], mmap_mode="c")
+        if entry["dtype"] == "category":
+            data[col] = pd.Categorical.from_codes(values, categories=pd.Index(entry["categories"]))
+        elif entry["dtype"] == "datetime64[ns]":
+            data[col] = values.view("datetime64[ns]")
+        elif entry["dtype"] == "Int16":
+            mask = np.load(col_dir / entry["mask"]) if "mask" in entry else np.zeros(len(values), dtype=bool)
+            data[col] = pd.arrays.IntegerArray(np.asarray(values), mask)
+        else:
+            data[col] = values
+    count("feature_rows_loaded", schema["n_rows"])
+    return pd.DataFrame(data, index=pd.RangeIndex(schema["n_rows"]))
@@ -0,0 +1,57 @@
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import pandas as pd
+from ..betting.odds_utils import E0_BOOKMAKERS
+from ..config import RAW_DIR
+from .schema import DEFAULT_CHUNKSIZE, CsvSchema, iter_typed_csv, read_typed_csv
+
+E0_PATH = RAW_DIR / "E0.csv"
+
+E0_MATCH_COLUMNS = ["Div", "Date", "Time", "HomeTeam", "AwayTeam", "FTHG", "FTAG", "FTR"]
+# Every bookmaker's pre-closing and closing 1X2 price
+E0_ODDS_COLUMNS = [f"{b}{c}{o}" for c in ("", "C") for b in E0_BOOKMAKERS for o in "HDA"]
+
+_MATCH_STATS = ["FTHG", "FTAG", "HTHG", "HTAG", "HS", "AS", "HST", "AST",
+                "HF", "AF", "HC", "AC", "HY", "AY", "HR", "AR"]
+
+# Prices stay float64: they are money, and float32 turns 2.1 into 2.0999999
+E0_SCHEMA = CsvSchema(
+    dtypes={
+        "Div": "category",
+        "Time": "category",
+        "HomeTeam": "category",
+        "AwayTeam": "category",
+        "FTR": "category",
+        "HTR": "category",
+        "Referee": "category",
+        **{c: "int8" for c in _MATCH_STATS},
+        **{c: "float64" for c in E0_ODDS_COLUMNS},
+    },
+    dates={"Date": "%d/%m/%Y"},
+    encoding="utf-8-sig",   # football-data.co.uk files start with a BOM
+)
+
+
+def load_football_data(path: Path = E0_PATH,
+                       columns: Optional[Sequence[str]] = None,
+                       chunksize: Optional[int] = None) -> pd.DataFrame:
+    """
+    A football-data.co.uk results/odds file (E0.csv and friends), reading
+    only the match columns and bookmaker 1X2 prices by default instead of
+    all 100+ columns. Bookmakers a file does not have are skipped.
+    """
+    if columns is None:
+        columns = E0_MATCH_COLUMNS + E0_ODDS_COLUMNS
+    return read_typed_csv(path, E0_SCHEMA, columns=columns, chunksize=chunksize)
+
+
+def iter_football_data(path: Path = E0_PATH,
+                       columns: Optional[Sequence[str]] = None,
+                       chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """
+    Stream a football-data.co.uk file as typed chunks.
+    """
+    if columns is None:
+        columns = E0_MATCH_COLUMNS + E0_ODDS_COLUMNS
+    return iter_typed_csv(path, E0_SCHEMA, columns=columns, chunksize=chunksize)
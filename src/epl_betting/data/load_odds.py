@@ -1,5 +1,8 @@
+from pathlib import Path
+
 import pandas as pd
 from ..config import RAW_DIR
+from .teams import premier_league_registry
 
 
 def load_odds() -> pd.DataFrame:
@@ -18,3 +21,43 @@ def load_odds() -> pd.DataFrame:
     """
     path = RAW_DIR / "odds_premier_league.csv"
     return pd.read_csv(path, parse_dates=["date"])
+
+
+def load_future_odds(path: Path = RAW_DIR / "future_odds.csv") -> pd.DataFrame:
+    """
+    Load manually-entered future odds (data/raw/future_odds.csv).
+
+    Date column is optional. Required columns:
+      - home_team
+      - away_team
+      - odds_home
+      - odds_draw
+      - odds_away
+
+    Optional market columns (blank where not priced):
+      - odds_over_<line> / odds_under_<line>, e.g. odds_over_2_5
+      - ah_line (home handicap), odds_ah_home, odds_ah_away
+      - odds_btts_yes / odds_btts_no
+      - best_odds_<side> / p_<side>_consensus (side home/draw/away), used
+        instead of odds_* when config.ODDS_SOURCE is "best"
+    """
+    # Simple read: no date parsing, since we don't require a date column
+    df = pd.read_csv(path)
+
+    # If there's a date column, normalise it; otherwise it's fine
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"]).dt.date
+    else:
+        df["date"] = None
+
+    required_cols = ["home_team", "away_team", "odds_home", "odds_draw", "odds_away"]
+    missing = [c for c in required_cols if c not in df.columns]
+    if missing:
+        raise ValueError(f"{Path(path).name} is missing required columns: {missing}")
+
+    # Accept aliases ("Manchester United", "Spurs", ...); unknown names raise
+    registry = premier_league_registry()
+    df["home_team"] = registry.canonical(df["home_team"])
+    df["away_team"] = registry.canonical(df["away_team"])
+
+    return df
@@ -0,0 +1,167 @@
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..betting.odds_utils import bookmaker_odds_tensor, devig
+from ..config import PROCESSED_DIR
+
+# One row per price observation; (match_id, bookmaker, market, selection, timestamp) is the key
+SNAPSHOT_COLUMNS = ["match_id", "kickoff", "bookmaker", "market", "selection", "timestamp", "odds"]
+KEY_COLUMNS = ["match_id", "bookmaker", "market", "selection", "timestamp"]
+SERIES_COLUMNS = ["match_id", "bookmaker", "market", "selection"]
+
+SELECTIONS_1X2 = ["home", "draw", "away"]
+
+# football-data.co.uk pre-closing prices are collected on Friday afternoons
+# (Tuesdays for midweek rounds); closing prices are taken at kickoff.
+FD_OPENING_LEAD = pd.Timedelta(hours=48)
+
+STORE_PATH = PROCESSED_DIR / "odds_snapshots.csv"
+
+
+class OddsStore:
+    """
+    Append-only store of odds snapshots in a CSV at `path`. Appends only write
+    keys that are not stored yet, so re-ingesting the same file is a no-op.
+    load() returns the snapshots sorted by series then timestamp, which is the
+    order the as-of helpers below rely on.
+    """
+
+    def __init__(self, path: Path = STORE_PATH):
+        self.path = Path(path)
+
+    def load(self) -> pd.DataFrame:
+        if not self.path.exists():
+            return _sorted(pd.DataFrame({c: pd.Series(dtype=object) for c in SNAPSHOT_COLUMNS}))
+        df = pd.read_csv(self.path, parse_dates=["kickoff", "timestamp"])
+        return _sorted(df)
+
+    def append(self, snapshots: pd.DataFrame) -> int:
+        """
+        Append snapshots whose key is new. Returns the number of rows written.
+        """
+        snapshots = snapshots[SNAPSHOT_COLUMNS].dropna(subset=["odds"])
+        snapshots = snapshots.drop_duplicates(subset=KEY_COLUMNS, keep="last")
+        if self.path.exists():
+            keys = pd.read_csv(self.path, usecols=KEY_COLUMNS, parse_dates=["timestamp"])
+            snapshots = snapshots.merge(keys, on=KEY_COLUMNS, how="left", indicator=True)
+            snapshots = snapshots[snapshots["_merge"] == "left_only"].drop(columns="_merge")
+        if snapshots.empty:
+            return 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        snapshots.to_csv(self.path, mode="a", header=not self.path.exists(), index=False)
+        return len(snapshots)
+
+
+def _sorted(df: pd.DataFrame) -> pd.DataFrame:
+    for col in ("kickoff", "timestamp"):
+        df[col] = pd.to_datetime(df[col]).astype("datetime64[ns]")
+    df["odds"] = df["odds"].astype(float)
+    return df.sort_values(KEY_COLUMNS, kind="stable").reset_index(drop=True)
+
+
+def snapshots_from_football_data(df: pd.DataFrame,
+                                 match_ids: Sequence[str],
+                                 bookmakers: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Long-format 1X2 snapshots from a football-data.co.uk frame: every
+    bookmaker's pre-closing price (stamped FD_OPENING_LEAD before kickoff)
+    and closing price (stamped at kickoff). df needs Date and Time columns.
+    """
+    kickoff = pd.to_datetime(df["Date"], dayfirst=True) + pd.to_timedelta(df["Time"].astype(str) + ":00")
+    frames = []
+    for closing, stamp in ((False, kickoff - FD_OPENING_LEAD), (True, kickoff)):
+        odds, used = bookmaker_odds_tensor(df, bookmakers, closing=closing)
+        n, b, _ = odds.shape
+        frames.append(pd.DataFrame({
+            "match_id": np.repeat(np.asarray(match_ids), b * 3),
+            "kickoff": np.repeat(kickoff.to_numpy(), b * 3),
+            "bookmaker": np.tile(np.repeat(used, 3), n),
+            "market": "1x2",
+            "selection": np.tile(SELECTIONS_1X2, n * b),
+            "timestamp": np.repeat(stamp.to_numpy(), b * 3),
+            "odds": odds.ravel(),
+        }))
+    return pd.concat(frames, ignore_index=True).dropna(subset=["odds"])
+
+
+def price_asof(snapshots: pd.DataFrame,
+               queries: pd.DataFrame,
+               by: Sequence[str] = SERIES_COLUMNS) -> pd.Series:
+    """
+    Latest price at or before queries["asof"] for each query row, matched on
+    the `by` columns (one merge_asof for all queries). NaN where no snapshot
+    precedes the as-of time. Returned in query order.
+    """
+    by = list(by)
+    left = queries[by + ["asof"]].copy()
+    left["_row"] = np.arange(len(left))
+    left["asof"] = pd.to_datetime(left["asof"]).astype("datetime64[ns]")
+    left = left.sort_values("asof", kind="stable")
+    right = snapshots[by + ["timestamp", "odds"]].sort_values("timestamp", kind="stable")
+    right["timestamp"] = right["timestamp"].astype("datetime64[ns]")
+    merged = pd.merge_asof(left, right, left_on="asof", right_on="timestamp", by=by, direction="backward")
+    return merged.sort_values("_row")["odds"].set_axis(queries.index)
+
+
+def prices_before_kickoff(snapshots: pd.DataFrame, lead: pd.Timedelta) -> pd.DataFrame:
+    """
+    One row per series with the price standing `lead` before kickoff
+    (e.g. pd.Timedelta(hours=24) for "price at T-24h").
+    """
+    series = snapshots.drop_duplicates(subset=SERIES_COLUMNS)[SERIES_COLUMNS + ["kickoff"]].copy()
+    series["asof"] = series["kickoff"] - lead
+    series["odds"] = price_asof(snapshots, series)
+    return series.drop(columns="asof").reset_index(drop=True)
+
+
+def closing_prices(snapshots: pd.DataFrame) -> pd.DataFrame:
+    """
+    Last price at or before kickoff for every series.
+    """
+    return prices_before_kickoff(snapshots, pd.Timedelta(0))
+
+
+def best_prices_before_kickoff(snapshots: pd.DataFrame) -> pd.DataFrame:
+    """
+    Highest price seen for each (match, market, selection) across all
+    bookmakers and snapshots up to kickoff, with the bookmaker and time.
+    """
+    pre = snapshots[snapshots["timestamp"] <= snapshots["kickoff"]]
+    best = pre.loc[pre.groupby(["match_id", "market", "selection"], sort=False)["odds"].idxmax()]
+    return best[["match_id", "market", "selection", "bookmaker", "timestamp", "odds"]].reset_index(drop=True)
+
+
+def closing_line_value(bets: pd.DataFrame,
+                       snapshots: pd.DataFrame,
+                       bookmaker: str = "PS",
+                       market: str = "1x2") -> pd.DataFrame:
+    """
+    Closing-line value of bets (match_id, selection, odds) against one
+    bookmaker's de-vigged closing line: clv = odds * p_close - 1, i.e. the
+    expected return of the bet if the close is the true probability.
+    Also returns the raw price ratio odds / closing_odds - 1.
+    """
+    close = closing_prices(snapshots[(snapshots["bookmaker"] == bookmaker) & (snapshots["market"] == market)])
+    wide = close.pivot_table(index="match_id", columns="selection", values="odds")
+    wide = wide.reindex(columns=SELECTIONS_1X2)
+    p_close = pd.DataFrame(devig(wide.to_numpy()), index=wide.index, columns=SELECTIONS_1X2)
+
+    match = bets["match_id"].to_numpy()
+    col = pd.Index(SELECTIONS_1X2).get_indexer(bets["selection"])
+    row = wide.index.get_indexer(match)
+    found = row >= 0
+    closing_odds = np.full(len(bets), np.nan)
+    p = np.full(len(bets), np.nan)
+    closing_odds[found] = wide.to_numpy()[row[found], col[found]]
+    p[found] = p_close.to_numpy()[row[found], col[found]]
+
+    odds = bets["odds"].to_numpy(dtype=float)
+    return pd.DataFrame({
+        "closing_odds": closing_odds,
+        "p_close": p,
+        "clv": odds * p - 1.0,
+        "price_ratio": odds / closing_odds - 1.0,
+    }, index=bets.index)
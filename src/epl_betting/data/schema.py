@@ -0,0 +1,87 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+@dataclass
+class CsvSchema:
+    """
+    Declared layout of a raw CSV: a storage dtype per column (numpy dtypes,
+    "category" or "str"), date columns with their strptime format, and the
+    file encoding. Only declared columns are read; a value that does not fit
+    its dtype (e.g. a blank in an int16 column) raises ValueError rather than
+    silently widening the column.
+    """
+    dtypes: Dict[str, str]
+    dates: Dict[str, Optional[str]] = field(default_factory=dict)
+    encoding: Optional[str] = None
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.dtypes) + [c for c in self.dates if c not in self.dtypes]
+
+
+def _read_options(schema: CsvSchema, columns: Optional[Sequence[str]]) -> Dict:
+    wanted = list(columns) if columns is not None else schema.columns
+    unknown = [c for c in wanted if c not in schema.dtypes and c not in schema.dates]
+    if unknown:
+        raise ValueError(f"Columns not in schema: {unknown}")
+    keep = set(wanted)
+    return {
+        # a callable tolerates declared columns that a given file lacks
+        "usecols": lambda c: c in keep,
+        "dtype": {c: d for c, d in schema.dtypes.items() if c in keep and c not in schema.dates},
+        "encoding": schema.encoding,
+    }
+
+
+def _parse_dates(df: pd.DataFrame, schema: CsvSchema) -> pd.DataFrame:
+    for col, fmt in schema.dates.items():
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], format=fmt)
+    return df
+
+
+def iter_typed_csv(path: Path,
+                   schema: CsvSchema,
+                   columns: Optional[Sequence[str]] = None,
+                   chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CSV as typed chunks of at most `chunksize` rows, reading only
+    `columns` (all declared columns by default). Memory is bounded by one
+    chunk, so per-chunk aggregation scales to files of any length.
+    Categorical columns carry each chunk's own categories.
+    """
+    reader = pd.read_csv(path, chunksize=chunksize, **_read_options(schema, columns))
+    with reader:
+        for chunk in reader:
+            yield _parse_dates(chunk, schema)
+
+
+def read_typed_csv(path: Path,
+                   schema: CsvSchema,
+                   columns: Optional[Sequence[str]] = None,
+                   chunksize: Optional[int] = None) -> pd.DataFrame:
+    """
+    Read a CSV with the schema's compact dtypes. With chunksize, the file is
+    parsed chunk by chunk and the typed chunks concatenated (categoricals are
+    unified first so they stay categorical). The result still has to fit in
+    memory; for a bounded footprint aggregate over iter_typed_csv instead.
+    """
+    if chunksize is None:
+        return _parse_dates(pd.read_csv(path, **_read_options(schema, columns)), schema)
+
+    chunks = list(iter_typed_csv(path, schema, columns, chunksize))
+    if not chunks:
+        return _parse_dates(pd.read_csv(path, nrows=0, **_read_options(schema, columns)), schema)
+    for col in chunks[0].columns:
+        if isinstance(chunks[0][col].dtype, pd.CategoricalDtype):
+            categories = union_categoricals([c[col] for c in chunks]).categories
+            for c in chunks:
+                c[col] = c[col].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
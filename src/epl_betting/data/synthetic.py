@@ -0,0 +1,298 @@
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from ..models.probability import outcome_probs_from_lambdas
+
+# matches_this_season.csv stores most stats as home_<stat> / away_<stat> pairs.
+# Typical per-team means from the 2025-26 data; counts are drawn as Poisson.
+MATCH_STAT_MEANS = {
+    "possession": 50.0,
+    "expected_goals_xg": None,       # set from the generating goal rates
+    "total_shots": 11.7,
+    "shots_on_target": 4.0,
+    "big_chances": 2.0,
+    "big_chances_missed": 1.2,
+    "accurate_passes": 352.0,
+    "accurate_passes_pct": 81.6,
+    "fouls_committed": 11.0,
+    "corners": 4.9,
+    "xg_open_play": 0.83,
+    "xg_set_play": 0.37,
+    "non_penalty_xg": 1.2,
+    "xg_on_target_xgot": 1.3,
+    "shots_off_target": 4.4,
+    "blocked_shots": 3.3,
+    "hit_woodwork": 0.3,
+    "shots_inside_box": 7.8,
+    "shots_outside_box": 3.9,
+    "passes": 427.0,
+    "own_half": 181.0,
+    "opposition_half": 172.0,
+    "accurate_long_balls": 21.0,
+    "accurate_long_balls_pct": 42.8,
+    "accurate_crosses": 4.2,
+    "accurate_crosses_pct": 23.5,
+    "throws": 18.9,
+    "touches_in_opposition_box": 23.7,
+    "offsides": 1.5,
+    "yellow_cards": 1.8,
+    "red_cards": 0.05,
+    "tackles_won": 16.5,
+    "tackles_won_pct": 68.0,
+    "interceptions": 7.7,
+    "blocks": 3.3,
+    "clearances": 26.8,
+    "keeper_saves": 2.7,
+    "duels_won": 48.9,
+    "ground_duels_won": 33.4,
+    "ground_duels_won_pct": 50.0,
+    "aerial_duels_won": 15.5,
+    "aerial_duels_won_pct": 50.0,
+    "successful_dribbles": 6.5,
+    "successful_dribbles_pct": 44.4,
+}
+TRACKING_STAT_MEANS = {
+    "distance_covered": 109870.0,
+    "walking_distance": 34556.0,
+    "running_distance": 72852.0,
+    "sprinting_distance": 2461.0,
+    "number_of_sprints": 115.0,
+    "top_speed": 34.2,
+}
+
+# players_this_season.csv columns in file order; anything not listed in
+# PLAYER_STAT_MEANS is a small count with mean 0.5.
+PLAYER_COLUMNS = [
+    "player_id", "match_id", "minutes_played", "goals", "assists", "total_shots", "xg", "xa",
+    "shots_on_target", "successful_dribbles", "big_chances_missed", "touches_opposition_box",
+    "touches", "accurate_passes", "accurate_passes_percent", "chances_created",
+    "final_third_passes", "accurate_crosses", "accurate_crosses_percent", "accurate_long_balls",
+    "accurate_long_balls_percent", "tackles_won", "interceptions", "recoveries", "blocks",
+    "clearances", "headed_clearances", "dribbled_past", "duels_won", "duels_lost",
+    "ground_duels_won", "ground_duels_won_percent", "aerial_duels_won", "aerial_duels_won_percent",
+    "was_fouled", "fouls_committed", "saves", "goals_conceded", "xgot_faced", "goals_prevented",
+    "sweeper_actions", "gk_accurate_passes", "gk_accurate_long_balls", "dispossessed",
+    "high_claim", "corners", "saves_inside_box", "offsides", "successful_dribbles_percent",
+    "tackles_won_percent", "xgot", "tackles", "start_min", "finish_min", "team_goals_conceded",
+    "penalties_scored", "penalties_missed", "top_speed", "distance_covered", "walking_distance",
+    "running_distance", "sprinting_distance", "number_of_sprints", "defensive_contributions",
+    "gw_folder",
+]
+PLAYER_STAT_MEANS = {
+    "total_shots": 0.8,
+    "touches_opposition_box": 1.6,
+    "touches": 45.0,
+    "accurate_passes": 24.0,
+    "accurate_passes_percent": 80.0,
+    "final_third_passes": 4.0,
+    "accurate_long_balls_percent": 40.0,
+    "recoveries": 3.0,
+    "clearances": 1.8,
+    "duels_won": 3.3,
+    "duels_lost": 3.3,
+    "ground_duels_won_percent": 50.0,
+    "aerial_duels_won_percent": 50.0,
+    "successful_dribbles_percent": 30.0,
+    "tackles_won_percent": 60.0,
+    "tackles": 1.5,
+    "top_speed": 31.0,
+    "distance_covered": 7.5,
+    "walking_distance": 2.4,
+    "running_distance": 4.9,
+    "sprinting_distance": 0.17,
+    "number_of_sprints": 8.0,
+    "defensive_contributions": 5.0,
+}
+
+TEAMS_PER_LEAGUE = 20
+PLAYERS_PER_SIDE = 15
+PLAYED_GAMEWEEKS = 11     # gameweeks with results; the committed season has 11
+SEASON_START = pd.Timestamp("2025-08-16 15:00:00")
+TEAM_ID_OFFSET = 1000     # keeps synthetic IDs clear of the real FotMob IDs
+INTERCEPT = 0.13          # log away-goal rate (about 1.14 per game)
+HOME_ADVANTAGE = 0.24     # log home/away rate ratio (about 1.45 vs 1.14)
+
+
+def round_robin(n_teams: int) -> List[List[tuple]]:
+    """
+    Double round-robin schedule (circle method): 2 * (n_teams - 1) gameweeks
+    of (home, away) index pairs; every pair meets once at each ground.
+    """
+    idx = list(range(n_teams))
+    first_half = []
+    for rnd in range(n_teams - 1):
+        pairs = []
+        for i in range(n_teams // 2):
+            a, b = idx[i], idx[n_teams - 1 - i]
+            pairs.append((a, b) if (rnd + i) % 2 == 0 else (b, a))
+        first_half.append(pairs)
+        idx = [idx[0]] + [idx[-1]] + idx[1:-1]
+    return first_half + [[(b, a) for a, b in rnd] for rnd in first_half]
+
+
+def synthetic_teams(n_leagues: int) -> Dict[int, str]:
+    """
+    Team ID -> name for n_leagues independent 20-team league-seasons.
+    """
+    return {
+        TEAM_ID_OFFSET + league * TEAMS_PER_LEAGUE + k: f"L{league:03d} Team {k:02d}"
+        for league in range(n_leagues)
+        for k in range(TEAMS_PER_LEAGUE)
+    }
+
+
+def generate_synthetic_data(out_dir: Path, scale: int = 1, seed: int = 0) -> Dict[int, str]:
+    """
+    Write schema-compatible matches_this_season.csv, odds_this_season.csv,
+    players_this_season.csv and future_odds.csv to out_dir.
+
+    scale=1 matches the size of the committed data (one 20-team season, 11
+    gameweeks played); scale=n writes n such league-seasons. Each league-season
+    gets its own team IDs and names, so (home, away) stays a unique fixture
+    key as make_features.py assumes. Output is deterministic for a given
+    (scale, seed). Returns the team ID -> name mapping.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    teams = synthetic_teams(scale)
+    schedule = round_robin(TEAMS_PER_LEAGUE)
+
+    # --- fixtures: one row per (league, gameweek, pair)
+    league = np.repeat(np.arange(scale), len(schedule) * TEAMS_PER_LEAGUE // 2)
+    gameweek = np.tile(np.repeat(np.arange(1, len(schedule) + 1), TEAMS_PER_LEAGUE // 2), scale)
+    pairs = np.tile(np.array([p for rnd in schedule for p in rnd]), (scale, 1))
+    home_id = TEAM_ID_OFFSET + league * TEAMS_PER_LEAGUE + pairs[:, 0]
+    away_id = TEAM_ID_OFFSET + league * TEAMS_PER_LEAGUE + pairs[:, 1]
+    n = len(league)
+
+    # --- generating model: log-linear Poisson with home advantage
+    attack = rng.normal(0.0, 0.25, size=scale * TEAMS_PER_LEAGUE)
+    defence = rng.normal(0.0, 0.2, size=scale * TEAMS_PER_LEAGUE)
+    elo = 1700.0 + 400.0 * (attack - defence)
+    hi = home_id - TEAM_ID_OFFSET
+    ai = away_id - TEAM_ID_OFFSET
+    lam_home = np.exp(INTERCEPT + HOME_ADVANTAGE + attack[hi] - defence[ai])
+    lam_away = np.exp(INTERCEPT + attack[ai] - defence[hi])
+
+    finished = gameweek <= PLAYED_GAMEWEEKS
+    home_score = rng.poisson(lam_home)
+    away_score = rng.poisson(lam_away)
+    home_xg = np.round(rng.gamma(8.0, lam_home / 8.0), 2)
+    away_xg = np.round(rng.gamma(8.0, lam_away / 8.0), 2)
+
+    kickoff = SEASON_START + pd.to_timedelta((gameweek - 1) * 7, unit="D") \
+        + pd.to_timedelta(rng.integers(0, 3, size=n), unit="D")
+    home_name = pd.Series(home_id).map(teams).to_numpy()
+    away_name = pd.Series(away_id).map(teams).to_numpy()
+    slug = [f"syn-{lg:03d}-{h}-vs-{a}" for lg, h, a in zip(league, home_id, away_id)]
+
+    matches = {
+        "gameweek": gameweek.astype(float),
+        "kickoff_time": np.where(finished, kickoff.strftime("%Y-%m-%dT%H:%M:%S"), None),
+        "home_team": home_id.astype(float),
+        "home_team_elo": np.round(elo[hi], 2),
+        "home_score": np.where(finished, home_score, np.nan),
+        "away_score": np.where(finished, away_score, np.nan),
+        "away_team": away_id.astype(float),
+        "away_team_elo": np.round(elo[ai], 2),
+        "finished": finished,
+        "match_id": slug,
+        "match_url": [f"/matches/{s}" for s in slug],
+    }
+    for stat, mean in MATCH_STAT_MEANS.items():
+        if stat == "expected_goals_xg":
+            home, away = home_xg, away_xg
+        elif stat == "possession":
+            home = np.clip(np.round(rng.normal(50.0, 11.7, size=n)), 20, 80)
+            away = 100.0 - home
+        else:
+            home, away = rng.poisson(mean, size=(2, n)).astype(float)
+        matches[f"home_{stat}"] = np.where(finished, home, np.nan)
+        matches[f"away_{stat}"] = np.where(finished, away, np.nan)
+    matches["fotmob_id"] = 5_000_000.0 + np.arange(n)
+    matches["stats_processed"] = finished
+    matches["player_stats_processed"] = finished
+    for stat, mean in TRACKING_STAT_MEANS.items():
+        home, away = np.round(rng.normal(mean, 0.03 * mean, size=(2, n)), 1)
+        matches[f"home_{stat}"] = np.where(finished, home, np.nan)
+        matches[f"away_{stat}"] = np.where(finished, away, np.nan)
+    matches["tournament"] = "prem"
+    matches["gw_folder"] = [f"GW{g}" for g in gameweek]
+    pd.DataFrame(matches).to_csv(out_dir / "matches_this_season.csv", index=False)
+
+    # --- odds: fair 1X2 from the generating rates, 5% margin, a little noise
+    fair = outcome_probs_from_lambdas(lam_home, lam_away)
+    noisy = fair * np.exp(rng.normal(0.0, 0.05, size=fair.shape))
+    noisy /= noisy.sum(axis=1, keepdims=True)
+    prices = np.round(1.0 / (1.05 * noisy), 2)
+
+    date = kickoff.strftime("%Y-%m-%d")
+    odds = pd.DataFrame({
+        "match_id": [f"{d}_{h.replace(' ', '')}-{a.replace(' ', '')}" for d, h, a in zip(date, home_name, away_name)],
+        "date": date,
+        "home_team": home_name,
+        "away_team": away_name,
+        "odds_home": prices[:, 0],
+        "odds_draw": prices[:, 1],
+        "odds_away": prices[:, 2],
+        "bookmaker": "Synthetic",
+    })
+    odds[finished].to_csv(out_dir / "odds_this_season.csv", index=False)
+
+    upcoming = gameweek == PLAYED_GAMEWEEKS + 1
+    odds.loc[upcoming, ["home_team", "away_team", "odds_home", "odds_draw", "odds_away", "bookmaker"]] \
+        .to_csv(out_dir / "future_odds.csv", index=False)
+
+    # --- players: PLAYERS_PER_SIDE rows per team per finished match
+    played = np.flatnonzero(finished)
+    side_team = np.stack([home_id[played], away_id[played]], axis=1)            # (M, 2)
+    side_goals = np.stack([home_score[played], away_score[played]], axis=1)
+    side_xg = np.stack([home_xg[played], away_xg[played]], axis=1)
+    m = len(played)
+    rows = m * 2 * PLAYERS_PER_SIDE
+
+    slot = np.tile(np.arange(PLAYERS_PER_SIDE), m * 2)
+    team_of_row = np.repeat(side_team.ravel(), PLAYERS_PER_SIDE)
+    match_of_row = np.repeat(played, 2 * PLAYERS_PER_SIDE)
+
+    # split team goals / xG over outfield players with multinomial / Dirichlet shares
+    share = rng.dirichlet(np.ones(PLAYERS_PER_SIDE - 1), size=m * 2)
+    goals = np.zeros((m * 2, PLAYERS_PER_SIDE), dtype=int)
+    goals[:, 1:] = rng.multinomial(side_goals.ravel(), share)
+    xg = np.zeros((m * 2, PLAYERS_PER_SIDE))
+    xg[:, 1:] = np.round(share * side_xg.ravel()[:, None], 2)
+    conceded = np.repeat(side_goals[:, ::-1].ravel(), PLAYERS_PER_SIDE)
+
+    starter = slot < 11
+    minutes = np.where(starter, 90 + rng.integers(0, 8, size=rows), rng.integers(1, 30, size=rows))
+    start_min = np.where(starter, 0, 90 - minutes)
+    players = {}
+    for col in PLAYER_COLUMNS:
+        if col == "player_id":
+            values = team_of_row * 100 + slot
+        elif col == "match_id":
+            values = np.asarray(slug, dtype=object)[match_of_row]
+        elif col == "minutes_played":
+            values = minutes
+        elif col == "goals":
+            values = goals.ravel()
+        elif col == "xg":
+            values = xg.ravel()
+        elif col in ("goals_conceded", "team_goals_conceded"):
+            values = conceded
+        elif col == "start_min":
+            values = start_min
+        elif col == "finish_min":
+            values = start_min + minutes
+        elif col == "gw_folder":
+            values = np.asarray(matches["gw_folder"], dtype=object)[match_of_row]
+        else:
+            values = rng.poisson(PLAYER_STAT_MEANS.get(col, 0.5), size=rows)
+        players[col] = values
+    pd.DataFrame(players).to_csv(out_dir / "players_this_season.csv", index=False)
+
+    return teams
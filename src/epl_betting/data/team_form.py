@@ -0,0 +1,281 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import PROCESSED_DIR
+from .teams import TeamRegistry
+
+FORM_PATH = PROCESSED_DIR / "team_form.csv"
+PLAYER_TEAMS_PATH = PROCESSED_DIR / "player_teams.csv"
+
+MATCH_COLUMNS = ["match_id", "kickoff_time", "home_team", "away_team", "home_score", "away_score"]
+
+# team-match stat -> player column, summed over the team's players
+SUM_STATS = {
+    "xg": "xg",
+    "xa": "xa",
+    "shots": "total_shots",
+    "shots_on_target": "shots_on_target",
+    "box_touches": "touches_opposition_box",
+}
+# team-match stat -> player column, averaged with minutes played as weights.
+# Only applied when the column is in the file: the current FPL-Elo export has
+# no match ratings and its *_percent columns are all zero.
+WEIGHTED_STATS = {
+    "rating": "rating",
+}
+# opponent's value joined as <stat>_against
+AGAINST_STATS = ["xg", "shots", "box_touches"]
+
+PLAYER_COLUMNS = (
+    ["player_id", "match_id", "minutes_played", "start_min", "finish_min", "goals", "team_goals_conceded"]
+    + list(SUM_STATS.values())
+)
+
+EWM_SPAN = 6
+ROLLING_WINDOW = 5
+
+
+def team_evidence(players: pd.DataFrame, matches: pd.DataFrame) -> pd.Series:
+    """
+    Team (FPL-Elo ID) each player row must belong to, from the score, or NaN
+    where the row alone cannot tell. players_this_season.csv has no team
+    column, but team_goals_conceded counts goals conceded while the player
+    was on the pitch, so:
+      - a full-match player conceded exactly the other side's goals;
+      - nobody concedes more than the other side scored;
+      - nobody scores more than their own side scored.
+    """
+    x = players[["match_id", "start_min", "finish_min", "goals", "team_goals_conceded"]].merge(
+        matches[MATCH_COLUMNS], on="match_id", how="left"
+    )
+    conceded = x["team_goals_conceded"]
+    full = (x["start_min"] == 0) & (x["finish_min"] >= 90)
+    home = (
+        (full & (conceded == x["away_score"]) & (conceded != x["home_score"]))
+        | (conceded > x["home_score"]) | (x["goals"] > x["away_score"])
+    )
+    away = (
+        (full & (conceded == x["home_score"]) & (conceded != x["away_score"]))
+        | (conceded > x["away_score"]) | (x["goals"] > x["home_score"])
+    )
+    team = np.where(home & ~away, x["home_team"], np.where(away & ~home, x["away_team"], np.nan))
+    return pd.Series(team, index=players.index)
+
+
+def evidence_counts(players: pd.DataFrame, evidence: pd.Series) -> pd.DataFrame:
+    """
+    (player_id, team_id, n) rows: how many of a player's rows point at each
+    team (evidence from team_evidence).
+    """
+    ev = pd.DataFrame({"player_id": players["player_id"].to_numpy(), "team_id": evidence.to_numpy()})
+    ev = ev.dropna(subset=["team_id"]).astype({"team_id": np.int64})
+    return ev.groupby(["player_id", "team_id"], as_index=False).size().rename(columns={"size": "n"})
+
+
+def player_teams(counts: pd.DataFrame) -> pd.Series:
+    """
+    player_id -> the team with the most evidence (ties go to the lower ID).
+    """
+    best = counts.sort_values(["player_id", "n", "team_id"], ascending=[True, False, True])
+    best = best.drop_duplicates("player_id")
+    return best.set_index("player_id")["team_id"]
+
+
+def attribute_rows(players: pd.DataFrame, matches: pd.DataFrame, teams: pd.Series) -> np.ndarray:
+    """
+    Team of each player row: the player's team if that team played in the
+    match, else NaN.
+    """
+    m = matches.set_index("match_id")
+    team = players["player_id"].map(teams).to_numpy(dtype=float)
+    home = m["home_team"].reindex(players["match_id"]).to_numpy(dtype=float)
+    away = m["away_team"].reindex(players["match_id"]).to_numpy(dtype=float)
+    return np.where((team == home) | (team == away), team, np.nan)
+
+
+def team_match_stats(players: pd.DataFrame, matches: pd.DataFrame, team: np.ndarray) -> pd.DataFrame:
+    """
+    Aggregate attributed player rows (team from attribute_rows) to one row
+    per (match_id, team_id) with n_players, the SUM_STATS, minutes-weighted
+    WEIGHTED_STATS and the opponent's AGAINST_STATS. unplaced_xg is the xG
+    of the match's rows that could not be placed in either team.
+    """
+    m = matches[MATCH_COLUMNS].set_index("match_id")
+    played = ~np.isnan(team)
+    rows = players.loc[played]
+    minutes = rows["minutes_played"].to_numpy(dtype=float)
+    agg = pd.DataFrame({"match_id": rows["match_id"].astype(str).to_numpy(),
+                        "team_id": team[played].astype(np.int64),
+                        "n_players": 1,
+                        "minutes": minutes})
+    for stat, col in SUM_STATS.items():
+        agg[stat] = rows[col].to_numpy(dtype=float)
+    weighted = {stat: col for stat, col in WEIGHTED_STATS.items() if col in rows.columns}
+    for stat, col in weighted.items():
+        agg[stat] = rows[col].to_numpy(dtype=float) * minutes
+
+    out = agg.groupby(["match_id", "team_id"], as_index=False, sort=False).sum()
+    for stat in weighted:
+        out[stat] = out[stat] / out["minutes"].where(out["minutes"] > 0)
+
+    info = m.loc[out["match_id"]]
+    out["kickoff_time"] = pd.to_datetime(info["kickoff_time"].to_numpy())
+    out["is_home"] = (info["home_team"].to_numpy() == out["team_id"].to_numpy())
+    out["opponent_id"] = np.where(out["is_home"], info["away_team"], info["home_team"]).astype(np.int64)
+
+    against = out[["match_id", "team_id"] + AGAINST_STATS].rename(
+        columns={"team_id": "opponent_id", **{s: f"{s}_against" for s in AGAINST_STATS}}
+    )
+    out = out.merge(against, on=["match_id", "opponent_id"], how="left")
+
+    unplaced = players.loc[~played]
+    unplaced_xg = unplaced[SUM_STATS["xg"]].groupby(unplaced["match_id"].astype(str)).sum()
+    out["unplaced_xg"] = out["match_id"].map(unplaced_xg).fillna(0.0).to_numpy()
+    return out.drop(columns="minutes")
+
+
+def form_stats(stats: pd.DataFrame) -> List[str]:
+    return [c for c in list(SUM_STATS) + list(WEIGHTED_STATS) + [f"{s}_against" for s in AGAINST_STATS]
+            if c in stats.columns]
+
+
+def rolling_form(stats: pd.DataFrame,
+                 span: int = EWM_SPAN,
+                 window: int = ROLLING_WINDOW) -> pd.DataFrame:
+    """
+    Each team's form as of each kickoff: exponentially weighted mean (span)
+    and rolling mean over the last `window` matches of every stat, using
+    only the team's earlier matches (NaN before its first). All teams are
+    computed together with grouped shift / ewm / rolling.
+    """
+    df = stats.sort_values(["team_id", "kickoff_time", "match_id"], kind="stable").reset_index(drop=True)
+    cols = form_stats(df)
+    team = df["team_id"]
+
+    previous = df.groupby(team, sort=False)[cols].shift(1)
+    grouped = previous.groupby(team, sort=False)
+    ewm = grouped.ewm(span=span, ignore_na=True).mean().reset_index(level=0, drop=True)
+    roll = grouped.rolling(window, min_periods=1).mean().reset_index(level=0, drop=True)
+
+    df["matches_played"] = df.groupby(team, sort=False).cumcount()
+    for c in cols:
+        df[f"{c}_ewm"] = ewm[c].to_numpy()
+        df[f"{c}_roll{window}"] = roll[c].to_numpy()
+    return df
+
+
+def update_team_form(players: pd.DataFrame,
+                     matches: pd.DataFrame,
+                     form: Optional[pd.DataFrame] = None,
+                     counts: Optional[pd.DataFrame] = None,
+                     span: int = EWM_SPAN,
+                     window: int = ROLLING_WINDOW) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, float]]:
+    """
+    Bring a stored form table up to date with newly finished matches; the
+    result equals a rebuild on the same data.
+
+    counts are the stored evidence counts (evidence_counts of every stored
+    match). Each player row's evidence only depends on its own match, so
+    adding the new matches' counts gives the rebuild's counts, and a
+    player's team (player_teams) only moves when their argmax changes. The
+    new matches are aggregated, plus the stored matches of players whose
+    team changed; nothing else is. A row goes to its player's team when
+    that team played, otherwise to the team its own evidence points at
+    (e.g. after a transfer), otherwise it stays unplaced and its xG is
+    counted in unplaced_xg. Form is recomputed for the teams in those
+    matches, from their earliest such kickoff on; every other row is kept
+    as stored. Pass form=None / counts=None to build from scratch.
+    Returns (form, counts, summary).
+    """
+    finished = matches[matches["home_score"].notna() & matches["away_score"].notna()]
+    finished_ids = finished["match_id"].astype(str)
+    done = set(form["match_id"].astype(str)) if form is not None else set()
+    new_matches = finished[~finished_ids.isin(done)]
+    if new_matches.empty:
+        return form, counts, {"new_matches": 0}
+
+    new_rows = players[players["match_id"].isin(new_matches["match_id"])]
+    new_counts = evidence_counts(new_rows, team_evidence(new_rows, new_matches))
+    if counts is None:
+        counts = new_counts.iloc[:0]
+    old_teams = player_teams(counts)
+    counts = (pd.concat([counts, new_counts])
+              .groupby(["player_id", "team_id"], as_index=False)["n"].sum())
+    teams = player_teams(counts)
+
+    # stored matches of players whose team changed (or who had none yet)
+    previous = old_teams.reindex(teams.index)
+    changed = teams.index[previous.isna().to_numpy() | (previous.to_numpy() != teams.to_numpy())]
+    stored_rows = players["match_id"].astype(str).isin(done)
+    redo_ids = set(players.loc[stored_rows & players["player_id"].isin(changed), "match_id"].astype(str))
+    redo = finished[finished_ids.isin(redo_ids) | finished["match_id"].isin(new_matches["match_id"])]
+
+    rows = players[players["match_id"].isin(redo["match_id"])]
+    evidence = team_evidence(rows, redo)
+    team = attribute_rows(rows, redo, teams)
+    team = np.where(np.isnan(team), evidence.to_numpy(dtype=float), team)
+    stats = team_match_stats(rows, redo, team)
+
+    unplaced = np.isnan(team)
+    xg = rows[SUM_STATS["xg"]].to_numpy(dtype=float)
+    summary = {
+        "new_matches": len(new_matches),
+        "matches_reaggregated": len(redo) - len(new_matches),
+        "player_rows": len(rows),
+        "players_changed": len(changed),
+        "unattributed_rows": int(unplaced.sum()),
+        "unattributed_xg": float(np.nansum(xg[unplaced])),
+        "total_xg": float(np.nansum(xg)),
+    }
+    if form is None:
+        return rolling_form(stats, span, window), counts, summary
+
+    # every team in an aggregated match, from its earliest such kickoff
+    kickoff = pd.to_datetime(redo["kickoff_time"])
+    first = pd.concat([
+        pd.Series(kickoff.to_numpy(), index=redo["home_team"].to_numpy()),
+        pd.Series(kickoff.to_numpy(), index=redo["away_team"].to_numpy()),
+    ]).groupby(level=0).min()
+    first.index = first.index.astype(np.int64)
+
+    kept = form[~form["match_id"].astype(str).isin(set(redo["match_id"].astype(str)))]
+    affected = kept["team_id"].isin(first.index)
+    stale = affected & (kept["kickoff_time"] >= kept["team_id"].map(first))
+    history = pd.concat([kept.loc[affected, list(stats.columns)], stats], ignore_index=True)
+    recomputed = rolling_form(history, span, window)
+    recomputed = recomputed[recomputed["kickoff_time"] >= recomputed["team_id"].map(first)]
+
+    form = pd.concat([kept[~stale], recomputed], ignore_index=True)
+    form = form.sort_values(["team_id", "kickoff_time", "match_id"], kind="stable").reset_index(drop=True)
+    summary["rows_recomputed"] = len(recomputed)
+    return form, counts, summary
+
+
+def add_form_features(features: pd.DataFrame,
+                      form: pd.DataFrame,
+                      columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Join home_form_<col> / away_form_<col> onto match rows (match_id,
+    home_team_id, away_team_id) from the form table.
+    """
+    if columns is None:
+        columns = [c for c in form.columns if c.endswith("_ewm") or "_roll" in c] + ["matches_played"]
+    out = features
+    for side in ("home", "away"):
+        part = form[["match_id", "team_id"] + list(columns)].rename(
+            columns={"team_id": f"{side}_team_id", **{c: f"{side}_form_{c}" for c in columns}}
+        )
+        out = out.merge(part, on=["match_id", f"{side}_team_id"], how="left")
+    return out
+
+
+def label_teams(form: pd.DataFrame, registry: TeamRegistry) -> pd.DataFrame:
+    """
+    Add team_name / opponent_name from FPL-Elo IDs.
+    """
+    form = form.copy()
+    form.insert(2, "team_name", registry.names_of(registry.ids_from_external(form["team_id"])))
+    form["opponent_name"] = registry.names_of(registry.ids_from_external(form["opponent_id"]))
+    return form
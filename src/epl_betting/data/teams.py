@@ -0,0 +1,140 @@
+import re
+from typing import Dict, Iterable, List, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Canonical (football-data / odds-style) name, FPL-Elo / FotMob team ID, other aliases
+PREMIER_LEAGUE_TEAMS = [
+    ("Arsenal", 3, ["Arsenal FC"]),
+    ("Aston Villa", 7, ["Villa"]),
+    ("Bournemouth", 91, ["AFC Bournemouth"]),
+    ("Brentford", 94, []),
+    ("Brighton", 36, ["Brighton & Hove Albion", "Brighton and Hove Albion"]),
+    ("Burnley", 90, []),
+    ("Chelsea", 8, []),
+    ("Crystal Palace", 31, ["Palace"]),
+    ("Everton", 11, []),
+    ("Fulham", 54, []),
+    ("Leeds", 2, ["Leeds United"]),
+    ("Liverpool", 14, []),
+    ("Man City", 43, ["Manchester City"]),
+    ("Man United", 1, ["Manchester United", "Man Utd"]),
+    ("Newcastle", 4, ["Newcastle United"]),
+    ("Nott'm Forest", 17, ["Nottingham Forest", "Forest"]),
+    ("Sunderland", 56, []),
+    ("Tottenham", 6, ["Tottenham Hotspur", "Spurs"]),
+    ("West Ham", 21, ["West Ham United"]),
+    ("Wolves", 39, ["Wolverhampton Wanderers", "Wolverhampton"]),
+]
+
+
+def normalise_name(name: str) -> str:
+    """
+    Alias lookup key: case-, punctuation- and whitespace-insensitive,
+    so "Nott'm Forest", "nottm forest" and "Nott'm  Forest" agree.
+    """
+    key = str(name).casefold().replace("&", " and ")
+    key = re.sub(r"[.'’]", "", key)
+    return " ".join(key.split())
+
+
+class TeamRegistry:
+    """
+    Interns teams to dense integer IDs (0..n-1, in registration order) and
+    resolves names, aliases and external (FPL-Elo / FotMob) IDs to them
+    through precomputed lookup tables. Unknown teams raise KeyError.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self._alias: Dict[str, int] = {}
+        self._external: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self,
+               name: str,
+               aliases: Iterable[str] = (),
+               external_ids: Iterable[int] = ()) -> int:
+        """
+        Register a team (or return its ID if the name is already known) and
+        attach aliases / external IDs to it.
+        """
+        key = normalise_name(name)
+        if key in self._alias:
+            team_id = self._alias[key]
+        else:
+            team_id = len(self.names)
+            self.names.append(name)
+            self._alias[key] = team_id
+
+        for alias in aliases:
+            existing = self._alias.setdefault(normalise_name(alias), team_id)
+            if existing != team_id:
+                raise ValueError(f"Alias {alias!r} already points to {self.names[existing]!r}")
+        for ext in external_ids:
+            existing = self._external.setdefault(int(ext), team_id)
+            if existing != team_id:
+                raise ValueError(f"External ID {ext} already points to {self.names[existing]!r}")
+        return team_id
+
+    @classmethod
+    def from_external_ids(cls, mapping: Mapping[int, str]) -> "TeamRegistry":
+        """
+        Registry from an external ID -> name mapping (e.g. synthetic data).
+        """
+        registry = cls()
+        for ext, name in mapping.items():
+            registry.intern(name, external_ids=[ext])
+        return registry
+
+    def _raise_unknown(self, unknown: Sequence, kind: str):
+        raise KeyError(f"Unknown {kind}: {sorted(map(str, unknown))}")
+
+    def ids(self, names: Sequence) -> np.ndarray:
+        """
+        Dense IDs for team names or aliases. Each distinct value is resolved
+        once, then broadcast back with the factorize codes.
+        """
+        codes, uniques = pd.factorize(pd.Series(names, dtype=object), use_na_sentinel=False)
+        resolved = np.array([self._alias.get(normalise_name(u), -1) for u in uniques], dtype=np.int32)
+        if (resolved < 0).any():
+            self._raise_unknown(uniques[resolved < 0], "teams")
+        return resolved[codes]
+
+    def ids_from_external(self, external_ids: Sequence) -> np.ndarray:
+        """
+        Dense IDs for FPL-Elo / FotMob team IDs (floats such as 14.0 are fine).
+        """
+        values = pd.Series(external_ids)
+        if values.isna().any():
+            raise KeyError("Missing external team IDs")
+        codes, uniques = pd.factorize(values.astype(np.int64))
+        resolved = np.array([self._external.get(int(u), -1) for u in uniques], dtype=np.int32)
+        if (resolved < 0).any():
+            self._raise_unknown(uniques[resolved < 0], "team IDs")
+        return resolved[codes]
+
+    def names_of(self, ids: Sequence[int]) -> np.ndarray:
+        """
+        Canonical names for dense IDs.
+        """
+        return np.asarray(self.names, dtype=object)[np.asarray(ids)]
+
+    def canonical(self, names: Sequence) -> np.ndarray:
+        """
+        Canonical names for names / aliases (raises on unknown teams).
+        """
+        return self.names_of(self.ids(names))
+
+
+def premier_league_registry() -> TeamRegistry:
+    """
+    Registry of the current Premier League clubs, IDs in alphabetical order.
+    """
+    registry = TeamRegistry()
+    for name, ext, aliases in PREMIER_LEAGUE_TEAMS:
+        registry.intern(name, aliases=aliases, external_ids=[ext])
+    return registry
@@ -1,7 +1,17 @@
-from typing import Tuple
+import time
+from typing import Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from ..betting.odds_utils import market_prices
+from ..betting.pricing import price_bets
+from ..config import KELLY_FRACTION, MIN_EDGE, MODEL_WEIGHT, ODDS_SOURCE
+from ..models.probability import outcome_probs_from_lambdas
+from ..models.team_strength import fit_poisson_arrays, params_expected_goals, team_index
+
+BET_SIDES = np.array(["Home", "Draw", "Away"])
+
 
 def compute_roi(results: pd.DataFrame) -> float:
     """
@@ -26,3 +36,127 @@ def equity_curve(results: pd.DataFrame) -> pd.Series:
     df = results.sort_values("date").copy()
     df["profit"] = df["stake"] * (df["odds"] * df["outcome"] - 1.0)
     return df["profit"].cumsum()
+
+
+def walk_forward_backtest(df: pd.DataFrame,
+                          min_train_matches: int = 30,
+                          use_xg: bool = False,
+                          model_weight: float = MODEL_WEIGHT,
+                          min_edge: float = MIN_EDGE,
+                          kelly_multiplier: float = KELLY_FRACTION,
+                          max_goals: int = 10,
+                          x0: Optional[np.ndarray] = None,
+                          odds_source: str = ODDS_SOURCE) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    Step through matches gameweek by gameweek. Before each gameweek the Poisson
+    strength model is refit on matches that kicked off before its first match,
+    warm-started from the previous gameweek's parameters. That gameweek's
+    fixtures are then priced, blended with the market, Kelly-staked and settled.
+
+    df needs home/away team names, goals, odds_home/draw/away and kickoff_time
+    (or date); gameweek is used for grouping if present. Bets are placed at
+    the prices market_prices picks for odds_source (best_odds_* against
+    p_*_consensus for "best", when df has them).
+    Returns (ledger of every priced outcome, per-stage timings in seconds).
+    The ledger has stake/odds/outcome/date columns, so compute_roi and
+    equity_curve work on ledger[ledger["bet"]].
+    """
+    timings = {"prepare": 0.0, "fit": 0.0, "price": 0.0, "stake": 0.0, "settle": 0.0}
+    t0 = time.perf_counter()
+
+    time_col = "kickoff_time" if "kickoff_time" in df.columns else "date"
+    df = df[df["home_goals"].notna()].copy()
+    df["_kickoff"] = pd.to_datetime(df[time_col])
+    df = df.sort_values("_kickoff", kind="stable").reset_index(drop=True)
+
+    teams, home_idx, away_idx = team_index(df)
+    n_teams = len(teams)
+    kickoff = df["_kickoff"].to_numpy()
+    goals_home = df["home_goals"].to_numpy(dtype=float)
+    goals_away = df["away_goals"].to_numpy(dtype=float)
+    if use_xg and "home_xg" in df.columns and "away_xg" in df.columns:
+        fit_home = df["home_xg"].to_numpy(dtype=float)
+        fit_away = df["away_xg"].to_numpy(dtype=float)
+    else:
+        fit_home, fit_away = goals_home, goals_away
+    odds, market = market_prices(df, odds_source)
+    result = np.sign(goals_home - goals_away)
+    winner = np.where(result > 0, 0, np.where(result == 0, 1, 2))
+
+    groups = df["gameweek"].to_numpy() if "gameweek" in df.columns else df["_kickoff"].dt.date.to_numpy()
+    timings["prepare"] += time.perf_counter() - t0
+
+    rows_out, model_out, x = [], [], x0
+    n_refits = 0
+    n_iterations = 0
+    for gw in pd.unique(groups):
+        rows = np.flatnonzero(groups == gw)
+        # df is sorted by kickoff, so the training set is a prefix
+        n_train = int(np.searchsorted(kickoff, kickoff[rows].min(), side="left"))
+        if n_train < min_train_matches:
+            continue
+
+        t = time.perf_counter()
+        fit = fit_poisson_arrays(
+            home_idx[:n_train], away_idx[:n_train],
+            fit_home[:n_train], fit_away[:n_train],
+            n_teams, x0=x,
+        )
+        x = fit.x
+        n_refits += 1
+        n_iterations += fit.nit
+        timings["fit"] += time.perf_counter() - t
+
+        t = time.perf_counter()
+        lam_home, lam_away = params_expected_goals(x, home_idx[rows], away_idx[rows], n_teams)
+        model_out.append(outcome_probs_from_lambdas(lam_home, lam_away, max_goals))
+        rows_out.append(rows)
+        timings["price"] += time.perf_counter() - t
+
+    t = time.perf_counter()
+    if rows_out:
+        rows = np.concatenate(rows_out)
+        p_model = np.concatenate(model_out)
+    else:
+        rows = np.array([], dtype=int)
+        p_model = np.empty((0, 3))
+    p_market = market[rows]
+    priced = price_bets(p_model, p_market, odds[rows], model_weight, min_edge, kelly_multiplier, normalize_axis=1)
+    p_final = priced["p_final"]
+    edge = priced["edge"]
+    kelly_full = priced["kelly_full"]
+    bet = priced["recommended"]
+    stake = np.where(bet, priced["stake_fraction"], 0.0)
+    timings["stake"] += time.perf_counter() - t
+
+    t = time.perf_counter()
+    outcome = (winner[rows][:, None] == np.arange(3)[None, :]).astype(float)
+    profit = stake * (odds[rows] * outcome - 1.0)
+
+    n = len(rows)
+    ledger = pd.DataFrame({
+        "date": np.repeat(df["_kickoff"].to_numpy()[rows], 3),
+        "gameweek": np.repeat(groups[rows], 3),
+        "home_team": np.repeat(df["home_team_name"].to_numpy()[rows], 3),
+        "away_team": np.repeat(df["away_team_name"].to_numpy()[rows], 3),
+        "bet_side": np.tile(BET_SIDES, n),
+        "odds": odds[rows].ravel(),
+        "p_model": p_model.ravel(),
+        "p_market": p_market.ravel(),
+        "p_final": p_final.ravel(),
+        "edge": edge.ravel(),
+        "kelly_full": kelly_full.ravel(),
+        "bet": bet.ravel(),
+        "stake": stake.ravel(),
+        "outcome": outcome.ravel(),
+        "profit": profit.ravel(),
+    })
+    if "match_id_odds" in df.columns:
+        # odds-file match key, for joining bets to the odds snapshot store
+        ledger.insert(2, "match_id", np.repeat(df["match_id_odds"].to_numpy()[rows], 3))
+    timings["settle"] += time.perf_counter() - t
+
+    timings["total"] = time.perf_counter() - t0
+    timings["n_refits"] = n_refits
+    timings["n_iterations"] = n_iterations
+    return ledger, timings
@@ -0,0 +1,297 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..betting.portfolio import portfolio_kelly
+from ..config import KELLY_FRACTION, MAX_TOTAL_EXPOSURE
+
+N_PATHS = 100_000
+CHUNK_SIZE = 20_000          # paths simulated at once
+RUIN_LEVEL = 0.1             # bankroll below this fraction of the start counts as ruin
+SIDES = {"Home": 0, "Draw": 1, "Away": 2}
+
+
+@dataclass
+class StakingPolicy:
+    """
+    Stake kelly_fraction * full Kelly on every bet; with max_exposure, a
+    round whose stakes add up to more than that fraction of the bankroll is
+    scaled down to it. A portfolio policy stakes the slate's stake_portfolio
+    instead (portfolio_kelly at kelly_fraction, already capped).
+    """
+    name: str
+    kelly_fraction: float
+    max_exposure: Optional[float] = None
+    portfolio: bool = False
+
+
+# the stakes predict_from_future_odds.py recommends
+PORTFOLIO_POLICY = StakingPolicy(f"portfolio {KELLY_FRACTION:g} Kelly", KELLY_FRACTION, portfolio=True)
+
+DEFAULT_POLICIES = [
+    StakingPolicy("full Kelly", 1.0),
+    StakingPolicy("half Kelly", 0.5),
+    StakingPolicy(f"{KELLY_FRACTION:g} Kelly", KELLY_FRACTION),
+    StakingPolicy(f"{KELLY_FRACTION:g} Kelly, cap {MAX_TOTAL_EXPOSURE:g}", KELLY_FRACTION, MAX_TOTAL_EXPOSURE),
+    StakingPolicy("0.1 Kelly", 0.1),
+    PORTFOLIO_POLICY,
+]
+
+
+@dataclass
+class BetSlate:
+    """
+    Bets to simulate. probs is (M, 3) H/D/A probabilities per match (the
+    blended p_final); each bet has its match, side (0/1/2), decimal odds and
+    full-Kelly stake fraction. Bets with the same round settle together,
+    rounds are numbered 0.. in playing order. stake_portfolio is each bet's
+    stake as sized together with its round (see portfolio_stakes).
+    """
+    probs: np.ndarray
+    bet_match: np.ndarray
+    bet_side: np.ndarray
+    bet_odds: np.ndarray
+    kelly_full: np.ndarray
+    bet_round: np.ndarray
+    stake_portfolio: Optional[np.ndarray] = None
+
+    @property
+    def n_rounds(self) -> int:
+        return int(self.bet_round.max()) + 1 if len(self.bet_round) else 0
+
+
+def portfolio_stakes(slate: BetSlate, kelly_multiplier: float = KELLY_FRACTION) -> np.ndarray:
+    """
+    portfolio_kelly stakes for the slate's bets, solved round by round
+    (the bets of a round are placed at the same time).
+    """
+    stakes = np.zeros(len(slate.bet_odds))
+    for r in np.unique(slate.bet_round):
+        bets = np.flatnonzero(slate.bet_round == r)
+        stakes[bets] = portfolio_kelly(
+            slate.probs, slate.bet_match[bets], slate.bet_side[bets], slate.bet_odds[bets],
+            kelly_multiplier=kelly_multiplier,
+        )
+    return stakes
+
+
+def slate_from_ledger(ledger: pd.DataFrame) -> BetSlate:
+    """
+    The bets of a walk_forward_backtest ledger (three rows per match), one
+    round per gameweek (per match without a gameweek column), with
+    portfolio stakes solved per round.
+    """
+    n = len(ledger) // 3
+    probs = ledger["p_final"].to_numpy(dtype=float).reshape(n, 3)
+    rounds = pd.factorize(ledger["gameweek"].to_numpy()[::3] if "gameweek" in ledger.columns
+                          else np.arange(n), sort=False)[0]
+    rows = np.flatnonzero(ledger["bet"].to_numpy(dtype=bool))
+    match = rows // 3
+    _, round_of_bet = np.unique(rounds[match], return_inverse=True)
+    slate = BetSlate(
+        probs=probs,
+        bet_match=match,
+        bet_side=rows % 3,
+        bet_odds=ledger["odds"].to_numpy(dtype=float)[rows],
+        kelly_full=ledger["kelly_full"].to_numpy(dtype=float)[rows],
+        bet_round=round_of_bet,
+    )
+    slate.stake_portfolio = portfolio_stakes(slate)
+    return slate
+
+
+def slate_from_edges(edges: pd.DataFrame, bets: pd.DataFrame) -> BetSlate:
+    """
+    One round of upcoming bets from predict_from_future_odds.py output:
+    edges (future_odds_all_edges.csv) supplies every fixture's Home / Draw /
+    Away p_final, bets (e.g. future_odds_recommended_bets.csv) the bets.
+    Bets on other markets are left out, since their outcomes are not drawn.
+    stake_portfolio comes from the bets' stake_portfolio column (the stakes
+    predict_from_future_odds.py recommends), or is solved if it is missing.
+    """
+    keys = ["home_team", "away_team"]
+    one_x_two = edges[edges["bet_side"].isin(list(SIDES))]
+    probs = one_x_two.pivot_table(index=keys, columns="bet_side", values="p_final", aggfunc="first")
+    probs = probs.reindex(columns=list(SIDES)).dropna()
+    probs = probs.div(probs.sum(axis=1), axis=0)
+
+    bets = bets[bets["bet_side"].isin(list(SIDES))]
+    match = probs.index.get_indexer(pd.MultiIndex.from_frame(bets[keys]))
+    bets, match = bets[match >= 0], match[match >= 0]
+    slate = BetSlate(
+        probs=probs.to_numpy(),
+        bet_match=match,
+        bet_side=bets["bet_side"].map(SIDES).to_numpy(),
+        bet_odds=bets["odds"].to_numpy(dtype=float),
+        kelly_full=bets["kelly_full"].to_numpy(dtype=float),
+        bet_round=np.zeros(len(bets), dtype=np.int64),
+    )
+    if "stake_portfolio" in bets.columns:
+        slate.stake_portfolio = bets["stake_portfolio"].to_numpy(dtype=float)
+    else:
+        slate.stake_portfolio = portfolio_stakes(slate)
+    return slate
+
+
+@dataclass
+class BankrollSimulation:
+    """
+    Per policy and path: terminal bankroll (start = 1), maximum drawdown
+    (largest fall from a running peak, as a fraction of that peak) and
+    whether the bankroll ever dropped below ruin_level.
+    """
+    policies: List[StakingPolicy]
+    terminal: np.ndarray
+    max_drawdown: np.ndarray
+    ruined: np.ndarray
+    ruin_level: float
+    n_rounds: int
+
+    def summary(self) -> pd.DataFrame:
+        """
+        One row per policy: terminal wealth distribution, drawdown and ruin.
+        """
+        with np.errstate(divide="ignore"):
+            log_terminal = np.log(self.terminal)
+        q = np.quantile(self.terminal, [0.05, 0.25, 0.5, 0.75, 0.95], axis=1)
+        return pd.DataFrame({
+            "policy": [p.name for p in self.policies],
+            "kelly_fraction": [p.kelly_fraction for p in self.policies],
+            "max_exposure": [p.max_exposure for p in self.policies],
+            "mean_terminal": self.terminal.mean(axis=1),
+            "p05_terminal": q[0],
+            "p25_terminal": q[1],
+            "median_terminal": q[2],
+            "p75_terminal": q[3],
+            "p95_terminal": q[4],
+            "median_log_growth": np.median(log_terminal, axis=1),
+            "p_loss": (self.terminal < 1.0).mean(axis=1),
+            "median_max_drawdown": np.median(self.max_drawdown, axis=1),
+            "p95_max_drawdown": np.quantile(self.max_drawdown, 0.95, axis=1),
+            "p_ruin": self.ruined.mean(axis=1),
+        })
+
+
+def _base_stakes(slate: BetSlate, policy: StakingPolicy) -> np.ndarray:
+    """
+    Per-bet stakes a policy's round multipliers apply to.
+    """
+    if not policy.portfolio:
+        return slate.kelly_full
+    if slate.stake_portfolio is None:
+        raise ValueError(f"Policy {policy.name!r} needs the slate's stake_portfolio")
+    return slate.stake_portfolio
+
+
+def _round_multipliers(slate: BetSlate, policies: Sequence[StakingPolicy]) -> np.ndarray:
+    """
+    (policies, rounds) factor applied to each policy's base stakes
+    (full Kelly, or the portfolio stakes as they are) of each round.
+    """
+    out = np.empty((len(policies), slate.n_rounds))
+    for i, policy in enumerate(policies):
+        scale = 1.0 if policy.portfolio else policy.kelly_fraction
+        out[i] = scale
+        if policy.max_exposure is not None:
+            exposure = np.bincount(slate.bet_round, _base_stakes(slate, policy), minlength=slate.n_rounds)
+            staked = scale * exposure
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out[i] *= np.where(staked > policy.max_exposure, policy.max_exposure / staked, 1.0)
+    return out
+
+
+def simulate_bankroll(slate: BetSlate,
+                      policies: Sequence[StakingPolicy] = DEFAULT_POLICIES,
+                      n_paths: int = N_PATHS,
+                      n_repeats: int = 1,
+                      ruin_level: float = RUIN_LEVEL,
+                      chunk_size: int = CHUNK_SIZE,
+                      seed: Optional[int] = None) -> BankrollSimulation:
+    """
+    Monte Carlo bankroll paths for each staking policy.
+
+    Every path draws each match's result from slate.probs, plays the
+    slate's rounds n_repeats times in a row (e.g. one weekend's slate over
+    a 38-round season) and compounds: in each round every bet stakes its
+    policy fraction of the bankroll at the start of the round (portfolio
+    policies: the slate's stake_portfolio). All policies
+    share the same drawn results, so their differences are not sampling
+    noise. Paths are simulated chunk_size at a time as (paths x matches)
+    arrays. Results depend on seed and chunk_size.
+    """
+    policies = list(policies)
+    order = np.argsort(slate.bet_round, kind="stable")
+    bet_match = slate.bet_match[order]
+    bet_side = slate.bet_side[order]
+    win_return = slate.bet_odds[order] - 1.0
+    # one row of per-bet stakes per distinct base (full Kelly / portfolio)
+    base_of = np.array([int(p.portfolio) for p in policies], dtype=np.int64)
+    bases = [slate.kelly_full]
+    if base_of.any():
+        bases.append(_base_stakes(slate, policies[int(np.argmax(base_of))]))
+    base_stakes = np.stack(bases)[:, order]
+    starts = np.flatnonzero(np.r_[True, np.diff(slate.bet_round[order]) != 0])
+    # rounds that have no bets keep the bankroll unchanged, so only rounds with bets are played
+    played = np.unique(slate.bet_round)
+    multipliers = np.tile(_round_multipliers(slate, policies)[:, played], n_repeats)
+
+    # only matches with a bet need a drawn result
+    matches, bet_col = np.unique(bet_match, return_inverse=True)
+    probs = slate.probs[matches] / slate.probs[matches].sum(axis=1, keepdims=True)
+    cdf = np.cumsum(probs, axis=1)[:, :2]
+
+    terminal = np.empty((len(policies), n_paths))
+    max_drawdown = np.empty((len(policies), n_paths))
+    ruined = np.empty((len(policies), n_paths), dtype=bool)
+    sizes = [chunk_size] * (n_paths // chunk_size)
+    if n_paths % chunk_size:
+        sizes.append(n_paths % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    first = 0
+    log_ruin = np.log(ruin_level)
+    for size, chunk_seed in zip(sizes, seeds):
+        part = slice(first, first + size)
+        first += size
+        if len(played) == 0:
+            terminal[:, part], max_drawdown[:, part], ruined[:, part] = 1.0, 0.0, ruin_level >= 1.0
+            continue
+
+        rng = np.random.default_rng(chunk_seed)
+        unit = np.empty((len(base_stakes), size, len(played) * n_repeats))
+        for r in range(n_repeats):
+            u = rng.random((size, len(matches)))
+            result = (u >= cdf[:, 0]).astype(np.int8) + (u >= cdf[:, 1])
+            won = result[:, bet_col] == bet_side
+            per_bet = base_stakes[:, None, :] * np.where(won, win_return, -1.0)[None]
+            unit[:, :, r * len(played):(r + 1) * len(played)] = np.add.reduceat(per_bet, starts, axis=2)
+
+        with np.errstate(divide="ignore"):
+            log_wealth = np.cumsum(np.log(np.maximum(1.0 + multipliers[:, None, :] * unit[base_of], 0.0)), axis=2)
+        peak = np.maximum.accumulate(np.maximum(log_wealth, 0.0), axis=2)
+        with np.errstate(invalid="ignore"):
+            worst = (log_wealth - peak).min(axis=2)
+        terminal[:, part] = np.exp(log_wealth[:, :, -1])
+        max_drawdown[:, part] = np.maximum(1.0 - np.exp(np.minimum(worst, 0.0)), 0.0)
+        ruined[:, part] = log_wealth.min(axis=2) < log_ruin
+
+    return BankrollSimulation(
+        policies=policies,
+        terminal=terminal,
+        max_drawdown=max_drawdown,
+        ruined=ruined,
+        ruin_level=ruin_level,
+        n_rounds=len(played) * n_repeats,
+    )
+
+
+def policies_from_fractions(fractions: Sequence[float],
+                            max_exposure: Optional[float] = None) -> List[StakingPolicy]:
+    """
+    Fractional-Kelly policies named after their fraction.
+    """
+    suffix = f", cap {max_exposure:g}" if max_exposure is not None else ""
+    return [StakingPolicy(f"{f:g} Kelly{suffix}", f, max_exposure) for f in fractions]
+
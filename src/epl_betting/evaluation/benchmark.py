@@ -0,0 +1,114 @@
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from ..config import PROJECT_ROOT
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    scale: int
+    n_items: int           # matches / fixtures / calls processed per run
+    wall_time: float       # seconds, best of `repeats`
+    peak_memory_mb: float  # traced Python + numpy allocations during one run
+    throughput: float      # n_items per second at the best wall time
+
+
+def measure(name: str,
+            fn: Callable[[], object],
+            n_items: int,
+            scale: int = 1,
+            repeats: int = 3) -> BenchmarkResult:
+    """
+    Time fn() `repeats` times and keep the best run, then run it once more
+    under tracemalloc for peak memory (tracing slows allocation-heavy code,
+    so it is kept out of the timed runs).
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        name=name,
+        scale=scale,
+        n_items=n_items,
+        wall_time=best,
+        peak_memory_mb=peak / 2 ** 20,
+        throughput=n_items / best if best > 0 else float("inf"),
+    )
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path: Path) -> List[Dict]:
+    """
+    Previous benchmark runs, oldest first (empty if there is no history yet).
+    """
+    if not path.exists():
+        return []
+    return json.loads(path.read_text())
+
+
+def append_history(results: List[BenchmarkResult], path: Path) -> Dict:
+    """
+    Append one run (results plus commit / environment info) to the JSON
+    history at `path` and return the stored entry.
+    """
+    entry = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": [asdict(r) for r in results],
+    }
+    history = load_history(path)
+    history.append(entry)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(history, indent=1))
+    return entry
+
+
+def compare_to_previous(results: List[BenchmarkResult], history: List[Dict]) -> Dict[tuple, float]:
+    """
+    Wall-time ratio (current / most recent earlier run) for every
+    (name, scale) that appears in the history. > 1 means slower.
+    """
+    previous = {}
+    for entry in history:
+        for r in entry["results"]:
+            previous[(r["name"], r["scale"])] = r["wall_time"]
+
+    return {
+        (r.name, r.scale): r.wall_time / previous[(r.name, r.scale)]
+        for r in results
+        if previous.get((r.name, r.scale))
+    }
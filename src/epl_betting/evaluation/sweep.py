@@ -0,0 +1,176 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..betting.pricing import price_bets
+
+# Default grids: 21 x 31 x 20 = 13,020 settings
+MODEL_WEIGHT_GRID = np.round(np.linspace(0.0, 1.0, 21), 3)
+MIN_EDGE_GRID = np.round(np.linspace(0.0, 0.15, 31), 3)
+KELLY_FRACTION_GRID = np.round(np.linspace(0.05, 1.0, 20), 3)
+
+MAX_ELEMENTS = 8_000_000   # bet-mask cells (weights x edges x outcomes) held at once
+
+
+@dataclass
+class SweepResult:
+    """
+    Backtest surfaces over model_weights x min_edges x kelly_fractions.
+    Stakes are kelly_fraction * full Kelly, so n_bets, staked (per unit of
+    Kelly fraction) and roi do not depend on the Kelly fraction and are
+    (weights, edges); profit (flat stakes as fractions of the starting
+    bankroll, as in the walk-forward ledger), log_growth and max_drawdown
+    (bankroll compounded gameweek by gameweek) are (weights, edges, kellys).
+    A gameweek that loses the whole bankroll gives log_growth -inf and
+    max_drawdown 1.
+    """
+    model_weights: np.ndarray
+    min_edges: np.ndarray
+    kelly_fractions: np.ndarray
+    n_bets: np.ndarray
+    staked: np.ndarray
+    roi: np.ndarray
+    profit: np.ndarray
+    log_growth: np.ndarray
+    max_drawdown: np.ndarray
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        One row per (model_weight, min_edge, kelly_fraction).
+        """
+        shape = self.profit.shape
+        w, e, k = np.meshgrid(self.model_weights, self.min_edges, self.kelly_fractions, indexing="ij")
+        return pd.DataFrame({
+            "model_weight": w.ravel(),
+            "min_edge": e.ravel(),
+            "kelly_fraction": k.ravel(),
+            "n_bets": np.broadcast_to(self.n_bets[:, :, None], shape).ravel(),
+            "staked": (self.staked[:, :, None] * self.kelly_fractions).ravel(),
+            "roi": np.broadcast_to(self.roi[:, :, None], shape).ravel(),
+            "profit": self.profit.ravel(),
+            "log_growth": self.log_growth.ravel(),
+            "max_drawdown": self.max_drawdown.ravel(),
+        })
+
+    def at(self, model_weight: float, min_edge: float, kelly_fraction: float) -> pd.Series:
+        """
+        The grid point nearest to one setting.
+        """
+        i = int(np.abs(self.model_weights - model_weight).argmin())
+        j = int(np.abs(self.min_edges - min_edge).argmin())
+        k = int(np.abs(self.kelly_fractions - kelly_fraction).argmin())
+        return pd.Series({
+            "model_weight": self.model_weights[i],
+            "min_edge": self.min_edges[j],
+            "kelly_fraction": self.kelly_fractions[k],
+            "n_bets": self.n_bets[i, j],
+            "staked": self.staked[i, j] * self.kelly_fractions[k],
+            "roi": self.roi[i, j],
+            "profit": self.profit[i, j, k],
+            "log_growth": self.log_growth[i, j, k],
+            "max_drawdown": self.max_drawdown[i, j, k],
+        })
+
+
+def sweep_betting_params(p_model: np.ndarray,
+                         p_market: np.ndarray,
+                         odds: np.ndarray,
+                         outcome: np.ndarray,
+                         groups: Optional[Sequence] = None,
+                         model_weights: Sequence[float] = MODEL_WEIGHT_GRID,
+                         min_edges: Sequence[float] = MIN_EDGE_GRID,
+                         kelly_fractions: Sequence[float] = KELLY_FRACTION_GRID,
+                         max_elements: int = MAX_ELEMENTS) -> SweepResult:
+    """
+    Evaluate every blend / edge threshold / Kelly fraction on one set of
+    priced matches, with the staking rules of walk_forward_backtest:
+    p_final = renormalised w * p_model + (1 - w) * p_market, bet when
+    p_final - p_market >= min_edge, stake kelly_fraction * full Kelly.
+
+    p_model, p_market, odds and outcome (1 for the result that happened)
+    are (N, 3) home/draw/away arrays in time order; groups (e.g. gameweek,
+    default one group per match) marks bets settled together when the
+    bankroll compounds. Blends are processed in chunks of weights so the
+    bet masks stay under max_elements cells.
+    """
+    p_model = np.asarray(p_model, dtype=float)
+    p_market = np.asarray(p_market, dtype=float)
+    odds = np.asarray(odds, dtype=float)
+    outcome = np.asarray(outcome, dtype=float)
+    weights = np.asarray(model_weights, dtype=float)
+    edges = np.asarray(min_edges, dtype=float)
+    kellys = np.asarray(kelly_fractions, dtype=float)
+    n = len(p_model)
+
+    group_codes = pd.factorize(pd.Series(groups if groups is not None else np.arange(n)), sort=False)[0]
+    if n and (np.diff(group_codes) < 0).any():
+        raise ValueError("groups must be contiguous and in time order")
+    n_groups = int(group_codes.max()) + 1 if n else 0
+    group_of = np.repeat(group_codes, 3)
+    payoff = (odds * outcome - 1.0).ravel()   # return per unit staked
+
+    # per match and weight: blended, renormalised probabilities -> edge and full Kelly
+    priced = price_bets(p_model, p_market, odds, weights[:, None, None], normalize_axis=2)
+    edge = priced["edge"].reshape(len(weights), -1)
+    kelly_full = priced["kelly_full"].reshape(len(weights), -1)
+    priced = np.isfinite(edge) & np.isfinite(kelly_full) & np.isfinite(payoff)
+    edge = np.where(priced, edge, -np.inf)
+    kelly_full = np.where(priced, kelly_full, 0.0)
+    payoff = np.where(np.isfinite(payoff), payoff, 0.0)
+
+    stake_return = kelly_full * payoff
+    starts = np.flatnonzero(np.r_[True, np.diff(group_of) != 0]) if n else np.zeros(0, dtype=int)
+
+    # bet masks for a chunk of weights against every edge threshold at once
+    n_bets = np.empty((len(weights), len(edges)), dtype=np.int64)
+    staked = np.empty((len(weights), len(edges)))
+    group_return = np.zeros((len(weights), len(edges), n_groups))   # per unit Kelly fraction
+    step = max(1, max_elements // max(1, len(edges) * 3 * n))
+    for first in range(0, len(weights), step):
+        part = slice(first, first + step)
+        bet = edge[part, None, :] >= edges[None, :, None]
+        n_bets[part] = bet.sum(axis=2)
+        staked[part] = np.where(bet, kelly_full[part, None, :], 0.0).sum(axis=2)
+        if n:
+            group_return[part] = np.add.reduceat(np.where(bet, stake_return[part, None, :], 0.0), starts, axis=2)
+
+    unit_profit = group_return.sum(axis=2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = np.where(staked > 0, unit_profit / staked, 0.0)
+        growth = np.log(np.maximum(1.0 + kellys[None, None, :, None] * group_return[:, :, None, :], 0.0))
+
+    log_wealth = np.cumsum(growth, axis=3)
+    peak = np.maximum.accumulate(np.maximum(log_wealth, 0.0), axis=3)
+    with np.errstate(invalid="ignore"):
+        worst = (log_wealth - peak).min(axis=3, initial=0.0)
+    max_drawdown = np.where(np.isnan(worst), 1.0, 1.0 - np.exp(worst))
+
+    return SweepResult(
+        model_weights=weights,
+        min_edges=edges,
+        kelly_fractions=kellys,
+        n_bets=n_bets,
+        staked=staked,
+        roi=roi,
+        profit=unit_profit[:, :, None] * kellys,
+        log_growth=log_wealth[:, :, :, -1] if n_groups else np.zeros(log_wealth.shape[:3]),
+        max_drawdown=max_drawdown,
+    )
+
+
+def sweep_ledger(ledger: pd.DataFrame, **kwargs) -> SweepResult:
+    """
+    sweep_betting_params on a walk_forward_backtest ledger (three rows per
+    match, Home / Draw / Away), compounding by gameweek.
+    """
+    n = len(ledger) // 3
+
+    def matrix(col):
+        return ledger[col].to_numpy(dtype=float).reshape(n, 3)
+
+    groups = ledger["gameweek"].to_numpy()[::3] if "gameweek" in ledger.columns else None
+    return sweep_betting_params(
+        matrix("p_model"), matrix("p_market"), matrix("odds"), matrix("outcome"), groups, **kwargs
+    )
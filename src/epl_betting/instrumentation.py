@@ -0,0 +1,189 @@
+import cProfile
+import functools
+import json
+import os
+import platform
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .config import RESULTS_DIR
+from .evaluation.benchmark import _git_commit
+
+# Opt-in capture for every stage: EPL_PROFILE=cpu, =memory or =cpu,memory.
+# Timers and counters are always on (they cost about a microsecond each).
+PROFILE_ENV = "EPL_PROFILE"
+METRICS_DIR = RESULTS_DIR / "metrics"
+PROFILE_TOP_N = 20
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    total_time: float = 0.0               # seconds, summed over calls
+    max_time: float = 0.0
+    peak_memory_mb: Optional[float] = None  # largest traced peak of any call
+    profile: Optional[List[Dict]] = None    # top functions by cumulative time (last profiled call)
+
+
+@dataclass
+class OptimizerStats:
+    calls: int = 0
+    iterations: int = 0
+    function_evals: int = 0
+    gradient_evals: int = 0
+    failures: int = 0
+    last_message: str = ""
+
+
+def _top_functions(profiler: cProfile.Profile, n: int = PROFILE_TOP_N) -> List[Dict]:
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda kv: kv[1][3], reverse=True)[:n]
+    return [
+        {
+            "function": f"{Path(file).name}:{line}({func})",
+            "calls": nc,
+            "tottime": round(tt, 6),
+            "cumtime": round(ct, 6),
+        }
+        for (file, line, func), (cc, nc, tt, ct, callers) in rows
+    ]
+
+
+class Instrumentation:
+    """
+    Collects stage timings, counters and scipy optimizer statistics for one
+    process. Nested stages are recorded under "outer/inner" names. cProfile
+    and tracemalloc capture apply to the outermost stage that asks for them
+    (neither can be nested).
+    """
+
+    def __init__(self, profile_cpu: bool = False, trace_memory: bool = False):
+        self.profile_cpu = profile_cpu
+        self.trace_memory = trace_memory
+        self.reset()
+
+    @classmethod
+    def from_env(cls) -> "Instrumentation":
+        modes = {m.strip() for m in os.environ.get(PROFILE_ENV, "").lower().split(",")}
+        return cls(profile_cpu="cpu" in modes, trace_memory="memory" in modes)
+
+    def reset(self) -> None:
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, float] = {}
+        self.optimizers: Dict[str, OptimizerStats] = {}
+        self._stack: List[str] = []
+        self._profiling = False
+        self.started = time.time()
+
+    @contextmanager
+    def stage(self, name: str, profile: Optional[bool] = None, memory: Optional[bool] = None):
+        """
+        Time the enclosed block as stage `name`. profile / memory override
+        the process-wide cProfile / tracemalloc settings for this stage.
+        """
+        path = "/".join(self._stack + [name])
+        profile = self.profile_cpu if profile is None else profile
+        memory = self.trace_memory if memory is None else memory
+
+        profiler = None
+        if profile and not self._profiling:
+            profiler = cProfile.Profile()
+            self._profiling = True
+        tracing = memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+
+        self._stack.append(name)
+        if profiler is not None:
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+                self._profiling = False
+            self._stack.pop()
+
+            stats = self.stages.setdefault(path, StageStats())
+            stats.calls += 1
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+            if tracing:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                stats.peak_memory_mb = max(stats.peak_memory_mb or 0.0, peak / 2 ** 20)
+            if profiler is not None:
+                stats.profile = _top_functions(profiler)
+
+    def count(self, name: str, n: float = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def record_optimizer(self, name: str, result) -> None:
+        """
+        Accumulate iteration / evaluation counts from a scipy OptimizeResult.
+        """
+        stats = self.optimizers.setdefault(name, OptimizerStats())
+        stats.calls += 1
+        stats.iterations += int(getattr(result, "nit", 0) or 0)
+        stats.function_evals += int(getattr(result, "nfev", 0) or 0)
+        stats.gradient_evals += int(getattr(result, "njev", 0) or 0)
+        if not getattr(result, "success", True):
+            stats.failures += 1
+        stats.last_message = str(getattr(result, "message", ""))
+
+    def report(self) -> Dict:
+        return {
+            "timestamp": datetime.fromtimestamp(self.started, timezone.utc).isoformat(timespec="seconds"),
+            "wall_time": time.time() - self.started,
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "stages": {name: asdict(s) for name, s in self.stages.items()},
+            "counters": dict(self.counters),
+            "optimizers": {name: asdict(s) for name, s in self.optimizers.items()},
+        }
+
+    def write_report(self, run_name: str, metrics_dir: Path = METRICS_DIR) -> Path:
+        """
+        Write this run to metrics_dir/<run_name>.json (latest run) and append
+        it as one line to metrics_dir/<run_name>.jsonl (history across runs).
+        """
+        entry = self.report()
+        entry["run"] = run_name
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+        path = metrics_dir / f"{run_name}.json"
+        path.write_text(json.dumps(entry, indent=1))
+        with open(metrics_dir / f"{run_name}.jsonl", "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        return path
+
+
+# Process-wide collector used by the package and the scripts
+INSTRUMENTATION = Instrumentation.from_env()
+
+stage = INSTRUMENTATION.stage
+count = INSTRUMENTATION.count
+record_optimizer = INSTRUMENTATION.record_optimizer
+write_report = INSTRUMENTATION.write_report
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """
+    Decorator form of stage(): @timed() uses the function's name.
+    """
+    def decorate(fn: Callable) -> Callable:
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with INSTRUMENTATION.stage(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,129 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..config import PROJECT_ROOT
+from .team_strength import TeamStrength, pack_strength, unpack_strength
+
+SCHEMA_VERSION = 1
+
+MODELS_DIR = PROJECT_ROOT / "models"
+ARTIFACT_ROOT = MODELS_DIR / "team_strength"
+
+PARAMS_FILE = "params.npy"
+META_FILE = "meta.json"
+LATEST_FILE = "LATEST"
+
+
+@dataclass
+class ModelArtifact:
+    """
+    A fitted team-strength model on disk: a team index plus one contiguous
+    float64 vector laid out as in pack_strength
+    ([attack..., defence..., home_advantage, intercept]).
+    """
+    teams: List[str]
+    params: np.ndarray
+    meta: Dict
+    path: Optional[Path] = None
+
+    @property
+    def version(self) -> int:
+        return self.meta["version"]
+
+    def fixture_tensor(self):
+        """
+        All-pairs pricing tensor, persisted inside this version's directory.
+        """
+        return self.to_strength().fixture_tensor(cache_dir=self.path)
+
+    def to_strength(self) -> TeamStrength:
+        strength = unpack_strength(self.teams, self.params)
+        strength.rho = self.meta.get("rho", 0.0)
+        strength.lambda3 = self.meta.get("lambda3", 0.0)
+        return strength
+
+
+def data_hash(df: pd.DataFrame) -> str:
+    """
+    Content hash of the training data, stored with the model.
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()[:16]
+
+
+def latest_version(root: Path = ARTIFACT_ROOT) -> Optional[int]:
+    path = Path(root) / LATEST_FILE
+    if not path.exists():
+        return None
+    return int(path.read_text().strip())
+
+
+def save_model(strength: TeamStrength,
+               root: Path = ARTIFACT_ROOT,
+               training_data: Optional[pd.DataFrame] = None,
+               source: str = "",
+               extra_meta: Optional[Dict] = None) -> ModelArtifact:
+    """
+    Write strength as the next version under root (root/0001, root/0002, ...)
+    and point root/LATEST at it. LATEST is replaced atomically, so readers
+    never see a half-written model.
+    """
+    root = Path(root)
+    version = (latest_version(root) or 0) + 1
+    out_dir = root / f"{version:04d}"
+    out_dir.mkdir(parents=True, exist_ok=False)
+
+    teams = list(strength.attack)
+    params = np.ascontiguousarray(pack_strength(strength, teams), dtype=np.float64)
+    np.save(out_dir / PARAMS_FILE, params)
+
+    meta = {
+        "schema_version": SCHEMA_VERSION,
+        "version": version,
+        "teams": teams,
+        "fit_date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "data_hash": data_hash(training_data) if training_data is not None else None,
+        "n_matches": len(training_data) if training_data is not None else None,
+        "source": source,
+        "rho": strength.rho,
+        "lambda3": strength.lambda3,
+    }
+    if extra_meta:
+        meta.update(extra_meta)
+    (out_dir / META_FILE).write_text(json.dumps(meta, indent=1))
+
+    tmp = root / (LATEST_FILE + ".tmp")
+    tmp.write_text(str(version))
+    tmp.replace(root / LATEST_FILE)
+
+    return ModelArtifact(teams=teams, params=params, meta=meta, path=out_dir)
+
+
+def load_model(root: Path = ARTIFACT_ROOT,
+               version: Optional[int] = None,
+               mmap: bool = True) -> ModelArtifact:
+    """
+    Load a model version (the latest by default). The parameter vector is
+    memory-mapped read-only unless mmap=False.
+    """
+    root = Path(root)
+    if version is None:
+        version = latest_version(root)
+        if version is None:
+            raise FileNotFoundError(f"No model artifacts under {root}")
+
+    path = root / f"{version:04d}"
+    meta = json.loads((path / META_FILE).read_text())
+    if meta.get("schema_version") != SCHEMA_VERSION:
+        raise ValueError(
+            f"Model {path} has schema {meta.get('schema_version')}, expected {SCHEMA_VERSION}"
+        )
+    params = np.load(path / PARAMS_FILE, mmap_mode="r" if mmap else None)
+    return ModelArtifact(teams=meta["teams"], params=params, meta=meta, path=path)
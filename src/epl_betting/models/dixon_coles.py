@@ -0,0 +1,241 @@
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..instrumentation import record_optimizer
+from .team_strength import (
+    TeamStrength,
+    eta_grad_to_params,
+    fit_poisson_arrays,
+    fit_poisson_strength_model,
+    pack_strength,
+    params_expected_goals,
+    poisson_nll,
+    team_index,
+    unpack_strength,
+)
+
+
+def _low_score_cells(home_goals: np.ndarray, away_goals: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Indices of matches in the 0/1-goal block and their cell (2 * home + away).
+    Computed once per fit, so the likelihood only touches these rows.
+    """
+    low = np.flatnonzero((home_goals <= 1) & (away_goals <= 1))
+    cell = (2 * home_goals[low] + away_goals[low]).astype(np.int64)
+    return low, cell
+
+
+def dixon_coles_nll(params: np.ndarray,
+                    home_idx: np.ndarray,
+                    away_idx: np.ndarray,
+                    home_goals: np.ndarray,
+                    away_goals: np.ndarray,
+                    n_teams: int,
+                    low: np.ndarray,
+                    cell: np.ndarray,
+                    weights: Optional[np.ndarray] = None) -> Tuple[float, np.ndarray]:
+    """
+    Dixon-Coles negative log-likelihood and gradient.
+    params = pack_strength layout + [rho]. The Poisson part is poisson_nll; the
+    tau correction only involves the pre-selected low-score matches.
+    """
+    base = params[:-1]
+    rho = params[-1]
+    value, grad_base = poisson_nll(base, home_idx, away_idx, home_goals, away_goals, n_teams, weights)
+
+    h_idx = home_idx[low]
+    a_idx = away_idx[low]
+    lam_home, lam_away = params_expected_goals(base, h_idx, a_idx, n_teams)
+
+    # tau = 1 + rho * d_rho, with d_rho per cell (0,0), (0,1), (1,0), (1,1)
+    d_rho = np.choose(cell, [-lam_home * lam_away, lam_home, lam_away, -np.ones_like(lam_home)])
+    tau = np.maximum(1.0 + rho * d_rho, 1e-10)
+    w = weights[low] if weights is not None else 1.0
+
+    value -= np.sum(w * np.log(tau))
+
+    # d tau / d log(lam_home) is rho * d_rho in cells (0,0) and (0,1); same for away in (0,0), (1,0)
+    dlog = w * rho * d_rho / tau
+    g_home = -np.where(cell <= 1, dlog, 0.0)
+    g_away = -np.where((cell == 0) | (cell == 2), dlog, 0.0)
+
+    grad = np.empty_like(params)
+    grad[:-1] = grad_base + eta_grad_to_params(g_home, g_away, h_idx, a_idx, n_teams)
+    grad[-1] = -np.sum(w * d_rho / tau)
+    return value, grad
+
+
+def bivariate_poisson_nll(params: np.ndarray,
+                          home_idx: np.ndarray,
+                          away_idx: np.ndarray,
+                          home_goals: np.ndarray,
+                          away_goals: np.ndarray,
+                          n_teams: int,
+                          shared: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+                          weights: Optional[np.ndarray] = None) -> Tuple[float, np.ndarray]:
+    """
+    Bivariate Poisson negative log-likelihood and gradient.
+    home = A + C, away = B + C with A ~ Pois(lam_home), B ~ Pois(lam_away),
+    C ~ Pois(lambda3); params = pack_strength layout + [log(lambda3)].
+
+    Only matches where both sides scored need the sum over the shared count
+    k = 0..min(home, away); `shared` holds those rows and their data-only
+    terms, precomputed once by _bivariate_terms.
+    """
+    rows, log_fact, x_k, y_k, k = shared
+    base = params[:-1]
+    lam3 = np.exp(params[-1])
+    lam_home, lam_away = params_expected_goals(base, home_idx, away_idx, n_teams)
+    log_home = np.log(lam_home)
+    log_away = np.log(lam_away)
+
+    # k = 0 everywhere (factorials dropped), then replace the rows with shared goals
+    log_sum = home_goals * log_home + away_goals * log_away
+    expected_k = np.zeros_like(lam_home)
+    if rows.size:
+        # (K, rows) layout: reductions over k run across contiguous rows
+        terms = (log_fact + x_k * log_home[rows] + y_k * log_away[rows] +
+                 k[:, None] * np.log(lam3))
+        top = terms.max(axis=0)
+        post = np.exp(terms - top)
+        total = post.sum(axis=0)
+        log_sum[rows] = top + np.log(total)
+        expected_k[rows] = (k @ post) / total
+
+    w = weights if weights is not None else 1.0
+    loglik = -(lam_home + lam_away + lam3) + log_sum
+
+    attack = base[:n_teams]
+    defence = base[n_teams:2 * n_teams]
+    value = -np.sum(w * loglik) + attack.sum() ** 2 + defence.sum() ** 2
+
+    g_home = -w * (home_goals - expected_k - lam_home)
+    g_away = -w * (away_goals - expected_k - lam_away)
+
+    grad = np.empty_like(params)
+    grad[:-1] = eta_grad_to_params(g_home, g_away, home_idx, away_idx, n_teams)
+    grad[:n_teams] += 2.0 * attack.sum()
+    grad[n_teams:2 * n_teams] += 2.0 * defence.sum()
+    grad[-1] = -np.sum(w * (expected_k - lam3))
+    return value, grad
+
+
+def _bivariate_terms(home_goals: np.ndarray, away_goals: np.ndarray):
+    """
+    Data-only pieces of the bivariate likelihood for matches where both sides
+    scored, relative to the k = 0 term: (rows, log-factorial ratios, x - k, y - k, k).
+    Arrays are (K, rows), with -inf where k > min(x, y).
+    """
+    from scipy.special import gammaln
+
+    shared = np.minimum(home_goals, away_goals)
+    rows = np.flatnonzero(shared > 0)
+    k = np.arange(int(shared.max()) + 1 if rows.size else 1, dtype=float)
+    x = home_goals[None, rows]
+    y = away_goals[None, rows]
+    x_k = np.maximum(x - k[:, None], 0.0)
+    y_k = np.maximum(y - k[:, None], 0.0)
+    log_fact = (gammaln(x + 1) - gammaln(x_k + 1) +
+                gammaln(y + 1) - gammaln(y_k + 1) -
+                gammaln(k + 1)[:, None])
+    log_fact = np.where(k[:, None] <= shared[None, rows], log_fact, -np.inf)
+    return rows, log_fact, x_k, y_k, k
+
+
+def _prepare(df: pd.DataFrame, weights: Optional[np.ndarray], init: Optional[TeamStrength]):
+    home_goals = df["home_goals"].to_numpy(dtype=float)
+    away_goals = df["away_goals"].to_numpy(dtype=float)
+    teams, home_idx, away_idx = team_index(df)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)
+
+    if init is not None:
+        x0 = pack_strength(init, teams)
+    else:
+        # warm start from the independent Poisson fit
+        x0 = fit_poisson_arrays(home_idx, away_idx, home_goals, away_goals, len(teams), weights=weights).x
+    return teams, home_idx, away_idx, home_goals, away_goals, weights, x0
+
+
+def fit_dixon_coles(df: pd.DataFrame,
+                    weights: Optional[np.ndarray] = None,
+                    init: Optional[TeamStrength] = None) -> TeamStrength:
+    """
+    Fit attack/defence/home advantage and the Dixon-Coles rho by maximum likelihood.
+    df must contain home_team_name, away_team_name, home_goals, away_goals.
+    """
+    from scipy.optimize import minimize
+
+    teams, home_idx, away_idx, home_goals, away_goals, weights, x0 = _prepare(df, weights, init)
+    n_teams = len(teams)
+    low, cell = _low_score_cells(home_goals, away_goals)
+    rho0 = init.rho if init is not None else 0.0
+
+    result = minimize(
+        dixon_coles_nll,
+        np.append(x0, rho0),
+        args=(home_idx, away_idx, home_goals, away_goals, n_teams, low, cell, weights),
+        jac=True,
+        method="L-BFGS-B",
+        bounds=[(None, None)] * len(x0) + [(-0.3, 0.3)],
+    )
+    record_optimizer("dixon_coles_mle", result)
+    strength = unpack_strength(teams, result.x[:-1])
+    strength.rho = float(result.x[-1])
+    return strength
+
+
+def fit_bivariate_poisson(df: pd.DataFrame,
+                          weights: Optional[np.ndarray] = None,
+                          init: Optional[TeamStrength] = None) -> TeamStrength:
+    """
+    Fit a bivariate Poisson model (shared goal rate lambda3) by maximum likelihood.
+    Expected goals from the returned strength are the non-shared rates; the
+    marginal means are those plus lambda3.
+    """
+    from scipy.optimize import minimize
+
+    teams, home_idx, away_idx, home_goals, away_goals, weights, x0 = _prepare(df, weights, init)
+    n_teams = len(teams)
+    shared = _bivariate_terms(home_goals, away_goals)
+    lam3_0 = init.lambda3 if init is not None and init.lambda3 > 0 else 0.1
+
+    # lambda3 borrows from both sides, so shrink the starting intercept to keep means roughly equal
+    x0 = x0.copy()
+    x0[2 * n_teams + 1] -= lam3_0 / max(np.exp(x0[2 * n_teams + 1]), 1e-8)
+
+    result = minimize(
+        bivariate_poisson_nll,
+        np.append(x0, np.log(lam3_0)),
+        args=(home_idx, away_idx, home_goals, away_goals, n_teams, shared, weights),
+        jac=True,
+        method="L-BFGS-B",
+        bounds=[(None, None)] * len(x0) + [(np.log(1e-4), np.log(2.0))],
+    )
+    record_optimizer("bivariate_poisson_mle", result)
+    strength = unpack_strength(teams, result.x[:-1])
+    strength.lambda3 = float(np.exp(result.x[-1]))
+    return strength
+
+
+# score model name -> (fitter taking df, weights=, init=; artifact source)
+SCORE_MODELS: Dict[str, Tuple[Callable[..., TeamStrength], str]] = {
+    "poisson": (fit_poisson_strength_model, "poisson_mle"),
+    "dixon_coles": (fit_dixon_coles, "dixon_coles_mle"),
+    "bivariate_poisson": (fit_bivariate_poisson, "bivariate_poisson_mle"),
+}
+
+
+def fit_score_model(name: str,
+                    df: pd.DataFrame,
+                    weights: Optional[np.ndarray] = None,
+                    init: Optional[TeamStrength] = None) -> Tuple[TeamStrength, str]:
+    """
+    Fit one of SCORE_MODELS on goals. Returns (strength, artifact source).
+    """
+    if name not in SCORE_MODELS:
+        raise ValueError(f"Unknown score model {name!r}; expected one of {tuple(SCORE_MODELS)}")
+    fit, source = SCORE_MODELS[name]
+    return fit(df, weights=weights, init=init), source
@@ -0,0 +1,154 @@
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..instrumentation import count, timed
+from .markets import btts, goal_distributions
+from .probability import matrix_outcome_probs, score_matrices
+from .team_strength import TeamStrength, expected_goals_batch, pack_strength
+
+TOTAL_LINES = [0.5, 1.5, 2.5, 3.5, 4.5]
+
+MARKETS = (
+    ["lambda_home", "lambda_away", "p_home", "p_draw", "p_away"] +
+    [f"p_over_{line}".replace(".", "_") for line in TOTAL_LINES] +
+    ["p_btts"]
+)
+
+# In-process cache: strength hash -> tensor, least recently used first.
+# Bounded so a long-running process that reloads model versions only keeps
+# the current tensor and the one before it.
+_CACHE: "OrderedDict[str, FixtureTensor]" = OrderedDict()
+CACHE_SIZE = 2
+
+
+def strength_hash(strength: TeamStrength, max_goals: int = 10) -> str:
+    """
+    Hash of everything the tensor depends on: teams, parameters, dependence
+    terms and the score-grid size.
+    """
+    teams = list(strength.attack)
+    h = hashlib.sha256()
+    h.update("\x1f".join(teams).encode())
+    h.update(pack_strength(strength, teams).astype(np.float64).tobytes())
+    h.update(np.array([strength.rho, strength.lambda3, max_goals], dtype=np.float64).tobytes())
+    return h.hexdigest()[:16]
+
+
+@dataclass
+class FixtureTensor:
+    """
+    Every (home, away) pairing priced once: values[home, away, market] with
+    markets as in MARKETS. Same-team entries are NaN.
+    """
+    teams: List[str]
+    values: np.ndarray
+    key: str
+
+    def __post_init__(self):
+        self._index = pd.Index(self.teams)
+        self._market = {m: i for i, m in enumerate(MARKETS)}
+
+    def indices(self, teams: Sequence[str]) -> np.ndarray:
+        idx = self._index.get_indexer(np.asarray(teams))
+        if (idx < 0).any():
+            unknown = sorted(set(np.asarray(teams)[idx < 0]))
+            raise KeyError(f"Unknown teams: {unknown}")
+        return idx
+
+    def lookup(self, home: str, away: str) -> Dict[str, float]:
+        row = self.values[self._index.get_loc(home), self._index.get_loc(away)]
+        return {m: float(row[i]) for m, i in self._market.items()}
+
+    def lookup_batch(self,
+                     home: Sequence[str],
+                     away: Sequence[str],
+                     markets: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        (N, M) array of market values for N fixtures (all markets by default).
+        """
+        cols = slice(None) if markets is None else [self._market[m] for m in markets]
+        count("fixtures_priced", len(home))
+        return self.values[self.indices(home), self.indices(away)][:, cols]
+
+
+def _price_pairs(strength: TeamStrength, home: np.ndarray, away: np.ndarray, max_goals: int) -> np.ndarray:
+    """
+    MARKETS columns for a batch of (home, away) team-index pairs.
+    """
+    lam_home, lam_away = expected_goals_batch(strength, home, away)
+    matrices = score_matrices(lam_home, lam_away, max_goals, rho=strength.rho, lambda3=strength.lambda3)
+    matrices = matrices / matrices.sum(axis=(1, 2), keepdims=True)
+
+    _, total_dist = goal_distributions(matrices)
+    totals = np.arange(total_dist.shape[1])
+
+    columns = [lam_home, lam_away]
+    columns.extend(matrix_outcome_probs(matrices).T)
+    for line in TOTAL_LINES:
+        columns.append(total_dist[:, totals > line].sum(axis=1))
+    columns.append(btts(matrices))
+    return np.stack(columns, axis=1)
+
+
+@timed()
+def build_fixture_tensor(strength: TeamStrength,
+                         max_goals: int = 10,
+                         pairs_per_block: int = 50_000) -> FixtureTensor:
+    """
+    Price all teams x teams pairings from batches of score matrices.
+    Home teams are processed in blocks of about pairs_per_block pairings, so
+    the (pairs, G, G) intermediates stay bounded when there are many teams.
+    """
+    teams = list(strength.attack)
+    n = len(teams)
+    values = np.empty((n, n, len(MARKETS)))
+
+    block = max(1, pairs_per_block // max(n, 1))
+    for start in range(0, n, block):
+        rows = np.arange(start, min(start + block, n))
+        home = np.repeat(rows, n)
+        away = np.tile(np.arange(n), len(rows))
+        values[rows] = _price_pairs(strength, home, away, max_goals).reshape(len(rows), n, len(MARKETS))
+
+    values[np.arange(n), np.arange(n)] = np.nan
+    count("tensor_pairs_priced", n * (n - 1))
+    return FixtureTensor(teams=teams, values=values, key=strength_hash(strength, max_goals))
+
+
+def fixture_tensor(strength: TeamStrength,
+                   cache_dir: Optional[Path] = None,
+                   max_goals: int = 10) -> FixtureTensor:
+    """
+    Cached all-pairs tensor for a strength. Looked up by strength_hash in
+    memory, then as cache_dir/fixture_tensor_<hash>.npy (memory-mapped), and
+    only built if neither exists. Changing the strength changes the hash, so
+    stale tensors are never served. Only the CACHE_SIZE most recently used
+    tensors stay in memory.
+    """
+    key = strength_hash(strength, max_goals)
+    if key in _CACHE:
+        _CACHE.move_to_end(key)
+        return _CACHE[key]
+
+    teams = list(strength.attack)
+    path = Path(cache_dir) / f"fixture_tensor_{key}.npy" if cache_dir is not None else None
+    if path is not None and path.exists():
+        tensor = FixtureTensor(teams=teams, values=np.load(path, mmap_mode="r"), key=key)
+    else:
+        tensor = build_fixture_tensor(strength, max_goals)
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.stem + ".tmp.npy")
+            np.save(tmp, tensor.values)
+            tmp.replace(path)
+
+    _CACHE[key] = tensor
+    while len(_CACHE) > CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    return tensor
@@ -0,0 +1,164 @@
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Settlement classes for lines that can push or split (Asian handicap, totals)
+SETTLEMENTS = ("win", "half_win", "push", "half_loss", "loss")
+
+
+def goal_distributions(matrices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Collapse (N, G, G) score matrices into goal-difference and total-goals
+    distributions with one matrix product each.
+
+    Returns (diff_dist, total_dist), both (N, 2G - 1):
+    diff_dist[:, k] = P(home - away = k - (G - 1)), total_dist[:, t] = P(home + away = t).
+    """
+    n, g, _ = matrices.shape
+    i, j = np.indices((g, g))
+    flat = matrices.reshape(n, g * g)
+    diff_map = np.zeros((g * g, 2 * g - 1))
+    diff_map[np.arange(g * g), (i - j + g - 1).ravel()] = 1.0
+    total_map = np.zeros((g * g, 2 * g - 1))
+    total_map[np.arange(g * g), (i + j).ravel()] = 1.0
+    return flat @ diff_map, flat @ total_map
+
+
+def _settle(dist: np.ndarray, values: np.ndarray, line) -> Dict[str, np.ndarray]:
+    """
+    Settle "values + line > 0" over a discrete distribution. `line` is a scalar
+    or one line per fixture. Quarter lines are split into two half stakes on
+    line -/+ 0.25, so the combined result is one of win / half_win / push /
+    half_loss / loss.
+    """
+    line = np.asarray(line, dtype=float)
+    if np.any(np.abs(line * 4 - np.round(line * 4)) > 1e-9):
+        raise ValueError(f"Lines must be multiples of 0.25, got {line}")
+    quarter = np.abs(line * 2 - np.round(line * 2)) > 1e-9
+    low = np.where(quarter, line - 0.25, line)[..., None]
+    high = np.where(quarter, line + 0.25, line)[..., None]
+
+    score = np.sign(values + low) + np.sign(values + high)  # in {-2, ..., 2}
+    out = {}
+    for name, s in zip(SETTLEMENTS, (2, 1, 0, -1, -2)):
+        out[name] = (dist * (score == s)).sum(axis=-1)
+    return out
+
+
+def asian_handicap(matrices: np.ndarray, line) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """
+    Settlement probabilities for home at `line` (e.g. -0.75) and away at -line.
+    `line` may be a scalar or one line per fixture.
+    """
+    g = matrices.shape[1]
+    diff_dist, _ = goal_distributions(matrices)
+    diffs = np.arange(-(g - 1), g).astype(float)
+    line = np.asarray(line, dtype=float)
+    return _settle(diff_dist, diffs, line), _settle(diff_dist, -diffs, -line)
+
+
+def over_under(matrices: np.ndarray, line) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """
+    Settlement probabilities for over / under `line` total goals
+    (whole and quarter lines can push or half-settle). `line` may be per fixture.
+    """
+    g = matrices.shape[1]
+    _, total_dist = goal_distributions(matrices)
+    totals = np.arange(2 * g - 1).astype(float)
+    line = np.asarray(line, dtype=float)
+    return _settle(total_dist, totals, -line), _settle(total_dist, -totals, line)
+
+
+def btts(matrices: np.ndarray) -> np.ndarray:
+    """
+    P(both teams score), shape (N,).
+    """
+    return matrices[:, 1:, 1:].sum(axis=(1, 2))
+
+
+def double_chance(matrices: np.ndarray) -> np.ndarray:
+    """
+    (N, 3) probabilities for 1X, X2 and 12.
+    """
+    p_home = np.tril(matrices, -1).sum(axis=(1, 2))
+    p_draw = np.einsum("nii->n", matrices)
+    p_away = np.triu(matrices, 1).sum(axis=(1, 2))
+    return np.stack([p_home + p_draw, p_draw + p_away, p_home + p_away], axis=1)
+
+
+def correct_score(matrices: np.ndarray, max_score: int = 4) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (N, max_score + 1, max_score + 1) correct-score probabilities and the (N,)
+    probability of any other score.
+    """
+    grid = matrices[:, :max_score + 1, :max_score + 1]
+    return grid, matrices.sum(axis=(1, 2)) - grid.sum(axis=(1, 2))
+
+
+def effective_win_prob(settlement: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Win probability of the binary bet with the same Kelly stake: pushes are
+    removed and half results count as half a win / half a loss.
+    """
+    win = settlement["win"] + 0.5 * settlement["half_win"]
+    loss = settlement["loss"] + 0.5 * settlement["half_loss"]
+    return win / (win + loss)
+
+
+def expected_profit(settlement: Dict[str, np.ndarray], odds) -> np.ndarray:
+    """
+    Expected profit per unit staked at decimal `odds`.
+    """
+    b = np.asarray(odds, dtype=float) - 1.0
+    return (settlement["win"] * b + settlement["half_win"] * b / 2 -
+            settlement["half_loss"] / 2 - settlement["loss"])
+
+
+def _line_label(line: float) -> str:
+    return f"{line:+g}".replace("+", "p").replace("-", "m").replace(".", "_")
+
+
+def price_markets(matrices: np.ndarray,
+                  total_lines: Sequence[float] = (1.5, 2.5, 3.5),
+                  ah_lines: Sequence[float] = (-1.5, -1.0, -0.5, 0.0, 0.5),
+                  max_score: int = 3) -> pd.DataFrame:
+    """
+    One row per fixture with every market priced from the same score matrices.
+    Totals and Asian handicap columns are effective win probabilities
+    (see effective_win_prob), so they plug straight into edge / Kelly.
+    """
+    matrices = matrices / matrices.sum(axis=(1, 2), keepdims=True)
+    g = matrices.shape[1]
+    diff_dist, total_dist = goal_distributions(matrices)
+    diffs = np.arange(-(g - 1), g).astype(float)
+    totals = np.arange(2 * g - 1).astype(float)
+
+    cols = {}
+    p_home = diff_dist[:, diffs > 0].sum(axis=1)
+    p_draw = diff_dist[:, diffs == 0].sum(axis=1)
+    p_away = diff_dist[:, diffs < 0].sum(axis=1)
+    cols.update({"p_home": p_home, "p_draw": p_draw, "p_away": p_away})
+
+    dc = double_chance(matrices)
+    cols.update({"p_dc_1x": dc[:, 0], "p_dc_x2": dc[:, 1], "p_dc_12": dc[:, 2]})
+
+    p_btts = btts(matrices)
+    cols.update({"p_btts_yes": p_btts, "p_btts_no": 1.0 - p_btts})
+
+    for line in total_lines:
+        label = f"{line:g}".replace(".", "_")
+        cols[f"p_over_{label}"] = effective_win_prob(_settle(total_dist, totals, -float(line)))
+        cols[f"p_under_{label}"] = effective_win_prob(_settle(total_dist, -totals, float(line)))
+
+    for line in ah_lines:
+        cols[f"p_ah_home_{_line_label(line)}"] = effective_win_prob(_settle(diff_dist, diffs, float(line)))
+        cols[f"p_ah_away_{_line_label(-line)}"] = effective_win_prob(_settle(diff_dist, -diffs, -float(line)))
+
+    grid, other = correct_score(matrices, max_score)
+    for i in range(max_score + 1):
+        for j in range(max_score + 1):
+            cols[f"p_cs_{i}_{j}"] = grid[:, i, j]
+    cols["p_cs_other"] = other
+
+    return pd.DataFrame(cols)
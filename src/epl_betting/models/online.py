@@ -0,0 +1,230 @@
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from ..instrumentation import record_optimizer
+from .team_strength import TeamStrength, pack_strength, unpack_strength
+
+SCHEMA_VERSION = 3
+
+
+@dataclass
+class StrengthState:
+    """
+    Sufficient statistics of the time-decayed Poisson MLE
+    (fit_poisson_strength_model with time_decay_weights(kickoff_time, xi)).
+
+    The log-likelihood only depends on the data through the summed match
+    weight of every (home, away) pairing, each team's weighted goals for and
+    against, and the weighted home / total goals. Moving the decay reference
+    date forward scales all of them by the same factor, so folding in new
+    matches is O(new matches) and solving is O(teams^2) per iteration,
+    independent of the season length. The optimum equals a full refit on
+    every match seen.
+
+    teams are sorted as in team_index; pair_weight is [home][away]; seen
+    holds the match_ids already folded in; params is the last solution
+    (laid out as in pack_strength), used to warm-start the next one.
+    """
+    xi: float = 0.0
+    teams: List[str] = field(default_factory=list)
+    pair_weight: List[List[float]] = field(default_factory=list)
+    goals_for: List[float] = field(default_factory=list)
+    goals_against: List[float] = field(default_factory=list)
+    home_goals: float = 0.0
+    total_goals: float = 0.0
+    as_of: Optional[str] = None
+    seen: Set[str] = field(default_factory=set)
+    params: Optional[List[float]] = None
+    n_matches: int = 0
+    version: int = 0
+    schema_version: int = SCHEMA_VERSION
+
+
+def finished_matches(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Matches with a result: the rows the state and the full refit train on.
+    """
+    return df[df["home_goals"].notna() & df["away_goals"].notna()]
+
+
+def _add_teams(state: StrengthState, names) -> None:
+    """
+    Insert unseen teams, keeping state.teams sorted. Their statistics start
+    at 0 and their parameters at 0 (as pack_strength does).
+    """
+    new = sorted(set(names) - set(state.teams))
+    if not new:
+        return
+    old_params = unpack_strength(state.teams, np.asarray(state.params)) if state.params is not None else None
+    teams = sorted(state.teams + new)
+    pos = np.searchsorted(teams, state.teams)
+
+    pair = np.zeros((len(teams), len(teams)))
+    pair[np.ix_(pos, pos)] = np.asarray(state.pair_weight, dtype=float).reshape(len(pos), len(pos))
+    gf = np.zeros(len(teams))
+    ga = np.zeros(len(teams))
+    gf[pos] = state.goals_for
+    ga[pos] = state.goals_against
+
+    state.teams = teams
+    state.pair_weight = pair.tolist()
+    state.goals_for = gf.tolist()
+    state.goals_against = ga.tolist()
+    if old_params is not None:
+        state.params = pack_strength(old_params, teams).tolist()
+
+
+def update_state(state: StrengthState, matches: pd.DataFrame) -> int:
+    """
+    Fold finished matches whose match_id is not in state.seen into the
+    statistics, in O(new matches), whatever their kickoff (postponed
+    fixtures and late results included). Returns the number added and bumps
+    state.version when anything changed.
+    """
+    df = finished_matches(matches)
+    keys = df["match_id"].astype(str)
+    fresh = ~keys.isin(state.seen).to_numpy() & ~keys.duplicated().to_numpy()
+    df, keys = df[fresh], keys[fresh]
+    if df.empty:
+        return 0
+
+    _add_teams(state, pd.concat([df["home_team_name"], df["away_team_name"]]))
+    kickoff = pd.to_datetime(df["kickoff_time"]).to_numpy()
+    latest = kickoff.max()
+    pair = np.asarray(state.pair_weight, dtype=float).reshape(len(state.teams), len(state.teams))
+    gf = np.asarray(state.goals_for, dtype=float)
+    ga = np.asarray(state.goals_against, dtype=float)
+
+    # move the decay reference to the newest kickoff: every old weight shrinks alike
+    as_of = pd.Timestamp(state.as_of).to_datetime64() if state.as_of is not None else latest
+    if latest > as_of:
+        scale = np.exp(-state.xi * ((latest - as_of) / np.timedelta64(1, "D")))
+        pair *= scale
+        gf *= scale
+        ga *= scale
+        state.home_goals *= scale
+        state.total_goals *= scale
+        as_of = latest
+    w = np.exp(-state.xi * np.maximum((as_of - kickoff) / np.timedelta64(1, "D"), 0.0))
+
+    index = pd.Index(state.teams)
+    home = index.get_indexer(df["home_team_name"])
+    away = index.get_indexer(df["away_team_name"])
+    home_goals = df["home_goals"].to_numpy(dtype=float)
+    away_goals = df["away_goals"].to_numpy(dtype=float)
+    n = len(state.teams)
+    np.add.at(pair, (home, away), w)
+    gf += np.bincount(home, w * home_goals, n) + np.bincount(away, w * away_goals, n)
+    ga += np.bincount(home, w * away_goals, n) + np.bincount(away, w * home_goals, n)
+
+    state.pair_weight = pair.tolist()
+    state.goals_for = gf.tolist()
+    state.goals_against = ga.tolist()
+    state.home_goals += float((w * home_goals).sum())
+    state.total_goals += float((w * (home_goals + away_goals)).sum())
+    state.as_of = pd.Timestamp(as_of).isoformat()
+    state.seen.update(keys)
+    state.n_matches += len(df)
+    state.version += 1
+    return len(df)
+
+
+def state_nll(params: np.ndarray,
+              pair: np.ndarray,
+              goals_for: np.ndarray,
+              goals_against: np.ndarray,
+              home_goals: float,
+              total_goals: float):
+    """
+    poisson_nll (weighted, same penalty) and its gradient from the
+    sufficient statistics instead of the match rows.
+    """
+    n = len(goals_for)
+    attack = params[:n]
+    defence = params[n:2 * n]
+    home_adv = params[2 * n]
+    intercept = params[2 * n + 1]
+
+    a = np.exp(attack)
+    d = np.exp(-defence)
+    lam_home = pair * np.outer(a, d) * np.exp(intercept + home_adv)  # home team scores
+    lam_away = pair * np.outer(d, a) * np.exp(intercept)             # away team scores
+
+    sum_att = attack.sum()
+    sum_def = defence.sum()
+    linear = intercept * total_goals + home_adv * home_goals + attack @ goals_for - defence @ goals_against
+    value = lam_home.sum() + lam_away.sum() - linear + sum_att ** 2 + sum_def ** 2
+
+    grad = np.empty_like(params)
+    grad[:n] = lam_home.sum(axis=1) + lam_away.sum(axis=0) - goals_for + 2.0 * sum_att
+    grad[n:2 * n] = goals_against - lam_home.sum(axis=0) - lam_away.sum(axis=1) + 2.0 * sum_def
+    grad[2 * n] = lam_home.sum() - home_goals
+    grad[2 * n + 1] = lam_home.sum() + lam_away.sum() - total_goals
+    return value, grad
+
+
+def state_to_strength(state: StrengthState, init: Optional[TeamStrength] = None) -> TeamStrength:
+    """
+    Solve the MLE from the statistics, warm-started from state.params (or
+    init, e.g. the latest published model), and store the solution back in
+    state.params.
+    """
+    from scipy.optimize import minimize
+
+    n = len(state.teams)
+    if state.params is not None:
+        x0 = np.asarray(state.params, dtype=float)
+    elif init is not None:
+        x0 = pack_strength(init, state.teams)
+    else:
+        x0 = np.zeros(2 * n + 2)
+        x0[2 * n + 1] = np.log(state.total_goals / (2 * np.asarray(state.pair_weight).sum()) + 1e-8)
+
+    result = minimize(
+        state_nll,
+        x0,
+        args=(
+            np.asarray(state.pair_weight, dtype=float).reshape(n, n),
+            np.asarray(state.goals_for, dtype=float),
+            np.asarray(state.goals_against, dtype=float),
+            state.home_goals,
+            state.total_goals,
+        ),
+        jac=True,
+        method="L-BFGS-B",
+    )
+    record_optimizer("poisson_mle_state", result)
+    state.params = result.x.tolist()
+    return unpack_strength(state.teams, result.x)
+
+
+def save_state(state: StrengthState, path: Path) -> None:
+    """
+    Write the state as JSON (written to a temp file first, then swapped in).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = asdict(state)
+    data["seen"] = sorted(state.seen)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(data))
+    tmp.replace(path)
+
+
+def load_state(path: Path) -> StrengthState:
+    """
+    Load a state written by save_state.
+    """
+    data = json.loads(Path(path).read_text())
+    if data.get("schema_version") != SCHEMA_VERSION:
+        raise ValueError(
+            f"Unsupported strength state schema {data.get('schema_version')} "
+            f"(expected {SCHEMA_VERSION}); rebuild it with scripts/update_results.py --rebuild"
+        )
+    data["seen"] = set(data["seen"])
+    return StrengthState(**data)
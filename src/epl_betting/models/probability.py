@@ -1,44 +1,132 @@
 import numpy as np
-from typing import Dict
-from .team_strength import TeamStrength, expected_goals
-import math
-
-def _poisson_pmf(lam, max_goals=10):
-    return [
-        np.exp(-lam) * (lam ** k) / math.factorial(k)
-        for k in range(max_goals + 1)
-    ]
-def outcome_probs(strength: TeamStrength,
-                  home_team: str,
-                  away_team: str,
-                  max_goals: int = 10) -> Dict[str, float]:
+from typing import Dict, Sequence, Tuple, Union
+from .team_strength import TeamStrength, expected_goals_batch
+
+
+def poisson_pmf(lam, max_goals: int = 10) -> np.ndarray:
+    """
+    Poisson pmf for 0..max_goals goals, shape (N, max_goals + 1).
+    Built with the recurrence p(k) = p(k-1) * lam / k, so no factorials.
+    """
+    lam = np.atleast_1d(np.asarray(lam, dtype=float))
+    k = np.arange(1, max_goals + 1)
+    ratios = lam[:, None] / k[None, :]
+    pmf = np.empty((lam.shape[0], max_goals + 1))
+    pmf[:, 0] = np.exp(-lam)
+    pmf[:, 1:] = pmf[:, :1] * np.cumprod(ratios, axis=1)
+    return pmf
+
+
+def dixon_coles_tau(lam_home, lam_away, rho: float) -> np.ndarray:
+    """
+    Dixon-Coles correction factors for the 0/1-goal block, shape (N, 2, 2):
+    tau(0,0) = 1 - lam_h * lam_a * rho, tau(0,1) = 1 + lam_h * rho,
+    tau(1,0) = 1 + lam_a * rho,         tau(1,1) = 1 - rho.
+    """
+    lam_home = np.atleast_1d(np.asarray(lam_home, dtype=float))
+    lam_away = np.atleast_1d(np.asarray(lam_away, dtype=float))
+    tau = np.empty((lam_home.shape[0], 2, 2))
+    tau[:, 0, 0] = 1.0 - lam_home * lam_away * rho
+    tau[:, 0, 1] = 1.0 + lam_home * rho
+    tau[:, 1, 0] = 1.0 + lam_away * rho
+    tau[:, 1, 1] = 1.0 - rho
+    return tau
+
+
+def score_matrices(lam_home,
+                   lam_away,
+                   max_goals: int = 10,
+                   rho: float = 0.0,
+                   lambda3: float = 0.0) -> np.ndarray:
+    """
+    Score matrices, shape (N, G, G) with G = max_goals + 1.
+    Entry [n, i, j] is P(home scores i, away scores j) for fixture n.
+
+    Independent Poisson by default. lambda3 > 0 gives a bivariate Poisson
+    (home = A + C, away = B + C with C ~ Poisson(lambda3)); rho != 0 applies
+    the Dixon-Coles correction to the 2x2 low-score block.
+    """
+    p_h = poisson_pmf(lam_home, max_goals)
+    p_a = poisson_pmf(lam_away, max_goals)
+    matrices = p_h[:, :, None] * p_a[:, None, :]
+
+    if lambda3 > 0:
+        # P(i, j) = sum_k P_A(i - k) P_B(j - k) P_C(k): shift the independent
+        # matrix down the diagonal once per shared-goal count k
+        p_c = poisson_pmf(lambda3, max_goals)[0]
+        independent = matrices
+        matrices = p_c[0] * independent
+        for k in range(1, max_goals + 1):
+            if p_c[k] < 1e-12:
+                break
+            matrices[:, k:, k:] += p_c[k] * independent[:, :-k, :-k]
+
+    if rho != 0.0:
+        matrices[:, :2, :2] *= dixon_coles_tau(lam_home, lam_away, rho)
+
+    return matrices
+
+
+def matrix_outcome_probs(matrices: np.ndarray) -> np.ndarray:
     """
-    Return model probabilities for home win / draw / away win
-    using independent Poisson goals.
+    Reduce (N, G, G) score matrices to normalised (N, 3) home/draw/away probabilities.
     """
-    lam_home, lam_away = expected_goals(strength, home_team, away_team)
+    p_home = np.tril(matrices, -1).sum(axis=(1, 2))
+    p_draw = np.einsum("nii->n", matrices)
+    p_away = np.triu(matrices, 1).sum(axis=(1, 2))
+    probs = np.stack([p_home, p_draw, p_away], axis=1)
+    # For sanity, normalise (mass beyond max_goals is dropped)
+    return probs / probs.sum(axis=1, keepdims=True)
 
-    p_home = 0.0
-    p_draw = 0.0
-    p_away = 0.0
 
-    p_h = _poisson_pmf(lam_home, max_goals)
-    p_a = _poisson_pmf(lam_away, max_goals)
+def outcome_probs_from_lambdas(lam_home,
+                               lam_away,
+                               max_goals: int = 10,
+                               return_matrices: bool = False,
+                               rho: float = 0.0,
+                               lambda3: float = 0.0
+                               ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Batch H/D/A probabilities for arrays of expected goals.
+    Returns an (N, 3) array, plus the (N, G, G) score matrices if requested.
+    """
+    matrices = score_matrices(lam_home, lam_away, max_goals, rho=rho, lambda3=lambda3)
+    probs = matrix_outcome_probs(matrices)
+    if return_matrices:
+        return probs, matrices
+    return probs
 
-    for i, p_hi in enumerate(p_h):
-        for j, p_aj in enumerate(p_a):
-            p = p_hi * p_aj
-            if i > j:
-                p_home += p
-            elif i == j:
-                p_draw += p
-            else:
-                p_away += p
 
-    # For sanity, normalise (tiny numerical error fix)
-    s = p_home + p_draw + p_away
+def outcome_probs_batch(strength: TeamStrength,
+                        home_teams: Sequence,
+                        away_teams: Sequence,
+                        max_goals: int = 10,
+                        return_matrices: bool = False
+                        ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Batch H/D/A probabilities for many fixtures in one NumPy pass.
+    home_teams / away_teams are team names or integer team indices.
+    Uses the strength's Dixon-Coles rho / bivariate lambda3 when set.
+    """
+    lam_home, lam_away = expected_goals_batch(strength, home_teams, away_teams)
+    return outcome_probs_from_lambdas(
+        lam_home, lam_away, max_goals, return_matrices,
+        rho=strength.rho, lambda3=strength.lambda3,
+    )
+
+
+def outcome_probs(strength: TeamStrength,
+                  home_team: str,
+                  away_team: str,
+                  max_goals: int = 10) -> Dict[str, float]:
+    """
+    Return model probabilities for home win / draw / away win from the
+    strength's score model (independent Poisson unless it carries a
+    Dixon-Coles rho or a bivariate lambda3).
+    """
+    probs = outcome_probs_batch(strength, [home_team], [away_team], max_goals)[0]
     return {
-        "p_home_model": p_home / s,
-        "p_draw_model": p_draw / s,
-        "p_away_model": p_away / s,
-    }
\ No newline at end of file
+        "p_home_model": float(probs[0]),
+        "p_draw_model": float(probs[1]),
+        "p_away_model": float(probs[2]),
+    }
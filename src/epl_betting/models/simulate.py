@@ -1,23 +1,29 @@
-from typing import Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence
 
 import numpy as np
+import pandas as pd
 
-from .team_strength import TeamStrength, expected_goals
+from .team_strength import TeamStrength, expected_goals, expected_goals_batch, team_index
 from ..config import N_SIMULATIONS
 
 
 def simulate_match(strength: TeamStrength,
                    home_team: str,
                    away_team: str,
-                   n_simulations: int = N_SIMULATIONS) -> Dict[str, float]:
+                   n_simulations: int = N_SIMULATIONS,
+                   rng: Optional[np.random.Generator] = None) -> Dict[str, float]:
     """
     Simulate a match using a Poisson model for home/away goals.
     Returns model probabilities for home/draw/away and lambdas.
     """
+    if rng is None:
+        rng = np.random.default_rng()
+
     lam_home, lam_away = expected_goals(strength, home_team, away_team)
 
-    home_goals = np.random.poisson(lam_home, size=n_simulations)
-    away_goals = np.random.poisson(lam_away, size=n_simulations)
+    home_goals = rng.poisson(lam_home, size=n_simulations)
+    away_goals = rng.poisson(lam_away, size=n_simulations)
 
     home_wins = (home_goals > away_goals).mean()
     draws = (home_goals == away_goals).mean()
@@ -30,3 +36,130 @@ def simulate_match(strength: TeamStrength,
         "lambda_home": lam_home,
         "lambda_away": lam_away,
     }
+
+
+def remaining_fixtures(played: pd.DataFrame, teams: Sequence[str]) -> pd.DataFrame:
+    """
+    Every (home, away) pairing of a double round robin that is not in `played`.
+    """
+    teams = list(teams)
+    home, away = np.meshgrid(teams, teams, indexing="ij")
+    mask = home != away
+    fixtures = pd.DataFrame({"home_team_name": home[mask], "away_team_name": away[mask]})
+    done = played[["home_team_name", "away_team_name"]].drop_duplicates()
+    merged = fixtures.merge(done, how="left", indicator=True)
+    return merged.loc[merged["_merge"] == "left_only", ["home_team_name", "away_team_name"]].reset_index(drop=True)
+
+
+def _simulate_chunk(args) -> Dict[str, np.ndarray]:
+    """
+    Simulate one chunk of seasons. Returns per-team position counts and
+    summed points, so chunks can be combined by addition.
+    """
+    (seed, n_sims, lam_home, lam_away, home_idx, away_idx,
+     base_points, base_gd, base_gf) = args
+    rng = np.random.default_rng(seed)
+    n_teams = base_points.shape[0]
+    n_fixtures = lam_home.shape[0]
+
+    # One-hot (fixtures x teams) maps, so per-team totals are a matrix product
+    home_map = np.zeros((n_fixtures, n_teams))
+    away_map = np.zeros((n_fixtures, n_teams))
+    home_map[np.arange(n_fixtures), home_idx] = 1.0
+    away_map[np.arange(n_fixtures), away_idx] = 1.0
+
+    hg = rng.poisson(lam_home, size=(n_sims, n_fixtures))
+    ag = rng.poisson(lam_away, size=(n_sims, n_fixtures))
+
+    home_pts = 3.0 * (hg > ag) + (hg == ag)
+    away_pts = 3.0 * (ag > hg) + (hg == ag)
+    diff = hg - ag
+
+    points = base_points + home_pts @ home_map + away_pts @ away_map
+    gd = base_gd + diff @ home_map - diff @ away_map
+    gf = base_gf + hg @ home_map + ag @ away_map
+
+    # Rank by points, goal difference, goals scored, then a random draw.
+    # lexsort uses the last key as primary, negated for descending order.
+    coin = rng.random((n_sims, n_teams))
+    order = np.lexsort((coin, -gf, -gd, -points), axis=-1)
+    positions = np.empty_like(order)
+    positions[np.arange(n_sims)[:, None], order] = np.arange(n_teams)
+
+    flat = (np.arange(n_teams)[None, :] * n_teams + positions).ravel()
+    counts = np.bincount(flat, minlength=n_teams * n_teams).reshape(n_teams, n_teams)
+
+    return {"position_counts": counts, "points_sum": points.sum(axis=0)}
+
+
+def simulate_season(strength: TeamStrength,
+                    played: pd.DataFrame,
+                    remaining: Optional[pd.DataFrame] = None,
+                    n_simulations: int = N_SIMULATIONS,
+                    seed: Optional[int] = None,
+                    chunk_size: int = 5000,
+                    n_workers: int = 1,
+                    n_top: int = 4,
+                    n_relegated: int = 3) -> pd.DataFrame:
+    """
+    Monte Carlo the rest of the season and return league-table probabilities.
+
+    played must contain home_team_name, away_team_name, home_goals, away_goals.
+    remaining defaults to every double-round-robin fixture not yet played.
+    Seasons are simulated in chunks of `chunk_size`, each with its own child of
+    SeedSequence(seed), so results depend only on `seed` and `chunk_size`,
+    not on `n_workers`.
+    """
+    teams = sorted(set(strength.attack) | set(played["home_team_name"]) | set(played["away_team_name"]))
+    n_teams = len(teams)
+
+    if remaining is None:
+        remaining = remaining_fixtures(played, teams)
+
+    # Points / GD / GF already banked
+    _, p_home, p_away = team_index(played, teams)
+    hg = played["home_goals"].to_numpy(dtype=float)
+    ag = played["away_goals"].to_numpy(dtype=float)
+    home_pts = 3.0 * (hg > ag) + (hg == ag)
+    away_pts = 3.0 * (ag > hg) + (hg == ag)
+    base_points = (np.bincount(p_home, home_pts, minlength=n_teams) +
+                   np.bincount(p_away, away_pts, minlength=n_teams))
+    base_gd = (np.bincount(p_home, hg - ag, minlength=n_teams) +
+               np.bincount(p_away, ag - hg, minlength=n_teams))
+    base_gf = (np.bincount(p_home, hg, minlength=n_teams) +
+               np.bincount(p_away, ag, minlength=n_teams))
+
+    _, r_home, r_away = team_index(remaining, teams)
+    lam_home, lam_away = expected_goals_batch(
+        strength, remaining["home_team_name"], remaining["away_team_name"]
+    )
+
+    sizes = [chunk_size] * (n_simulations // chunk_size)
+    if n_simulations % chunk_size:
+        sizes.append(n_simulations % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [
+        (s, n, lam_home, lam_away, r_home, r_away, base_points, base_gd, base_gf)
+        for s, n in zip(seeds, sizes)
+    ]
+
+    if n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            chunks = list(pool.map(_simulate_chunk, tasks))
+    else:
+        chunks = [_simulate_chunk(t) for t in tasks]
+
+    counts = sum(c["position_counts"] for c in chunks)
+    points_sum = sum(c["points_sum"] for c in chunks)
+    position_probs = counts / n_simulations
+
+    table = pd.DataFrame({
+        "team": teams,
+        "current_points": base_points,
+        "exp_points": points_sum / n_simulations,
+        "exp_position": position_probs @ np.arange(1, n_teams + 1),
+        "p_title": position_probs[:, 0],
+        f"p_top{n_top}": position_probs[:, :n_top].sum(axis=1),
+        "p_relegation": position_probs[:, n_teams - n_relegated:].sum(axis=1),
+    })
+    return table.sort_values("exp_position").reset_index(drop=True)
@@ -1,8 +1,10 @@
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import numpy as np
 import pandas as pd
 
+from ..instrumentation import record_optimizer, timed
+
 
 @dataclass
 class TeamStrength:
@@ -10,9 +12,28 @@ class TeamStrength:
     defence: Dict[str, float]
     home_advantage: float
     intercept: float
+    # Dixon-Coles low-score dependence (0 = independent Poisson)
+    rho: float = 0.0
+    # Bivariate-Poisson shared goal rate (0 = independent Poisson)
+    lambda3: float = 0.0
+
+    def fixture_tensor(self, cache_dir=None, max_goals: int = 10):
+        """
+        Cached (teams x teams x markets) pricing tensor, see models.fixture_tensor.
+        """
+        from .fixture_tensor import fixture_tensor
+        return fixture_tensor(self, cache_dir=cache_dir, max_goals=max_goals)
 
 
-def fit_team_strength_model(df: pd.DataFrame, use_xg: bool = True) -> TeamStrength:
+@timed()
+def fit_team_strength_model(df: pd.DataFrame,
+                            use_xg: bool = True,
+                            weights: Optional[np.ndarray] = None) -> TeamStrength:
+    """
+    Ratio model: attack / defence from each team's goals (or xG) per game
+    relative to the league average. `weights` (e.g. time_decay_weights)
+    turns every total and average into a weighted one.
+    """
     # Pick xG if available, fallback to actual goals
     if use_xg and "home_xg" in df.columns and "away_xg" in df.columns:
         home_for = df["home_xg"]
@@ -25,32 +46,35 @@ def fit_team_strength_model(df: pd.DataFrame, use_xg: bool = True) -> TeamStreng
         away_for = df["away_goals"]
         away_ag = df["home_goals"]
 
-    teams = sorted(set(df["home_team_name"]).union(df["away_team_name"]))
+    teams, home_idx, away_idx = team_index(df)
+    n = len(teams)
+    w = np.ones(len(df)) if weights is None else np.asarray(weights, dtype=float)
 
-    league_avg = (home_for.sum() + away_for.sum()) / (len(df) * 2)
+    # NaN counts as 0 in the totals (as in Series.sum) and is skipped in the means
+    home_seen = home_for.notna().to_numpy()
+    away_seen = away_for.notna().to_numpy()
+    home_for = home_for.fillna(0.0).to_numpy(dtype=float)
+    home_ag = home_ag.fillna(0.0).to_numpy(dtype=float)
+    away_for = away_for.fillna(0.0).to_numpy(dtype=float)
+    away_ag = away_ag.fillna(0.0).to_numpy(dtype=float)
 
-    avg_home_goals = home_for.mean()
-    avg_away_goals = away_for.mean()
+    league_avg = ((w * home_for).sum() + (w * away_for).sum()) / (w.sum() * 2)
+
+    avg_home_goals = (w * home_for).sum() / w[home_seen].sum()
+    avg_away_goals = (w * away_for).sum() / w[away_seen].sum()
     home_advantage = np.log((avg_home_goals + 1e-8) / (avg_away_goals + 1e-8))
 
+    # per-team totals in one pass over integer team indices
+    gf = np.bincount(home_idx, w * home_for, n) + np.bincount(away_idx, w * away_for, n)
+    ga = np.bincount(away_idx, w * home_ag, n) + np.bincount(home_idx, w * away_ag, n)
+    n_games = np.bincount(home_idx, w, n) + np.bincount(away_idx, w, n)
+
     attack = {}
     defence = {}
 
-    for team in teams:
-        home_mask = df["home_team_name"] == team
-        away_mask = df["away_team_name"] == team
-
-        gf = home_for[home_mask].sum() + away_for[away_mask].sum()
-        ga = home_ag[away_mask].sum() + away_ag[home_mask].sum()
-        n_games = home_mask.sum() + away_mask.sum()
-
-        if n_games == 0:
-            attack[team] = 0
-            defence[team] = 0
-            continue
-
-        gf_pg = gf / n_games
-        ga_pg = ga / n_games
+    for i, team in enumerate(teams):
+        gf_pg = gf[i] / n_games[i]
+        ga_pg = ga[i] / n_games[i]
 
         attack[team] = np.log((gf_pg + 1e-8) / (league_avg + 1e-8))
         defence[team] = np.log((league_avg + 1e-8) / (ga_pg + 1e-8))
@@ -63,6 +87,212 @@ def fit_team_strength_model(df: pd.DataFrame, use_xg: bool = True) -> TeamStreng
     )
 
 
+def time_decay_weights(dates, xi: float, as_of=None) -> np.ndarray:
+    """
+    Dixon-Coles time weights exp(-xi * days between the match and as_of)
+    (as_of defaults to the latest date; later matches get weight 1).
+    xi is per day: 0 weights every match equally, 0.0065 halves a match's
+    weight in about 107 days.
+    """
+    dates = pd.to_datetime(pd.Series(dates)).to_numpy()
+    as_of = dates.max() if as_of is None else pd.Timestamp(as_of).to_datetime64()
+    days = (as_of - dates) / np.timedelta64(1, "D")
+    return np.exp(-xi * np.maximum(days, 0.0))
+
+
+def team_index(df: pd.DataFrame,
+               teams: Optional[Sequence[str]] = None) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Map home/away team names to dense integer indices.
+    Returns (teams, home_idx, away_idx).
+    """
+    if teams is None:
+        teams = sorted(set(df["home_team_name"]).union(df["away_team_name"]))
+    teams = list(teams)
+    index = pd.Index(teams)
+    home_idx = index.get_indexer(df["home_team_name"])
+    away_idx = index.get_indexer(df["away_team_name"])
+    if (home_idx < 0).any() or (away_idx < 0).any():
+        unknown = set(df["home_team_name"].to_numpy()[home_idx < 0]) | set(df["away_team_name"].to_numpy()[away_idx < 0])
+        raise ValueError(f"Unknown teams: {sorted(unknown)}")
+    return teams, home_idx.astype(np.int64), away_idx.astype(np.int64)
+
+
+def pack_strength(strength: TeamStrength, teams: Sequence[str]) -> np.ndarray:
+    """
+    Flatten a TeamStrength into [attack..., defence..., home_advantage, intercept].
+    Teams missing from the strength start at 0.
+    """
+    return np.concatenate([
+        np.array([strength.attack.get(t, 0.0) for t in teams], dtype=float),
+        np.array([strength.defence.get(t, 0.0) for t in teams], dtype=float),
+        np.array([strength.home_advantage, strength.intercept], dtype=float),
+    ])
+
+
+def unpack_strength(teams: Sequence[str], params: np.ndarray) -> TeamStrength:
+    """
+    Inverse of pack_strength.
+    """
+    n = len(teams)
+    return TeamStrength(
+        attack={t: float(params[i]) for i, t in enumerate(teams)},
+        defence={t: float(params[n + i]) for i, t in enumerate(teams)},
+        home_advantage=float(params[2 * n]),
+        intercept=float(params[2 * n + 1]),
+    )
+
+
+def params_expected_goals(params: np.ndarray,
+                          home_idx: np.ndarray,
+                          away_idx: np.ndarray,
+                          n_teams: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Expected goals straight from a packed parameter vector (see pack_strength).
+    """
+    attack = params[:n_teams]
+    defence = params[n_teams:2 * n_teams]
+    home_adv = params[2 * n_teams]
+    intercept = params[2 * n_teams + 1]
+    lam_home = np.exp(intercept + home_adv + attack[home_idx] - defence[away_idx])
+    lam_away = np.exp(intercept + attack[away_idx] - defence[home_idx])
+    return lam_home, lam_away
+
+
+def poisson_nll(params: np.ndarray,
+                home_idx: np.ndarray,
+                away_idx: np.ndarray,
+                home_goals: np.ndarray,
+                away_goals: np.ndarray,
+                n_teams: int,
+                weights: Optional[np.ndarray] = None) -> Tuple[float, np.ndarray]:
+    """
+    Negative log-likelihood of the Poisson attack/defence model and its exact gradient:
+    log(lam_home) = intercept + home_advantage + attack_home - defence_away
+    log(lam_away) = intercept + attack_away - defence_home
+
+    A quadratic penalty on sum(attack) and sum(defence) pins the two directions the
+    likelihood is flat in, so the optimum has both sums at zero.
+    The factorial term is dropped since it does not depend on the parameters.
+    """
+    attack = params[:n_teams]
+    defence = params[n_teams:2 * n_teams]
+    home_adv = params[2 * n_teams]
+    intercept = params[2 * n_teams + 1]
+
+    eta_home = intercept + home_adv + attack[home_idx] - defence[away_idx]
+    eta_away = intercept + attack[away_idx] - defence[home_idx]
+    lam_home = np.exp(eta_home)
+    lam_away = np.exp(eta_away)
+
+    ll_home = home_goals * eta_home - lam_home
+    ll_away = away_goals * eta_away - lam_away
+    r_home = lam_home - home_goals
+    r_away = lam_away - away_goals
+    if weights is not None:
+        ll_home = weights * ll_home
+        ll_away = weights * ll_away
+        r_home = weights * r_home
+        r_away = weights * r_away
+
+    sum_att = attack.sum()
+    sum_def = defence.sum()
+    value = -(ll_home.sum() + ll_away.sum()) + sum_att ** 2 + sum_def ** 2
+
+    grad = np.empty_like(params)
+    grad[:2 * n_teams + 2] = eta_grad_to_params(r_home, r_away, home_idx, away_idx, n_teams)
+    grad[:n_teams] += 2.0 * sum_att
+    grad[n_teams:2 * n_teams] += 2.0 * sum_def
+
+    return value, grad
+
+
+def eta_grad_to_params(g_home: np.ndarray,
+                       g_away: np.ndarray,
+                       home_idx: np.ndarray,
+                       away_idx: np.ndarray,
+                       n_teams: int) -> np.ndarray:
+    """
+    Chain per-match gradients w.r.t. log(lam_home) / log(lam_away) back to the
+    packed parameters (attack, defence, home_advantage, intercept).
+    """
+    grad = np.empty(2 * n_teams + 2)
+    grad[:n_teams] = (
+        np.bincount(home_idx, g_home, minlength=n_teams) +
+        np.bincount(away_idx, g_away, minlength=n_teams)
+    )
+    grad[n_teams:2 * n_teams] = -(
+        np.bincount(away_idx, g_home, minlength=n_teams) +
+        np.bincount(home_idx, g_away, minlength=n_teams)
+    )
+    grad[2 * n_teams] = g_home.sum()
+    grad[2 * n_teams + 1] = g_home.sum() + g_away.sum()
+    return grad
+
+
+def fit_poisson_arrays(home_idx: np.ndarray,
+                       away_idx: np.ndarray,
+                       home_goals: np.ndarray,
+                       away_goals: np.ndarray,
+                       n_teams: int,
+                       weights: Optional[np.ndarray] = None,
+                       x0: Optional[np.ndarray] = None):
+    """
+    Maximum likelihood fit on pre-indexed arrays. Returns the scipy OptimizeResult;
+    result.x is laid out as in pack_strength.
+    """
+    from scipy.optimize import minimize
+
+    home_goals = np.asarray(home_goals, dtype=float)
+    away_goals = np.asarray(away_goals, dtype=float)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)
+
+    if x0 is None:
+        mean_goals = (home_goals.mean() + away_goals.mean()) / 2.0
+        x0 = np.zeros(2 * n_teams + 2)
+        x0[2 * n_teams + 1] = np.log(mean_goals + 1e-8)
+
+    result = minimize(
+        poisson_nll,
+        x0,
+        args=(home_idx, away_idx, home_goals, away_goals, n_teams, weights),
+        jac=True,
+        method="L-BFGS-B",
+    )
+    record_optimizer("poisson_mle", result)
+    return result
+
+
+def fit_poisson_strength_model(df: pd.DataFrame,
+                               use_xg: bool = False,
+                               weights: Optional[np.ndarray] = None,
+                               init: Optional[TeamStrength] = None) -> TeamStrength:
+    """
+    Fit attack/defence/home advantage by Poisson maximum likelihood.
+
+    df must contain:
+      home_team_name, away_team_name, home_goals, away_goals
+    (or home_xg/away_xg when use_xg=True). `init` warm-starts the optimiser
+    from a previous fit.
+    """
+    if use_xg and "home_xg" in df.columns and "away_xg" in df.columns:
+        home_goals = df["home_xg"].to_numpy(dtype=float)
+        away_goals = df["away_xg"].to_numpy(dtype=float)
+    else:
+        home_goals = df["home_goals"].to_numpy(dtype=float)
+        away_goals = df["away_goals"].to_numpy(dtype=float)
+
+    teams, home_idx, away_idx = team_index(df)
+    x0 = pack_strength(init, teams) if init is not None else None
+
+    result = fit_poisson_arrays(
+        home_idx, away_idx, home_goals, away_goals, len(teams),
+        weights=weights, x0=x0,
+    )
+    return unpack_strength(teams, result.x)
+
+
 def expected_goals(strength: TeamStrength, home: str, away: str) -> Tuple[float, float]:
     lam_home = np.exp(
         strength.intercept +
@@ -76,3 +306,37 @@ def expected_goals(strength: TeamStrength, home: str, away: str) -> Tuple[float,
         strength.defence[home]
     )
     return lam_home, lam_away
+
+
+def strength_arrays(strength: TeamStrength) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Return (teams, attack, defence) with attack/defence as arrays in team order.
+    """
+    teams = list(strength.attack)
+    attack = np.array([strength.attack[t] for t in teams], dtype=float)
+    defence = np.array([strength.defence[t] for t in teams], dtype=float)
+    return teams, attack, defence
+
+
+def expected_goals_batch(strength: TeamStrength,
+                         home: Sequence,
+                         away: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorised expected_goals. `home` / `away` are either team names or integer
+    indices into the strength's team order (see strength_arrays).
+    """
+    teams, attack, defence = strength_arrays(strength)
+    home = np.asarray(home)
+    away = np.asarray(away)
+    if not np.issubdtype(home.dtype, np.integer):
+        index = pd.Index(teams)
+        home_names, away_names = home, away
+        home = index.get_indexer(home_names)
+        away = index.get_indexer(away_names)
+        if (home < 0).any() or (away < 0).any():
+            unknown = set(home_names[home < 0]) | set(away_names[away < 0])
+            raise KeyError(f"Unknown teams: {sorted(unknown)}")
+
+    lam_home = np.exp(strength.intercept + attack[home] - defence[away] + strength.home_advantage)
+    lam_away = np.exp(strength.intercept + attack[away] - defence[home])
+    return lam_home, lam_away
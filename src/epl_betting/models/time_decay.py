@@ -0,0 +1,182 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .team_strength import fit_poisson_arrays, params_expected_goals, team_index
+
+# Decay rates (per day) tried by search_time_decay; Dixon & Coles (1997) found 0.0065
+DECAY_GRID = np.array([0.0, 0.001, 0.002, 0.003, 0.004, 0.005, 0.0065, 0.008, 0.01, 0.0125, 0.015, 0.02])
+
+
+@dataclass
+class DecayProblem:
+    """
+    Walk-forward arrays shared by every decay rate, built once by
+    decay_problem. Matches are sorted by kickoff; round k trains on the
+    first rounds[k][0] matches (weighted as of the round's first kickoff,
+    rounds[k][1], in days) and scores the matches at rounds[k][2].
+    """
+    teams: List[str]
+    home_idx: np.ndarray
+    away_idx: np.ndarray
+    fit_home: np.ndarray
+    fit_away: np.ndarray
+    goals_home: np.ndarray
+    goals_away: np.ndarray
+    days: np.ndarray
+    rounds: List[Tuple[int, float, np.ndarray]]
+
+    @property
+    def n_teams(self) -> int:
+        return len(self.teams)
+
+
+def decay_problem(df: pd.DataFrame,
+                  min_train_matches: int = 30,
+                  use_xg: bool = False) -> DecayProblem:
+    """
+    Index a match table for search_time_decay. Rounds are gameweeks (or
+    kickoff dates without a gameweek column), as in walk_forward_backtest;
+    rounds with fewer than min_train_matches earlier matches, or with a team
+    that has not yet scored or conceded, are skipped.
+    The model is fit on xG when use_xg, but always scored on goals.
+    """
+    time_col = "kickoff_time" if "kickoff_time" in df.columns else "date"
+    df = df[df["home_goals"].notna() & df["away_goals"].notna()].copy()
+    df["_kickoff"] = pd.to_datetime(df[time_col])
+    df = df.sort_values("_kickoff", kind="stable").reset_index(drop=True)
+
+    teams, home_idx, away_idx = team_index(df)
+    goals_home = df["home_goals"].to_numpy(dtype=float)
+    goals_away = df["away_goals"].to_numpy(dtype=float)
+    if use_xg and "home_xg" in df.columns and "away_xg" in df.columns:
+        fit_home = df["home_xg"].to_numpy(dtype=float)
+        fit_away = df["away_xg"].to_numpy(dtype=float)
+    else:
+        fit_home, fit_away = goals_home, goals_away
+
+    kickoff = df["_kickoff"].to_numpy()
+    days = (kickoff - kickoff[0]) / np.timedelta64(1, "D")
+    groups = df["gameweek"].to_numpy() if "gameweek" in df.columns else df["_kickoff"].dt.date.to_numpy()
+
+    n_teams = len(teams)
+    rounds = []
+    for gw in pd.unique(groups):
+        rows = np.flatnonzero(groups == gw)
+        first = kickoff[rows].min()
+        n_train = int(np.searchsorted(kickoff, first, side="left"))
+        if n_train < min_train_matches:
+            continue
+        # a team that has not yet scored (or conceded) has no finite MLE, so its
+        # fitted strength is wherever the optimiser stopped; leave such rounds out
+        h, a = home_idx[:n_train], away_idx[:n_train]
+        scored = np.bincount(h, fit_home[:n_train], n_teams) + np.bincount(a, fit_away[:n_train], n_teams)
+        conceded = np.bincount(a, fit_home[:n_train], n_teams) + np.bincount(h, fit_away[:n_train], n_teams)
+        playing = np.concatenate([home_idx[rows], away_idx[rows]])
+        if (scored[playing] > 0).all() and (conceded[playing] > 0).all():
+            rounds.append((n_train, float(days[rows].min()), rows))
+
+    return DecayProblem(teams, home_idx, away_idx, fit_home, fit_away, goals_home, goals_away, days, rounds)
+
+
+def poisson_log_likelihood(params: np.ndarray,
+                           home_idx: np.ndarray,
+                           away_idx: np.ndarray,
+                           home_goals: np.ndarray,
+                           away_goals: np.ndarray,
+                           n_teams: int) -> np.ndarray:
+    """
+    Per-match log-probability of the observed score under independent
+    Poisson goals with the packed parameters (see pack_strength).
+    """
+    from scipy.special import gammaln
+
+    lam_home, lam_away = params_expected_goals(params, home_idx, away_idx, n_teams)
+    return (
+        home_goals * np.log(lam_home) - lam_home - gammaln(home_goals + 1.0) +
+        away_goals * np.log(lam_away) - lam_away - gammaln(away_goals + 1.0)
+    )
+
+
+def _score_decay_rates(problem: DecayProblem, xis: Sequence[float]) -> List[Dict[str, float]]:
+    """
+    Walk forward once per decay rate in xis. Each round's fit is warm-started
+    from the previous rate's solution for the same round (from the previous
+    round for the first rate), so neighbouring rates take a few iterations.
+    """
+    n_teams = problem.n_teams
+    previous: List[Optional[np.ndarray]] = [None] * len(problem.rounds)
+    results = []
+    for xi in xis:
+        t = time.perf_counter()
+        total, n_scored, n_iterations = 0.0, 0, 0
+        x = None
+        for k, (n_train, now, rows) in enumerate(problem.rounds):
+            weights = np.exp(-xi * (now - problem.days[:n_train])) if xi > 0 else None
+            fit = fit_poisson_arrays(
+                problem.home_idx[:n_train], problem.away_idx[:n_train],
+                problem.fit_home[:n_train], problem.fit_away[:n_train],
+                n_teams, weights=weights, x0=previous[k] if previous[k] is not None else x,
+            )
+            x = previous[k] = fit.x
+            n_iterations += fit.nit
+
+            ll = poisson_log_likelihood(
+                x, problem.home_idx[rows], problem.away_idx[rows],
+                problem.goals_home[rows], problem.goals_away[rows], n_teams,
+            )
+            total += ll.sum()
+            n_scored += len(rows)
+        results.append({
+            "xi": float(xi),
+            "log_likelihood": total,
+            "mean_log_likelihood": total / n_scored if n_scored else np.nan,
+            "n_scored": n_scored,
+            "n_refits": len(problem.rounds),
+            "n_iterations": n_iterations,
+            "seconds": time.perf_counter() - t,
+        })
+    return results
+
+
+def _score_block(task):
+    return _score_decay_rates(*task)
+
+
+def search_time_decay(df: pd.DataFrame,
+                      xis: Sequence[float] = DECAY_GRID,
+                      min_train_matches: int = 30,
+                      use_xg: bool = False,
+                      n_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Out-of-sample predictive log-likelihood of the time-weighted Poisson
+    model for each decay rate: before every round the model is refit on the
+    earlier matches with weights exp(-xi * age in days) and that round's
+    scores are evaluated. The sorted grid is split into contiguous blocks,
+    one per worker process (n_workers defaults to the CPU count, 1 runs
+    in-process). Returns one row per xi; best is True for the highest
+    log-likelihood.
+    """
+    problem = decay_problem(df, min_train_matches=min_train_matches, use_xg=use_xg)
+    xis = np.sort(np.asarray(xis, dtype=float))
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(n_workers, len(xis)))
+
+    blocks = [b for b in np.array_split(xis, n_workers) if len(b)]
+    if n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            scored = list(pool.map(_score_block, [(problem, b) for b in blocks]))
+    else:
+        scored = [_score_decay_rates(problem, b) for b in blocks]
+
+    table = pd.DataFrame([row for block in scored for row in block])
+    table["best"] = False
+    if len(table) and table["log_likelihood"].notna().any():
+        table.loc[table["log_likelihood"].idxmax(), "best"] = True
+    return table
@@ -0,0 +1,245 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .config import DATA_DIR, PROJECT_ROOT, PROCESSED_DIR, RAW_DIR, RESULTS_DIR
+
+SCRIPTS_DIR = PROJECT_ROOT / "scripts"
+PACKAGE_DIR = Path(__file__).resolve().parent
+STATE_PATH = DATA_DIR / "pipeline_state.json"
+
+
+@dataclass
+class Stage:
+    """
+    One scripts/ entrypoint with its declared data dependencies.
+    inputs / outputs are files or directories relative to PROJECT_ROOT.
+    """
+    name: str
+    script: str
+    inputs: List[Path]
+    outputs: List[Path]
+    args: List[str] = field(default_factory=list)
+
+
+FPLELO_PL_DIR = RAW_DIR / "FPL-Elo-Insights" / "data" / "2025-2026" / "By Tournament" / "Premier League"
+LATEST_MODEL = PROJECT_ROOT / "models" / "team_strength" / "LATEST"
+
+STAGES = [
+    Stage(
+        "ingest_fplelo", "build_pl_from_fplelo.py",
+        inputs=[FPLELO_PL_DIR],
+        outputs=[RAW_DIR / "matches_this_season.csv", RAW_DIR / "players_this_season.csv"],
+    ),
+    Stage(
+        "build_odds", "build_odds_file.py",
+        inputs=[RAW_DIR / "E0.csv"],
+        outputs=[RAW_DIR / "odds_this_season.csv", PROCESSED_DIR / "odds_snapshots.csv"],
+    ),
+    Stage(
+        "make_features", "make_features.py",
+        inputs=[RAW_DIR / "matches_this_season.csv", RAW_DIR / "odds_this_season.csv"],
+        outputs=[PROCESSED_DIR / "matches_features.csv", PROCESSED_DIR / "matches_features.cols"],
+    ),
+    Stage(
+        "team_form", "make_team_form.py",
+        inputs=[RAW_DIR / "matches_this_season.csv", RAW_DIR / "players_this_season.csv"],
+        outputs=[PROCESSED_DIR / "team_form.csv", PROCESSED_DIR / "player_teams.csv"],
+    ),
+    Stage(
+        "fit_team_strength", "fit_team_strength.py",
+        inputs=[PROCESSED_DIR / "matches_features.cols"],
+        outputs=[LATEST_MODEL],
+    ),
+    Stage(
+        "predict", "predict_from_future_odds.py",
+        inputs=[LATEST_MODEL, RAW_DIR / "future_odds.csv"],
+        outputs=[RESULTS_DIR / "future_odds_all_edges.csv", RESULTS_DIR / "future_odds_recommended_bets.csv"],
+    ),
+]
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ContentHasher:
+    """
+    sha256 of files and directories. File hashes are memoised by
+    (size, mtime_ns) in `cache`, so unchanged files are not re-read.
+    """
+
+    def __init__(self, cache: Optional[Dict[str, list]] = None):
+        self.cache = cache if cache is not None else {}
+
+    def file(self, path: Path) -> str:
+        stat = path.stat()
+        key = str(path.relative_to(PROJECT_ROOT)) if path.is_relative_to(PROJECT_ROOT) else str(path)
+        hit = self.cache.get(key)
+        if hit and hit[0] == stat.st_size and hit[1] == stat.st_mtime_ns:
+            return hit[2]
+        digest = _sha256_file(path)
+        self.cache[key] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def path(self, path: Path) -> Optional[str]:
+        """
+        Hash of a file, or of every file under a directory (with relative
+        names); None if the path does not exist.
+        """
+        if path.is_file():
+            return self.file(path)
+        if not path.is_dir():
+            return None
+        h = hashlib.sha256()
+        for sub in sorted(p for p in path.rglob("*") if p.is_file() and "__pycache__" not in p.parts):
+            h.update(str(sub.relative_to(path)).encode())
+            h.update(self.file(sub).encode())
+        return h.hexdigest()
+
+
+def stage_fingerprint(stage: Stage, hasher: ContentHasher, code_version: str) -> Dict[str, Optional[str]]:
+    """
+    Everything a stage's result depends on: its script source, the package
+    code version, its arguments and the content of each input.
+    """
+    fp = {
+        "script": hasher.file(SCRIPTS_DIR / stage.script),
+        "code": code_version,
+        "args": " ".join(stage.args),
+    }
+    for path in stage.inputs:
+        fp[str(path.relative_to(PROJECT_ROOT))] = hasher.path(path)
+    return fp
+
+
+def _upstream(stages: Sequence[Stage]) -> Dict[str, List[str]]:
+    """
+    stage name -> names of stages producing one of its inputs.
+    """
+    producer = {out: s.name for s in stages for out in s.outputs}
+    return {
+        s.name: sorted({producer[i] for i in s.inputs if i in producer and producer[i] != s.name})
+        for s in stages
+    }
+
+
+def _run_script(stage: Stage) -> float:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PACKAGE_DIR.parent), env.get("PYTHONPATH")]))
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / stage.script), *stage.args],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Stage {stage.name} failed ({stage.script}):\n{proc.stderr[-2000:]}")
+    return time.perf_counter() - start
+
+
+def run_pipeline(stages: Sequence[Stage] = STAGES,
+                 targets: Optional[Sequence[str]] = None,
+                 force: bool = False,
+                 max_workers: int = 4,
+                 state_path: Path = STATE_PATH) -> Dict[str, str]:
+    """
+    Run the stage DAG, skipping every stage whose fingerprint matches the
+    last successful run and whose outputs are still as that run left them.
+    Stages whose upstream stages are done run concurrently, so independent
+    branches (FPL-Elo ingest, odds building) overlap.
+
+    Because fingerprints hash input content, a stage that reruns but writes
+    identical outputs does not invalidate the stages after it.
+    targets limits the run to those stages and their upstream stages.
+    Returns stage name -> "ran" / "skipped" / "missing inputs".
+    """
+    state = json.loads(state_path.read_text()) if state_path.exists() else {}
+    hasher = ContentHasher(state.setdefault("file_hashes", {}))
+    records = state.setdefault("stages", {})
+    code_version = hasher.path(PACKAGE_DIR)
+
+    by_name = {s.name: s for s in stages}
+    upstream = _upstream(stages)
+    if targets:
+        unknown = [t for t in targets if t not in by_name]
+        if unknown:
+            raise ValueError(f"Unknown stages {unknown}; expected some of {list(by_name)}")
+        wanted, todo = set(), list(targets)
+        while todo:
+            name = todo.pop()
+            if name not in wanted:
+                wanted.add(name)
+                todo.extend(upstream[name])
+        stages = [s for s in stages if s.name in wanted]
+
+    status: Dict[str, str] = {}
+
+    def is_fresh(stage: Stage, fp: Dict) -> bool:
+        rec = records.get(stage.name)
+        if force or rec is None or rec["fingerprint"] != fp:
+            return False
+        return all(
+            hasher.path(out) == rec["outputs"].get(str(out.relative_to(PROJECT_ROOT)))
+            for out in stage.outputs
+        )
+
+    def finish(stage: Stage, fp: Dict) -> None:
+        records[stage.name] = {
+            "fingerprint": fp,
+            "outputs": {str(o.relative_to(PROJECT_ROOT)): hasher.path(o) for o in stage.outputs},
+        }
+
+    pending = {s.name: s for s in stages}
+    running = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while pending or running:
+                in_flight = {stage.name for stage, _ in running.values()}
+                ready = [
+                    s for s in pending.values()
+                    if all(u in status or u not in pending and u not in in_flight for u in upstream[s.name])
+                ]
+                for stage in ready:
+                    del pending[stage.name]
+                    fp = stage_fingerprint(stage, hasher, code_version)
+
+                    missing = [str(p.relative_to(PROJECT_ROOT)) for p in stage.inputs if fp[str(p.relative_to(PROJECT_ROOT))] is None]
+                    if missing:
+                        # e.g. the FPL-Elo clone is not present: keep whatever outputs exist
+                        print(f"⚠ {stage.name}: missing inputs {missing}; keeping existing outputs")
+                        status[stage.name] = "missing inputs"
+                    elif is_fresh(stage, fp):
+                        print(f"⏭  {stage.name}: up to date")
+                        status[stage.name] = "skipped"
+                    else:
+                        print(f"▶  {stage.name}: running {stage.script}")
+                        running[pool.submit(_run_script, stage)] = (stage, fp)
+
+                if not running:
+                    if pending and not ready:
+                        raise RuntimeError(f"Stage graph has a cycle among {list(pending)}")
+                    continue
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, fp = running.pop(future)
+                    elapsed = future.result()
+                    finish(stage, fp)
+                    status[stage.name] = "ran"
+                    print(f"✅ {stage.name}: done in {elapsed:.1f}s")
+    finally:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        state_path.write_text(json.dumps(state, indent=1, sort_keys=True))
+
+    return status
@@ -0,0 +1,266 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from .betting.live import OUTCOMES, LatencyStats
+from .betting.odds_utils import devig
+from .betting.pricing import check_odds, price_bets
+from .config import KELLY_FRACTION, MIN_EDGE, MODEL_WEIGHT
+from .data.teams import TeamRegistry, premier_league_registry
+from .models.artifact import ARTIFACT_ROOT, latest_version, load_model
+from .models.fixture_tensor import MARKETS
+
+RELOAD_CHECK_INTERVAL = 1.0   # seconds between looks at models/team_strength/LATEST
+LATENCY_WINDOW = 10_000       # most recent requests kept per endpoint for p50/p99
+MAX_BATCH = 50_000            # fixtures per batch request
+
+PRICE_COLUMNS = ["lambda_home", "lambda_away", "p_home", "p_draw", "p_away"]
+ODDS_KEYS = ["odds_home", "odds_draw", "odds_away"]
+
+
+def price_fixtures(values: np.ndarray,
+                   odds: np.ndarray,
+                   model_weight: float = MODEL_WEIGHT,
+                   min_edge: float = MIN_EDGE,
+                   kelly_multiplier: float = KELLY_FRACTION) -> Dict[str, np.ndarray]:
+    """
+    Blend, edge and fractional Kelly for N fixtures at once.
+    values is (N, 5) tensor rows as in PRICE_COLUMNS; odds is (N, 3) 1X2
+    decimal odds with NaN rows for fixtures queried without prices.
+    Odds of 1 or less raise ValueError.
+    """
+    p_model = values[:, 2:5]
+    odds = check_odds(odds)
+    p_market = devig(odds)
+    priced = price_bets(p_model, p_market, odds, model_weight, min_edge, kelly_multiplier)
+    return {"p_model": p_model, "p_market": p_market, **priced}
+
+
+class PredictionService:
+    """
+    Serves fixture prices from the latest model artifact kept in memory.
+    The artifact's LATEST pointer is checked at most every
+    RELOAD_CHECK_INTERVAL seconds; a new version is loaded by whichever
+    request notices it while the others keep using the current model, then
+    swapped in with one reference assignment.
+    """
+
+    def __init__(self,
+                 root: Path = ARTIFACT_ROOT,
+                 registry: Optional[TeamRegistry] = None,
+                 model_weight: float = MODEL_WEIGHT,
+                 min_edge: float = MIN_EDGE,
+                 kelly_multiplier: float = KELLY_FRACTION):
+        self.root = Path(root)
+        self.registry = registry if registry is not None else premier_league_registry()
+        self.model_weight = model_weight
+        self.min_edge = min_edge
+        self.kelly_multiplier = kelly_multiplier
+
+        self._alias_cache: Dict[str, str] = {}
+        self._reload_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._next_check = 0.0
+        self.latency: Dict[str, LatencyStats] = {}
+        self.fixtures_served = 0
+        self.started = time.time()
+
+        self._model: Tuple[int, Dict[str, int], np.ndarray] = self._load(latest_version(self.root))
+
+    def _load(self, version: Optional[int]) -> Tuple[int, Dict[str, int], np.ndarray]:
+        """
+        (version, canonical name -> tensor row, in-memory copy of the served
+        markets) for one model version.
+        """
+        artifact = load_model(self.root, version)
+        tensor = artifact.fixture_tensor()
+        cols = [MARKETS.index(m) for m in PRICE_COLUMNS]
+        values = np.ascontiguousarray(np.asarray(tensor.values)[:, :, cols])
+        return artifact.version, {t: i for i, t in enumerate(tensor.teams)}, values
+
+    def maybe_reload(self) -> bool:
+        """
+        Load the newest model version if LATEST moved. Returns True on reload.
+        """
+        now = time.monotonic()
+        if now < self._next_check or not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            self._next_check = now + RELOAD_CHECK_INTERVAL
+            latest = latest_version(self.root)
+            if latest is None or latest == self._model[0]:
+                return False
+            self._model = self._load(latest)
+            print(f"🔄 Loaded model v{latest}")
+            return True
+        finally:
+            self._reload_lock.release()
+
+    @property
+    def version(self) -> int:
+        return self._model[0]
+
+    def _canonical(self, names: Sequence[str]) -> List[str]:
+        cache = self._alias_cache
+        new = [n for n in set(names) if n not in cache]
+        if new:
+            for name, canonical in zip(new, self.registry.canonical(new)):
+                cache[name] = canonical
+        return [cache[n] for n in names]
+
+    @staticmethod
+    def _rows(slots: Dict[str, int], teams: List[str]) -> np.ndarray:
+        try:
+            return np.array([slots[t] for t in teams], dtype=np.intp)
+        except KeyError:
+            raise KeyError(f"Unknown teams: {sorted(set(teams) - set(slots))}") from None
+
+    def predict(self, fixtures: List[Dict]) -> Dict:
+        """
+        Price a list of {"home_team", "away_team"[, "odds_home", "odds_draw",
+        "odds_away"]} fixtures. Unknown teams raise KeyError, malformed
+        fixtures (including odds of 1 or less) ValueError.
+        """
+        if not isinstance(fixtures, list) or len(fixtures) > MAX_BATCH:
+            raise ValueError(f"fixtures must be a list of at most {MAX_BATCH} objects")
+        version, slots, table = self._model
+        try:
+            home = [str(f["home_team"]) for f in fixtures]
+            away = [str(f["away_team"]) for f in fixtures]
+            odds = np.array(
+                [[np.nan if f.get(k) is None else f[k] for k in ODDS_KEYS] for f in fixtures], dtype=float
+            ).reshape(len(fixtures), 3)
+        except (TypeError, KeyError, AttributeError) as exc:
+            raise ValueError("every fixture needs home_team, away_team and numeric odds (if any)") from exc
+        home = self._canonical(home)
+        away = self._canonical(away)
+        home_idx = self._rows(slots, home)
+        away_idx = self._rows(slots, away)
+        if (home_idx == away_idx).any():
+            raise ValueError("home_team and away_team must differ")
+
+        values = table[home_idx, away_idx]
+        priced = price_fixtures(values, odds, self.model_weight, self.min_edge, self.kelly_multiplier)
+        has_odds = np.isfinite(odds).all(axis=1).tolist()
+        columns = [values.tolist(), odds.tolist()] + [
+            priced[k].tolist() for k in ("p_market", "p_final", "edge", "stake_fraction", "recommended")
+        ]
+
+        predictions = []
+        for i, (row, odd, p_market, p_final, edge, stake, rec) in enumerate(zip(*columns)):
+            entry = {"home_team": home[i], "away_team": away[i], **dict(zip(PRICE_COLUMNS, row))}
+            if has_odds[i]:
+                entry["bets"] = [
+                    {
+                        "bet_side": OUTCOMES[j],
+                        "odds": odd[j],
+                        "p_market": p_market[j],
+                        "p_final": p_final[j],
+                        "edge": edge[j],
+                        "stake_fraction": stake[j],
+                        "recommended": rec[j],
+                    }
+                    for j in range(3)
+                ]
+            predictions.append(entry)
+        return {"model_version": version, "predictions": predictions}
+
+    def record(self, endpoint: str, start_ns: int, n_fixtures: int) -> None:
+        with self._stats_lock:
+            stats = self.latency.get(endpoint)
+            if stats is None:
+                stats = self.latency[endpoint] = LatencyStats(window=LATENCY_WINDOW)
+            stats.record(start_ns)
+            self.fixtures_served += n_fixtures
+
+    def metrics(self) -> Dict:
+        with self._stats_lock:
+            latency = {name: stats.summary() for name, stats in self.latency.items()}
+            served = self.fixtures_served
+        uptime = time.time() - self.started
+        return {
+            "model_version": self.version,
+            "uptime_s": uptime,
+            "fixtures_served": served,
+            "fixtures_per_s": served / uptime if uptime > 0 else 0.0,
+            "latency": latency,
+        }
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    """
+    GET  /health
+    GET  /predict?home_team=..&away_team=..[&odds_home=..&odds_draw=..&odds_away=..]
+    POST /predict/batch   {"fixtures": [{...}, ...]}
+    GET  /metrics
+    """
+    protocol_version = "HTTP/1.1"   # keep-alive, so clients can reuse connections
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    service: PredictionService = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, payload: Dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _predict(self, endpoint: str, fixtures: List[Dict]) -> None:
+        start = time.perf_counter_ns()
+        self.service.maybe_reload()
+        try:
+            result = self.service.predict(fixtures)
+        except KeyError as exc:
+            self._send(400, {"error": exc.args[0] if exc.args else str(exc)})
+            return
+        except ValueError as exc:
+            self._send(400, {"error": str(exc)})
+            return
+        self._send(200, result)
+        self.service.record(endpoint, start, len(fixtures))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self._send(200, {"status": "ok", "model_version": self.service.version})
+        elif url.path == "/metrics":
+            self._send(200, self.service.metrics())
+        elif url.path == "/predict":
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            self._predict("predict", [query])
+        else:
+            self._send(404, {"error": f"Unknown path {url.path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length)
+        if url.path != "/predict/batch":
+            self._send(404, {"error": f"Unknown path {url.path}"})
+            return
+        try:
+            fixtures = json.loads(raw)["fixtures"]
+        except (ValueError, KeyError, TypeError):
+            self._send(400, {"error": 'body must be JSON {"fixtures": [...]}'})
+            return
+        self._predict("predict/batch", fixtures)
+
+
+def make_server(service: PredictionService, host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+    """
+    Threaded HTTP server bound to service (call serve_forever() to run it).
+    """
+    handler = type("BoundPredictionHandler", (PredictionHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server